@@ -0,0 +1,159 @@
+import threading
+import logging
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from src.utils.config import load_config
+from src.api_integration.http_cache import CachingSession
+from src.api_integration.jenkins_api import JenkinsAPI
+from src.api_integration.gerrit_api import GerritAPI
+from src.api_integration.gerrit_async import AsyncGerritAPI
+from src.api_integration.jira_api import JiraAPI
+from src.api_integration.slack_api import SlackAPI
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HTTP_SETTINGS = {
+    "pool_connections": 10,
+    "pool_maxsize": 20,
+    "connect_timeout": 5,
+    "read_timeout": 30,
+    "retries": {"total": 3, "backoff_factor": 0.5, "status_forcelist": [429, 500, 502, 503, 504]},
+}
+
+# Backends whose GETs go through the shared conditional-request cache
+CACHED_BACKENDS = ("gerrit", "jenkins", "artifacts")
+
+# Backends whose 429s are retried by their own rate limiter (honouring Retry-After),
+# so the session must not retry them as well
+RATE_LIMITED_BACKENDS = ("slack",)
+
+class TimeoutMixin:
+    """Applies the backend's (connect, read) timeout to requests that do not set their own."""
+
+    timeout = None
+
+    def request(self, method, url, *args, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().request(method, url, *args, **kwargs)
+
+class PooledSession(TimeoutMixin, requests.Session):
+    pass
+
+class PooledCachingSession(TimeoutMixin, CachingSession):
+    pass
+
+def build_session(settings, cached=False):
+    """Create a keep-alive session with a sized connection pool and retry/backoff for idempotent requests."""
+    session = PooledCachingSession() if cached else PooledSession()
+    retries = settings["retries"]
+    retry = Retry(
+        total=retries.get("total", 3),
+        backoff_factor=retries.get("backoff_factor", 0.5),
+        status_forcelist=retries.get("status_forcelist", ()),
+        allowed_methods=frozenset(["GET", "HEAD", "OPTIONS"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=settings["pool_connections"], pool_maxsize=settings["pool_maxsize"], max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.timeout = (settings["connect_timeout"], settings["read_timeout"])
+    return session
+
+class ClientRegistry:
+    """
+    Process-wide owner of the API clients and their pooled HTTP sessions.
+
+    Each backend gets one session (keep-alive, pool sizes, retries and timeouts
+    from the `http` section of config/config.yml) and each client is built
+    once, so TLS handshakes and auth setup happen once per process rather than
+    once per Slack message.
+    """
+
+    def __init__(self, config=None):
+        config = load_config() if config is None else config
+        self.http_settings = config.get("http") or {}
+        self._sessions = {}
+        self._clients = {}
+        self._lock = threading.RLock()
+
+    def settings_for(self, backend):
+        """HTTP settings for a backend: defaults, then the top-level `http` values, then its override."""
+        settings = {key: value for key, value in DEFAULT_HTTP_SETTINGS.items() if key != "retries"}
+        retries = dict(DEFAULT_HTTP_SETTINGS["retries"])
+        override = (self.http_settings.get("backends") or {}).get(backend) or {}
+        for source in (self.http_settings, override):
+            for key, value in source.items():
+                if key == "retries":
+                    retries.update(value or {})
+                elif key != "backends" and value is not None:
+                    settings[key] = value
+        if backend in RATE_LIMITED_BACKENDS:
+            retries["status_forcelist"] = [status for status in retries.get("status_forcelist", ()) if status != 429]
+        settings["retries"] = retries
+        return settings
+
+    def session(self, backend):
+        with self._lock:
+            if backend not in self._sessions:
+                self._sessions[backend] = build_session(self.settings_for(backend), cached=backend in CACHED_BACKENDS)
+            return self._sessions[backend]
+
+    def _client(self, key, factory):
+        with self._lock:
+            if key not in self._clients:
+                logger.info(f"Creating shared API client: {key}")
+                self._clients[key] = factory()
+            return self._clients[key]
+
+    def jenkins(self, jenkins_url):
+        """JenkinsAPI for the server hosting the given build URL, one per server."""
+        parts = urlsplit(jenkins_url)
+        server_url = f"{parts.scheme}://{parts.netloc}"
+        settings = self.settings_for("jenkins")
+        return self._client(("jenkins", server_url), lambda: JenkinsAPI(
+            server_url, session=self.session("jenkins"), timeout=settings["read_timeout"],
+        ))
+
+    def gerrit(self):
+        return self._client("gerrit", lambda: GerritAPI(session=self.session("gerrit")))
+
+    def async_gerrit(self):
+        settings = self.settings_for("gerrit")
+        return self._client("async_gerrit", lambda: AsyncGerritAPI(
+            max_concurrency=settings["pool_maxsize"], timeout=settings["read_timeout"],
+        ))
+
+    def jira(self):
+        settings = self.settings_for("jira")
+        return self._client("jira", lambda: JiraAPI(
+            timeout=(settings["connect_timeout"], settings["read_timeout"]), max_retries=settings["retries"]["total"],
+        ))
+
+    def slack(self):
+        return self._client("slack", lambda: SlackAPI(session=self.session("slack")))
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_client_registry():
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ClientRegistry()
+        return _registry
+
+def get_jenkins_api(jenkins_url):
+    """Shared JenkinsAPI for the server hosting the given build URL."""
+    return get_client_registry().jenkins(jenkins_url)
+
+def get_async_gerrit_api():
+    """Shared asyncio Gerrit client, used by the handlers for change snapshots."""
+    return get_client_registry().async_gerrit()
+
+def get_jira_api():
+    """Shared JiraAPI, so the Jira session and auth handshake are set up once per process."""
+    return get_client_registry().jira()
@@ -1,118 +1,210 @@
 import re
-import requests
+import json
 import os
 import logging
+from urllib.parse import urlsplit, urlunsplit
 from requests.exceptions import HTTPError
 from dotenv import load_dotenv
+from src.utils.cache import TTLCache
+from src.api_integration.http_cache import CachingSession
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Gerrit prefixes JSON responses with this line to prevent XSSI
+GERRIT_XSSI_PREFIX = ")]}'"
+
+# Everything the handlers need from a change, fetched in a single GET
+SNAPSHOT_OPTIONS = ("LABELS", "MESSAGES", "CURRENT_REVISION", "DETAILED_ACCOUNTS")
+
+FAILURE_URL_PATTERN = r'https?://[\w.-]+/job/[\w.-]+/[\d]+/ : FAILURE'
+JENKINS_URL_PATTERN = r'https?://[\w.-]+/job/[\w.-]+/?[\w./-]*'
+
+def parse_cr_status(cr_data):
+    """Summarize merge status and Verified score from a change JSON object."""
+    merge_status = cr_data.get("status", "UNKNOWN")
+
+    verification_label = cr_data.get("labels", {}).get("Verified", {})
+    verification_score = verification_label.get("value", "Not Available")
+
+    return {
+        "merge_status": merge_status,
+        "verification_score": verification_score
+    }
+
+def find_build_failure_url(messages):
+    """Return the most recent Jenkins failure URL posted by the build bot in the change messages."""
+    for message in reversed(messages):  # Check from most recent to oldest
+        if message.get("author", {}).get("name") == "Jenkins Build.svc" and "Build Failed" in message.get("message", ""):
+            match = re.search(FAILURE_URL_PATTERN, message["message"])
+            if match:
+                return match.group(0).split(" :")[0]  # Remove " : FAILURE"
+    return None
+
+def find_build_failure_urls(messages):
+    """
+    Return every failed Jenkins URL reported for the most recently failed patch set.
+
+    The build bot posts one "Build Failed" message per verification run, listing
+    each job with its result; all messages for the same patch set are combined.
+    URLs are deduplicated and keep the order they were reported in.
+    """
+    failure_messages = [
+        message for message in messages
+        if message.get("author", {}).get("name") == "Jenkins Build.svc" and "Build Failed" in message.get("message", "")
+    ]
+    if not failure_messages:
+        return []
+    latest_revision = failure_messages[-1].get("_revision_number")
+    if latest_revision is None:
+        failure_messages = failure_messages[-1:]
+    else:
+        failure_messages = [message for message in failure_messages if message.get("_revision_number") == latest_revision]
+
+    urls = []
+    for message in failure_messages:
+        urls.extend(match.split(" :")[0] for match in re.findall(FAILURE_URL_PATTERN, message["message"]))
+    return list(dict.fromkeys(urls))
+
+def find_build_url_in_comments(comments):
+    """Return the first Jenkins URL in the last comment, if any."""
+    if not comments:
+        return None
+    last_comment_text = comments[-1].get('message', '')
+    match = re.search(JENKINS_URL_PATTERN, last_comment_text)
+    return match.group(0) if match else None
+
+def parse_gerrit_json(text):
+    """Decode a Gerrit REST response body, stripping the XSSI guard line if present."""
+    if text.startswith(GERRIT_XSSI_PREFIX):
+        text = text[len(GERRIT_XSSI_PREFIX):]
+    return json.loads(text)
+
+def snapshot_url(gerrit_link, options=SNAPSHOT_OPTIONS):
+    """Add the o= query options for a full change snapshot to a change link."""
+    scheme, netloc, path, query, fragment = urlsplit(gerrit_link)
+    option_query = "&".join(f"o={option}" for option in options)
+    query = f"{query}&{option_query}" if query else option_query
+    return urlunsplit((scheme, netloc, path.rstrip('/'), query, fragment))
+
+class ChangeSnapshot:
+    """
+    One fetch of a Gerrit change with labels, messages and the current revision.
+
+    Status, comments and build URL extraction are pure functions of the fetched
+    JSON, so every question about the change is answered without another GET.
+    """
+
+    def __init__(self, gerrit_link, data):
+        self.gerrit_link = gerrit_link
+        self.data = data
+
+    @property
+    def status(self):
+        return parse_cr_status(self.data)
+
+    @property
+    def messages(self):
+        return self.data.get("messages", [])
+
+    @property
+    def comments(self):
+        # Comments embedded in the change response, as GerritAPI.get_cr_comments always read them
+        return self.data.get("comments")
+
+    @property
+    def current_revision(self):
+        return self.data.get("current_revision")
+
+    @property
+    def build_failure_url(self):
+        return find_build_failure_url(self.messages)
+
+    @property
+    def build_failure_urls(self):
+        return find_build_failure_urls(self.messages)
+
+    @property
+    def build_url(self):
+        """The build bot's failure URL, falling back to a Jenkins URL in the last comment."""
+        return self.build_failure_url or find_build_url_in_comments(self.comments)
+
 class GerritAPI:
-    def __init__(self, base_url=None, token=None):
+    def __init__(self, base_url=None, token=None, snapshot_ttl=30, session=None):
         self.base_url = base_url or os.getenv("GERRIT_BASE_URL")
         self.token = token or os.getenv("GERRIT_API_TOKEN")
         if not self.token:
             raise ValueError("GERRIT_API_TOKEN is not set in the environment variables.")
 
-        self.session = requests.Session()
+        # Repeated GETs of the same change are served from, or revalidated against, the shared HTTP cache
+        self.session = session or CachingSession()
         self.session.headers.update({
             "Authorization": f"Bearer {self.token}"
         })
 
-    def get_cr_status(self, gerrit_link):
-        """Fetch and interpret the status of a Gerrit change request (CR) using the provided link."""
+        # Snapshots are reused for a short time so one mention never fetches a change twice
+        self.snapshots = TTLCache(max_entries=256, ttl_seconds=snapshot_ttl)
+
+    def get_change_snapshot(self, gerrit_link, refresh=False):
+        """Fetch the change once with labels, messages and current revision, memoized briefly."""
+        if not refresh:
+            snapshot = self.snapshots.get(gerrit_link)
+            if snapshot is not None:
+                return snapshot
         try:
-            response = self.session.get(gerrit_link, verify=False)
+            response = self.session.get(snapshot_url(gerrit_link), verify=False)
             response.raise_for_status()  # Raise exception for bad responses
-            cr_data = response.json()
+            cr_data = parse_gerrit_json(response.text)
             logging.debug(f"CR Data: {cr_data}")
-            logging.debug(f"Response text: {response.text}")
 
-            merge_status = cr_data.get("status", "UNKNOWN")
-
-            verification_label = cr_data.get("labels", {}).get("Verified", {})
-            verification_score = verification_label.get("value", "Not Available")
-
-            status_summary = {
-                "merge_status": merge_status,
-                "verification_score": verification_score
-            }
-
-            logging.info(f"Successfully retrieved and parsed CR status from {gerrit_link}")
-            return status_summary
+            snapshot = ChangeSnapshot(gerrit_link, cr_data)
+            self.snapshots.set(gerrit_link, snapshot)
+            logging.info(f"Successfully retrieved change snapshot from {gerrit_link}")
+            return snapshot
 
         except HTTPError as http_err:
-            logging.error(f"HTTP error occurred while fetching CR status: {http_err}")
+            logging.error(f"HTTP error occurred while fetching change snapshot: {http_err}")
         except Exception as err:
-            logging.error(f"Error occurred while fetching CR status: {err}")
+            logging.error(f"Error occurred while fetching change snapshot: {err}")
         return None
 
+    def get_cr_status(self, gerrit_link):
+        """Fetch and interpret the status of a Gerrit change request (CR) using the provided link."""
+        snapshot = self.get_change_snapshot(gerrit_link)
+        return snapshot.status if snapshot else None
+
     def get_cr_comments(self, gerrit_link):
         """Fetch comments directly from the main CR response."""
-        try:
-            response = self.session.get(gerrit_link, verify=False)
-            response.raise_for_status()
-            cr_data = response.json()
-
-            # Assuming comments are embedded within this data under a 'comments' field
-            comments = cr_data.get("comments")
-            if comments:
-                logging.info(f"Successfully retrieved comments for CR from {gerrit_link}")
-                return comments
-            else:
-                logging.error(f"No comments found in the CR data for {gerrit_link}")
-        except HTTPError as http_err:
-            logging.error(f"HTTP error occurred while fetching CR comments: {http_err}")
-        except Exception as err:
-            logging.error(f"Error occurred while fetching CR comments: {err}")
+        snapshot = self.get_change_snapshot(gerrit_link)
+        if snapshot is None:
+            return None
+        if snapshot.comments:
+            logging.info(f"Successfully retrieved comments for CR from {gerrit_link}")
+            return snapshot.comments
+        logging.error(f"No comments found in the CR data for {gerrit_link}")
         return None
 
     def get_build_failure_url(self, gerrit_link):
         """Fetch the Jenkins build failure URL from the change log."""
-        try:
-            # Construct the API endpoint for messages
-            messages_url = f"{gerrit_link}/messages"
-            response = self.session.get(messages_url, verify=False)
-            response.raise_for_status()
-            messages = response.json()  # List of messages
-
-            # Iterate over messages to find one from Jenkins Build.svc with "Build Failed"
-            for message in reversed(messages):  # Check from most recent to oldest
-                if message.get("author", {}).get("name") == "Jenkins Build.svc" and "Build Failed" in message.get("message", ""):
-                    # Extract URLs from the message content
-                    failure_url_pattern = r'https?://[\w.-]+/job/[\w.-]+/[\d]+/ : FAILURE'
-                    match = re.search(failure_url_pattern, message["message"])
-                    if match:
-                        failure_url = match.group(0).split(" :")[0]  # Remove " : FAILURE"
-                        logging.info(f"Found Jenkins failure URL: {failure_url}")
-                        return failure_url
-            logging.error("No Jenkins failure URL found in the Gerrit change log.")
-            return None
-
-        except requests.RequestException as e:
-            logging.error(f"Error fetching change log messages: {e}")
-            return None
-
-    def get_build_url(self, gerrit_link):
-        # Attempt to fetch the failure URL from change log messages
-        failure_url = self.get_build_failure_url(gerrit_link)
+        snapshot = self.get_change_snapshot(gerrit_link)
+        failure_url = snapshot.build_failure_url if snapshot else None
         if failure_url:
+            logging.info(f"Found Jenkins failure URL: {failure_url}")
             return failure_url
+        logging.error("No Jenkins failure URL found in the Gerrit change log.")
+        return None
 
-        # Fallback: Extract from user comments
-        comments = self.get_cr_comments(gerrit_link)
-        if comments:
-            last_comment_text = comments[-1].get('message', '')
-            # Regular expression to match Jenkins URLs
-            jenkins_url_pattern = r'https?://[\w.-]+/job/[\w.-]+/?[\w./-]*'
-            match = re.search(jenkins_url_pattern, last_comment_text)
-            if match:
-                build_url = match.group(0)
-                logging.info(f"Found Jenkins build URL: {build_url}")
-                return build_url
-            else:
-                logging.error(f"No Jenkins build URL found in the last comment of {gerrit_link}")
-        else:
-            logging.error(f"No comments found for Gerrit link {gerrit_link}")
+    def get_build_failure_urls(self, gerrit_link):
+        """Fetch every failed Jenkins build URL reported for the latest failed patch set."""
+        snapshot = self.get_change_snapshot(gerrit_link)
+        return snapshot.build_failure_urls if snapshot else []
+
+    def get_build_url(self, gerrit_link):
+        """Return the failure URL from the change log, falling back to the last comment."""
+        snapshot = self.get_change_snapshot(gerrit_link)
+        build_url = snapshot.build_url if snapshot else None
+        if build_url:
+            logging.info(f"Found Jenkins build URL: {build_url}")
+            return build_url
+        logging.error(f"No Jenkins build URL found for Gerrit link {gerrit_link}")
         return None
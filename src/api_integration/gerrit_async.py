@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import os
+import threading
+import httpx
+from src.api_integration.gerrit_api import ChangeSnapshot, parse_gerrit_json, snapshot_url
+from src.utils.cache import TTLCache
+from src.api_integration.http_cache import get_http_cache
+
+class AsyncGerritAPI:
+    """
+    asyncio Gerrit client sharing one pooled HTTP connection across requests.
+
+    Each change is fetched as a single ChangeSnapshot GET; several changes are
+    fetched concurrently, with a semaphore bounding how many requests are in
+    flight at once. Synchronous callers (the Slack handlers) use the get_*
+    wrappers, which run the coroutines on a private event loop thread.
+    """
+
+    def __init__(self, base_url=None, token=None, max_concurrency=10, timeout=10.0, verify=False, snapshot_ttl=30, transport=None):
+        self.base_url = base_url or os.getenv("GERRIT_BASE_URL")
+        self.token = token or os.getenv("GERRIT_API_TOKEN")
+        if not self.token:
+            raise ValueError("GERRIT_API_TOKEN is not set in the environment variables.")
+
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.verify = verify
+        self.transport = transport  # httpx transport override, e.g. httpx.MockTransport in tests
+        self.snapshots = TTLCache(max_entries=256, ttl_seconds=snapshot_ttl)
+        self.http_cache = get_http_cache()
+
+        self._client = None
+        self._semaphore = None
+        self._loop = None
+        self._loop_thread = None
+        self._loop_lock = threading.Lock()
+
+    async def _get_client(self):
+        # Created lazily so the client and semaphore belong to the loop that uses them
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers={"Authorization": f"Bearer {self.token}"},
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency),
+                verify=self.verify,
+                transport=self.transport,
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def get_json(self, url):
+        # Fresh cache entries skip the network; stale ones are revalidated with their ETag
+        entry = self.http_cache.lookup(url)
+        if entry is not None and entry.is_fresh():
+            self.http_cache.record("fresh_hits")
+            return parse_gerrit_json(entry.content.decode("utf-8"))
+
+        client = await self._get_client()
+        async with self._semaphore:
+            response = await client.get(url, headers=entry.conditional_headers() if entry else None)
+
+        if response.status_code == 304 and entry is not None:
+            self.http_cache.record("revalidated")
+            entry = self.http_cache.refresh(entry, response.headers)
+            return parse_gerrit_json(entry.content.decode("utf-8"))
+
+        self.http_cache.record("misses")
+        response.raise_for_status()
+        self.http_cache.store(url, response.status_code, response.headers, response.content, response.encoding)
+        return parse_gerrit_json(response.text)
+
+    async def fetch_change_snapshot(self, gerrit_link, refresh=False):
+        """Fetch the change, with labels and messages, in one GET; memoized briefly like GerritAPI."""
+        if not refresh:
+            snapshot = self.snapshots.get(gerrit_link)
+            if snapshot is not None:
+                return snapshot
+        snapshot = ChangeSnapshot(gerrit_link, await self.get_json(snapshot_url(gerrit_link)))
+        self.snapshots.set(gerrit_link, snapshot)
+        return snapshot
+
+    async def fetch_change_snapshots(self, gerrit_links):
+        """Fetch several changes concurrently; failed fetches are logged and returned as None."""
+        results = await asyncio.gather(*(self.fetch_change_snapshot(link) for link in gerrit_links), return_exceptions=True)
+        snapshots = []
+        for link, result in zip(gerrit_links, results):
+            if isinstance(result, Exception):
+                logging.error(f"Error fetching change snapshot for {link}: {result}")
+                result = None
+            snapshots.append(result)
+        return snapshots
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # Synchronous wrappers for handlers running in Bolt listener threads
+
+    def run(self, coroutine, timeout=None):
+        """Run a coroutine on the client's event loop thread and wait for its result."""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(target=self._loop.run_forever, name="gerrit-async-loop", daemon=True)
+                self._loop_thread.start()
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+        return future.result(timeout if timeout is not None else self.timeout * 3)
+
+    def get_change_snapshot(self, gerrit_link, refresh=False):
+        return self.run(self.fetch_change_snapshot(gerrit_link, refresh=refresh))
+
+    def get_change_snapshots(self, gerrit_links):
+        return self.run(self.fetch_change_snapshots(gerrit_links))
+
+    def close(self):
+        if self._loop is None:
+            return
+        self.run(self.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join()
+        self._loop.close()
+        self._loop = None
@@ -0,0 +1,238 @@
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import requests
+from requests.structures import CaseInsensitiveDict
+from src.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+FOREVER = None
+
+def _decode_json(content):
+    # Gerrit prefixes JSON bodies with an XSSI guard line
+    text = content.decode("utf-8", errors="replace")
+    if text.startswith(")]}'"):
+        text = text[4:]
+    return json.loads(text)
+
+def _jenkins_build_ttl(data):
+    # Finished builds never change; running ones are only reused briefly.
+    # Blue Ocean reports result "UNKNOWN" (with state "RUNNING") until a run ends.
+    if isinstance(data, dict) and (
+        data.get("building") is False or data.get("state") == "FINISHED" or data.get("result") not in (None, "UNKNOWN")
+    ):
+        return FOREVER
+    return 10
+
+# Open changes get new patch sets, votes and comments at any time
+GERRIT_OPEN_CHANGE_TTL = 30
+
+def _gerrit_change_ttl(data):
+    if isinstance(data, dict) and data.get("status") in ("MERGED", "ABANDONED"):
+        return 24 * 60 * 60
+    return GERRIT_OPEN_CHANGE_TTL
+
+# (url pattern, ttl in seconds, or a callable deciding the ttl from the decoded JSON body)
+DEFAULT_TTL_RULES = [
+    (re.compile(r"/job/.+/\d+/api/json"), _jenkins_build_ttl),
+    (re.compile(r"/blue/rest/organizations/.+/runs/\d+/?$"), _jenkins_build_ttl),
+    (re.compile(r"/changes/"), _gerrit_change_ttl),
+    # Change links as pasted from the UI (/c/<project>/+/<number>, /c/<number>); the body is
+    # not always change JSON, so the status cannot be read and they are kept briefly
+    (re.compile(r"/c/(?:.+/\+/)?\d+(?:[/?]|$)"), GERRIT_OPEN_CHANGE_TTL),
+]
+
+class CacheEntry:
+    """A stored response plus the validators needed to revalidate it."""
+
+    def __init__(self, url, status_code, headers, content, encoding=None, fresh_until=0.0):
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.encoding = encoding
+        self.fresh_until = fresh_until  # Epoch seconds, or None for "never stale"
+
+    @property
+    def etag(self):
+        return self.headers.get("ETag")
+
+    @property
+    def last_modified(self):
+        return self.headers.get("Last-Modified")
+
+    def is_fresh(self):
+        return self.fresh_until is None or time.time() < self.fresh_until
+
+    def conditional_headers(self):
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_response(self):
+        """Rebuild a requests.Response so callers cannot tell a cached answer from a live one."""
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.content
+        response.encoding = self.encoding
+        response.url = self.url
+        response.from_cache = True
+        return response
+
+class DiskCacheTier:
+    """SQLite-backed second tier so cached responses survive restarts."""
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS http_cache ("
+                "url TEXT PRIMARY KEY, status_code INTEGER, headers TEXT, content BLOB, encoding TEXT, fresh_until REAL)"
+            )
+
+    def get(self, url):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status_code, headers, content, encoding, fresh_until FROM http_cache WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        status_code, headers, content, encoding, fresh_until = row
+        return CacheEntry(url, status_code, json.loads(headers), content, encoding, fresh_until)
+
+    def set(self, entry):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_cache (url, status_code, headers, content, encoding, fresh_until) VALUES (?, ?, ?, ?, ?, ?)",
+                (entry.url, entry.status_code, json.dumps(dict(entry.headers)), entry.content, entry.encoding, entry.fresh_until),
+            )
+
+class HTTPCache:
+    """
+    Shared conditional-request cache for the REST clients in api_integration.
+
+    Responses are kept in an in-memory LRU tier and, optionally, an on-disk SQLite
+    tier. While an entry is fresh (per-endpoint TTL) it is served without any
+    network call; once stale it is revalidated with If-None-Match /
+    If-Modified-Since, so an unchanged resource costs a 304 instead of a full
+    download.
+    """
+
+    def __init__(self, max_entries=1024, disk_path=None, ttl_rules=None, default_ttl=0):
+        self.memory = TTLCache(max_entries=max_entries)
+        self.disk = DiskCacheTier(disk_path) if disk_path else None
+        self.ttl_rules = DEFAULT_TTL_RULES if ttl_rules is None else ttl_rules
+        self.default_ttl = default_ttl
+
+        self._lock = threading.Lock()
+        self.fresh_hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def lookup(self, url):
+        entry = self.memory.get(url)
+        if entry is None and self.disk is not None:
+            entry = self.disk.get(url)
+            if entry is not None:
+                self.memory.set(url, entry)
+        return entry
+
+    def ttl_for(self, url, content):
+        for pattern, ttl in self.ttl_rules:
+            if pattern.search(url):
+                if callable(ttl):
+                    try:
+                        return ttl(_decode_json(content))
+                    except ValueError:
+                        return self.default_ttl
+                return ttl
+        return self.default_ttl
+
+    def store(self, url, status_code, headers, content, encoding=None):
+        ttl = self.ttl_for(url, content)
+        entry = CacheEntry(url, status_code, headers, content, encoding, fresh_until=None if ttl is FOREVER else time.time() + ttl)
+        if ttl == 0 and not (entry.etag or entry.last_modified):
+            return entry  # Nothing to revalidate with and never fresh: not worth keeping
+        self.memory.set(url, entry)
+        if self.disk is not None:
+            self.disk.set(entry)
+        return entry
+
+    def refresh(self, entry, headers):
+        """Update an entry after a 304: new validators and a new freshness window."""
+        entry.headers.update({key: value for key, value in headers.items() if key.lower() in ("etag", "last-modified", "cache-control", "date")})
+        ttl = self.ttl_for(entry.url, entry.content)
+        entry.fresh_until = None if ttl is FOREVER else time.time() + ttl
+        self.memory.set(entry.url, entry)
+        if self.disk is not None:
+            self.disk.set(entry)
+        return entry
+
+    def record(self, outcome):
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.fresh_hits + self.revalidated + self.misses
+            return {
+                "fresh_hits": self.fresh_hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "hit_rate": (self.fresh_hits + self.revalidated) / lookups if lookups else 0.0,
+                "memory_entries": len(self.memory),
+            }
+
+class CachingSession(requests.Session):
+    """requests.Session whose plain GETs go through an HTTPCache."""
+
+    def __init__(self, cache=None):
+        super().__init__()
+        self.cache = cache or get_http_cache()
+
+    def request(self, method, url, *args, **kwargs):
+        if method.upper() != "GET" or kwargs.get("stream") or kwargs.get("params"):
+            return super().request(method, url, *args, **kwargs)
+
+        entry = self.cache.lookup(url)
+        if entry is not None and entry.is_fresh():
+            self.cache.record("fresh_hits")
+            return entry.to_response()
+
+        if entry is not None:
+            kwargs["headers"] = dict(kwargs.get("headers") or {}, **entry.conditional_headers())
+
+        response = super().request(method, url, *args, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            self.cache.record("revalidated")
+            return self.cache.refresh(entry, response.headers).to_response()
+
+        self.cache.record("misses")
+        if response.status_code == 200:
+            self.cache.store(url, response.status_code, response.headers, response.content, response.encoding)
+        return response
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+def get_http_cache():
+    """Process-wide cache shared by every client; HTTP_CACHE_DIR enables the on-disk tier."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            cache_dir = os.getenv("HTTP_CACHE_DIR")
+            _shared_cache = HTTPCache(disk_path=os.path.join(cache_dir, "http_cache.sqlite3") if cache_dir else None)
+        return _shared_cache
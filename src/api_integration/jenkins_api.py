@@ -2,13 +2,39 @@ import requests
 import jenkins
 import os
 import logging
-import re
+from urllib.parse import quote, unquote
+from src.log_analysis.log_scanner import scan_log_lines, iter_byte_lines
+from src.log_analysis.signatures import get_default_engine
+from src.utils.url_router import parse_url, BlueOceanRun, JenkinsBuild
+
+# Failures sit near the end of the console, so only this much is fetched at first
+DEFAULT_TAIL_BYTES = 64 * 1024
+
+def parse_text_size(response):
+    """Total log size from a progressive log response (X-Text-Size, else Content-Length), or None."""
+    size = response.headers.get("X-Text-Size") or response.headers.get("Content-Length")
+    return int(size) if size and size.isdigit() else None
+
+def build_job(target):
+    """(job name, build number) of a build target, as python-jenkins expects them."""
+    if isinstance(target, BlueOceanRun):
+        # Multibranch pipelines are folders holding one job per branch. The pipeline's folder path is
+        # encoded in the URL, but a branch job is literally named with the encoded slash (feature%2Fx).
+        return f"{unquote(target.pipeline)}/{target.branch}", target.run_number
+    return target.job_name, target.build_number
 
 class JenkinsAPI:
-    def __init__(self, server_url, username=None, password=None):
+    def __init__(self, server_url, username=None, password=None, tail_bytes=DEFAULT_TAIL_BYTES, session=None, timeout=None):
         self.username = username or os.getenv("JENKINS_USER")
         self.password = password or os.getenv("JENKINS_TOKEN")
-        self.server = jenkins.Jenkins(server_url, username=self.username, password=self.password)
+        if timeout is None:
+            self.server = jenkins.Jenkins(server_url, username=self.username, password=self.password)
+        else:
+            self.server = jenkins.Jenkins(server_url, username=self.username, password=self.password, timeout=timeout)
+        self.tail_bytes = tail_bytes
+        self.log_timeout = (10, timeout or 60)
+        # Log downloads go through this session (a pooled one from the client registry when shared)
+        self.session = session or requests.Session()
 
     def get_build_info(self, job_name, build_number):
         try:
@@ -18,6 +44,32 @@ class JenkinsAPI:
             logging.error(f"Error getting build info for {job_name} build number {build_number}: {e}")
             return None
 
+    def get_cached_build_info(self, job_name, build_number):
+        """
+        Same data as get_build_info, but fetched through self.session.
+
+        With the client registry's caching session a finished build is then answered
+        from the HTTP cache, and a running one is only re-fetched after a short TTL.
+        """
+        job_path = "".join(f"job/{quote(part, safe='')}/" for part in job_name.split("/"))
+        url = f"{self.server.server.rstrip('/')}/{job_path}{build_number}/api/json"
+        auth = (self.username, self.password) if self.username else None
+        try:
+            response = self.session.get(url, auth=auth, timeout=self.log_timeout)
+            response.raise_for_status()
+            return response.json()
+        except (requests.RequestException, ValueError) as e:
+            logging.error(f"Error getting build info for {job_name} build number {build_number}: {e}")
+            return None
+
+    def is_build_finished(self, jenkins_url):
+        """True once the build or Blue Ocean run behind a URL has finished (False if unknown)."""
+        target = parse_url(jenkins_url)
+        if not isinstance(target, (JenkinsBuild, BlueOceanRun)):
+            return False
+        info = self.get_cached_build_info(*build_job(target))
+        return info is not None and info.get("building") is False
+
     def get_job_info(self, job_name):
         try:
             job_info = self.server.get_job_info(job_name)
@@ -51,48 +103,92 @@ class JenkinsAPI:
             return None
         
     def transform_jenkins_url(self, input_url):
-        # Regex pattern to match required parts of the URL
-        pattern = r"https://(.*?)/blue/organizations/jenkins/(.*?)/detail/(.*?)/(\d+)/pipeline"
-        match = re.match(pattern, input_url)
-
-        if match:
-            base_url = match.group(1)
-            pipeline_name = match.group(2)
-            branch_name = match.group(3)
-            run_number = match.group(4)
-
-            # Construct the new URL based on the extracted information
-            transformed_url = f"https://{base_url}/blue/rest/organizations/jenkins/pipelines/{pipeline_name}/branches/{branch_name}/runs/{run_number}/log/?start=0"
-            return transformed_url
-        else:
-            raise ValueError("Invalid URL format")
-        
-    def get_jenkins_error_log(self, jenkins_url):
+        """Console text URL for a Blue Ocean run or classic build URL (as posted to Gerrit by the build bot)."""
+        target = parse_url(input_url)
+        if isinstance(target, (BlueOceanRun, JenkinsBuild)):
+            return target.console_url
+        raise ValueError("Invalid URL format")
+
+    def progressive_log_url(self, jenkins_url):
+        """Log endpoint of the build that accepts a ?start= byte offset (Blue Ocean log or classic progressiveText)."""
+        log_url = self.transform_jenkins_url(jenkins_url)
+        if log_url.endswith("/consoleText"):
+            return log_url[:-len("consoleText")] + "logText/progressiveText"
+        return log_url.split("?", 1)[0]
+
+    def get_log_size(self, log_url):
+        """Size of the build log in bytes, or None if the server does not report it."""
         try:
-            # Request the build log from the Jenkins URL
-            log_url = self.transform_jenkins_url(jenkins_url)
-            response = requests.get(log_url)
-            response.raise_for_status() 
-            
-            build_log = response.text.splitlines() 
-            error_log_lines = []
-            error_message = None
-            context_lines = 10  # Number of lines of context before each error line
-
-            for i, line in enumerate(build_log):
-                if "ERROR" in line or "Exception" in line:
-                    if error_message is None:
-                        error_message = line
-                    
-                    start_idx = max(0, i - context_lines)  # Calculate the starting index
-                    if not error_log_lines or start_idx > error_log_lines[-1][1]:
-                        error_log_lines.append((start_idx, i + 1))
-
-            error_log = "\n".join(
-                build_log[start_idx:end_idx] 
-                for start_idx, end_idx in error_log_lines
-            )
-            
+            response = self.session.head(log_url, params={"start": 0}, timeout=self.log_timeout, allow_redirects=True)
+            response.raise_for_status()
+        except requests.RequestException as err:
+            logging.warning(f"Could not get log size for {log_url}: {err}")
+            return None
+        return parse_text_size(response)
+
+    def iter_log_range(self, log_url, start=0, end=None):
+        """
+        Stream the log lines between two byte offsets.
+
+        The partial line at start is skipped (it belongs to the range before), and
+        the line straddling end is read to its end, so consecutive ranges cover
+        every line exactly once.
+        """
+        # Fetch from one byte early so a line beginning exactly at start is not dropped as partial
+        fetch_from = max(0, start - 1)
+        limit = None if end is None else end - fetch_from
+        with self.session.get(log_url, params={"start": fetch_from}, stream=True, timeout=self.log_timeout) as response:
+            response.raise_for_status()
+            yield from iter_byte_lines(response.iter_content(chunk_size=64 * 1024), skip_first=start > 0, limit=limit)
+
+    def iter_jenkins_error_blocks(self, jenkins_url, context_lines=10, max_errors=20, tail_bytes=None):
+        """
+        Stream the build log and yield ErrorBlocks as they are found.
+
+        The log is read line by line and never held in memory as a whole, and the
+        download is closed as soon as max_errors errors have been collected. Lines
+        are classified by the failure signature engine, so each block carries the
+        Signature (name, category, severity) it matched.
+
+        Reading is tail-first: only the last tail_bytes are fetched, and the window
+        widens backwards (doubling each time) only while no signature has matched.
+        When the log size is unknown, or tail_bytes is 0, the whole log is read.
+        """
+        engine = get_default_engine()
+        tail_bytes = self.tail_bytes if tail_bytes is None else tail_bytes
+        log_url = self.progressive_log_url(jenkins_url)
+        size = self.get_log_size(log_url) if tail_bytes else None
+
+        if size is None or size <= tail_bytes:
+            with self.session.get(self.transform_jenkins_url(jenkins_url), stream=True, timeout=self.log_timeout) as response:
+                response.raise_for_status()
+                lines = response.iter_lines(decode_unicode=True)
+                yield from scan_log_lines(lines, is_error=engine.match_line, context_lines=context_lines, max_errors=max_errors)
+            return
+
+        found = 0
+        window = tail_bytes
+        start, end = size - window, None
+        while True:
+            lines = self.iter_log_range(log_url, start, end)
+            for block in scan_log_lines(lines, is_error=engine.match_line, context_lines=context_lines, max_errors=max_errors - found):
+                found += 1
+                yield block
+            if found or start == 0:
+                return
+            logging.info(f"No failure signature in the last {size - start} bytes of {jenkins_url}, reading further back")
+            window *= 2
+            start, end = max(0, start - window), start
+
+    def get_jenkins_error_log(self, jenkins_url, context_lines=10, max_errors=20):
+        try:
+            blocks = list(self.iter_jenkins_error_blocks(jenkins_url, context_lines, max_errors))
+
+            # Report the most severe failure, not just the first noisy "ERROR" line
+            top_block = max(blocks, key=lambda block: block.severity) if blocks else None
+            error_message = top_block.error_line if top_block else None
+            error_log = "\n".join(block.text for block in blocks)
+
             if not error_log:
                 error_log = "No errors found in the build log."
 
@@ -101,4 +197,3 @@ class JenkinsAPI:
         except requests.RequestException as err:
             print(f"Error retrieving Jenkins error log: {err}")
             return None, None
-
@@ -1,36 +1,91 @@
 import os
+import re
+import time
+import logging
 from jira import JIRA
+from src.log_analysis.fingerprint import fingerprint_error, get_fingerprint_index
+from src.api_integration.jira_index import get_jira_index
+
+# Reserved in Jira's Lucene text search (or in a JQL string literal); the indexer drops them anyway
+JQL_TEXT_SPECIAL_CHARS = re.compile(r'[+\-&|!(){}\[\]^~*?:\\/"\']')
+
+def escape_jql_text(text):
+    """Make a raw string safe to use inside a JQL text search ("field ~ ...")."""
+    return " ".join(JQL_TEXT_SPECIAL_CHARS.sub(" ", text).split())
+
+# The local issue index is only trusted while its last sync is at most this old (seconds)
+DEFAULT_INDEX_MAX_AGE = 6 * 60 * 60
+
+def issue_summary(issue):
+    """The fields of a Jira issue the bot reports, in a form that can be cached."""
+    return {"key": issue.key, "summary": issue.fields.summary, "status": issue.fields.status.name}
 
 class JiraAPI:
-    def __init__(self):
+    def __init__(self, fingerprints=None, issue_index=None, timeout=None, max_retries=3, index_max_age=None):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        if index_max_age is None:
+            index_max_age = int(os.getenv("JIRA_INDEX_MAX_AGE", DEFAULT_INDEX_MAX_AGE))
+        self.index_max_age = index_max_age
         self.load_auth_details()
-    
+        self.fingerprints = fingerprints if fingerprints is not None else get_fingerprint_index()
+        self.issue_index = issue_index if issue_index is not None else get_jira_index()
+
     def load_auth_details(self):
         # Load auth details from environment variables
-        server_url = os.environ.get("JIRA_SERVER_URL")
+        self.server_url = os.environ.get("JIRA_SERVER_URL")
         username = os.environ.get("JIRA_USERNAME")
         token = os.environ.get("JIRA_API_TOKEN")
-        self.jira = JIRA(server=server_url, basic_auth=(username, token))
+        self.jira = JIRA(server=self.server_url, basic_auth=(username, token), timeout=self.timeout, max_retries=self.max_retries)
 
     # Search Jira for tickets related to the error
     def search_issues_for_error(self, error_message):
         try:
             # Construct JQL to search for the error message in description
-            jql = f'description ~ "{error_message}"'
+            jql = f'description ~ "{escape_jql_text(error_message)}"'
             issues = self.jira.search_issues(jql)
             return issues
         except Exception as e:
             print(f"Error searching issues in Jira: {e}")
-            return []
+            return None
+
+    def find_issues(self, error_message):
+        """
+        Return issue summaries for an error, querying Jira only when nothing local can answer.
+
+        While the local issue index has been synced within index_max_age seconds,
+        candidates are ranked there without a network round trip. Otherwise (never
+        synced, or the sync job stopped) the error is normalized to a fingerprint,
+        so the same failure seen again (another build number, path or timestamp)
+        is answered from the fingerprint index without a Jira search.
+        """
+        last_synced = self.issue_index.last_synced
+        if last_synced is not None:
+            if time.time() - last_synced <= self.index_max_age:
+                return self.issue_index.search(error_message)
+            logging.warning(f"Local Jira index last synced {int(time.time() - last_synced)}s ago, searching Jira instead")
+
+        fingerprint, normalized = fingerprint_error(error_message)
+        issues = self.fingerprints.get(fingerprint)
+        if issues is not None:
+            logging.info(f"Jira lookup for fingerprint {fingerprint} served from the index")
+            return issues
 
-    def find_jira_tickets(self, error_message):
         jira_issues = self.search_issues_for_error(error_message)
+        if jira_issues is None:
+            return []  # Search failed; do not remember it as "no tickets"
+        issues = [issue_summary(issue) for issue in jira_issues]
+        self.fingerprints.set(fingerprint, normalized, issues)
+        return issues
+
+    def find_jira_tickets(self, error_message):
+        jira_issues = self.find_issues(error_message)
         if not jira_issues:
             return f"No Jira tickets found related to the error: {error_message}"
         response = f"Found {len(jira_issues)} Jira ticket(s) related to the error: {error_message}\n"
         for issue in jira_issues:
             # Construct the URL for each Jira issue using the stored server URL
-            issue_url = f"{self.server_url}/browse/{issue.key}"
-            response += f"- {issue.key}: {issue.fields.summary} (Status: {issue.fields.status.name})\n"
+            issue_url = f"{self.server_url}/browse/{issue['key']}"
+            response += f"- {issue['key']}: {issue['summary']} (Status: {issue['status']})\n"
             response += f"  Link: {issue_url}\n"
         return response
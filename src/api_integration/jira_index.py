@@ -0,0 +1,219 @@
+import os
+import re
+import math
+import time
+import logging
+import sqlite3
+import argparse
+import threading
+from src.log_analysis.fingerprint import normalize_error, DEFAULT_INDEX_DIR
+
+logger = logging.getLogger(__name__)
+
+SYNC_FIELDS = "summary,description,status,updated"
+
+# Relevance (negated bm25) a match needs, absolutely and relative to the best match
+DEFAULT_MIN_SCORE = 1.0
+DEFAULT_MIN_RELATIVE_SCORE = 0.5
+
+# Too common in build errors to say anything about which ticket is relevant
+STOP_WORDS = {
+    "error", "errors", "failed", "failure", "fatal", "exception", "java", "lang", "the", "and", "for",
+    "not", "was", "with", "from", "info", "warning", "build", "line", "file", "null",
+}
+
+def error_query(error_message, max_terms=12):
+    """
+    FTS5 MATCH expression for an error line: its distinctive words, any of which may match.
+
+    The line is normalized first so placeholders, numbers and paths do not end
+    up as search terms; bm25 then favours issues sharing more (and rarer) words.
+    """
+    words = re.findall(r'[A-Za-z_][A-Za-z0-9_]{2,}', normalize_error(error_message))
+    terms = []
+    for word in words:
+        word = word.lower()
+        if word not in STOP_WORDS and word not in ("ts", "url", "uuid", "hex") and word not in terms:
+            terms.append(word)
+    return " OR ".join(f'"{term}"' for term in terms[:max_terms])
+
+class JiraIssueIndex:
+    """
+    Local SQLite FTS5 index of Jira issue summaries and descriptions.
+
+    Filled incrementally by sync() from the Jira REST API, and searched with
+    bm25 ranking (summary weighted above description), so matching an error
+    to candidate tickets takes milliseconds and no network round trip.
+    """
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jira_issues (key TEXT PRIMARY KEY, summary TEXT, description TEXT, status TEXT, updated TEXT)"
+            )
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS jira_issues_fts USING fts5("
+                "summary, description, content='jira_issues', tokenize='porter unicode61')"
+            )
+            self._conn.execute("CREATE TABLE IF NOT EXISTS jira_sync_state (name TEXT PRIMARY KEY, value REAL)")
+
+    @property
+    def last_synced(self):
+        """Wall-clock time the last successful sync started, or None if never synced."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM jira_sync_state WHERE name = 'last_synced'").fetchone()
+        return row[0] if row else None
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jira_issues").fetchone()[0]
+
+    def upsert(self, issues):
+        """Insert or replace issues given as dicts with key, summary, description, status and updated."""
+        with self._lock, self._conn:
+            for issue in issues:
+                row = self._conn.execute("SELECT rowid, summary, description FROM jira_issues WHERE key = ?", (issue["key"],)).fetchone()
+                if row is not None:
+                    # External content table: the old text has to be removed from the FTS index explicitly
+                    self._conn.execute(
+                        "INSERT INTO jira_issues_fts (jira_issues_fts, rowid, summary, description) VALUES ('delete', ?, ?, ?)", row
+                    )
+                    self._conn.execute(
+                        "UPDATE jira_issues SET summary = ?, description = ?, status = ?, updated = ? WHERE rowid = ?",
+                        (issue["summary"], issue["description"], issue["status"], issue["updated"], row[0]),
+                    )
+                    rowid = row[0]
+                else:
+                    rowid = self._conn.execute(
+                        "INSERT INTO jira_issues (key, summary, description, status, updated) VALUES (?, ?, ?, ?, ?)",
+                        (issue["key"], issue["summary"], issue["description"], issue["status"], issue["updated"]),
+                    ).lastrowid
+                self._conn.execute(
+                    "INSERT INTO jira_issues_fts (rowid, summary, description) VALUES (?, ?, ?)",
+                    (rowid, issue["summary"], issue["description"]),
+                )
+
+    def sync(self, jira, jql_filter=None, page_size=100, initial_window_days=365):
+        """
+        Pull issues updated since the last sync from Jira and index them.
+
+        The checkpoint is the wall-clock time the previous sync started, queried
+        with a relative "updated >= -Nm" clause so it does not depend on the Jira
+        user's timezone. Overlapping windows are harmless since issues are upserted.
+
+        :param jira: jira.JIRA client (or anything with a compatible search_issues)
+        :param jql_filter: Extra JQL restricting which issues are indexed (e.g. "project = BUILD")
+        :return: Number of issues fetched
+        """
+        started = time.time()
+        last_synced = self.last_synced
+        if last_synced is None:
+            window = f"-{initial_window_days}d"
+        else:
+            window = f"-{math.ceil((started - last_synced) / 60) + 1}m"
+        jql = f"updated >= {window}"
+        if jql_filter:
+            jql = f"({jql_filter}) AND {jql}"
+        jql += " ORDER BY updated ASC"
+
+        fetched = 0
+        while True:
+            page = jira.search_issues(jql, startAt=fetched, maxResults=page_size, fields=SYNC_FIELDS)
+            self.upsert([
+                {
+                    "key": issue.key,
+                    "summary": issue.fields.summary or "",
+                    "description": issue.fields.description or "",
+                    "status": issue.fields.status.name,
+                    "updated": issue.fields.updated,
+                }
+                for issue in page
+            ])
+            fetched += len(page)
+            # Jira may return fewer than maxResults per page, so only the total (a
+            # jira.client.ResultList attribute) or an empty page ends the listing
+            total = getattr(page, "total", None)
+            if not page or (total is not None and fetched >= total):
+                break
+
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO jira_sync_state (name, value) VALUES ('last_synced', ?)", (started,))
+        logger.info(f"Synced {fetched} Jira issues into the local index ({jql})")
+        return fetched
+
+    def search(self, error_message, limit=5, min_score=DEFAULT_MIN_SCORE, min_relative_score=DEFAULT_MIN_RELATIVE_SCORE):
+        """
+        Return the best matching issues for an error line as dicts (key, summary, status, score).
+
+        The query ORs the error's words, so nearly any issue sharing one common
+        word matches. Matches are kept only when their relevance (the negated
+        bm25 score, higher is better) is at least min_score and at least
+        min_relative_score times that of the best match.
+        """
+        query = error_query(error_message)
+        if not query:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT jira_issues.key, jira_issues.summary, jira_issues.status, bm25(jira_issues_fts, 4.0, 1.0) AS score "
+                "FROM jira_issues_fts JOIN jira_issues ON jira_issues.rowid = jira_issues_fts.rowid "
+                "WHERE jira_issues_fts MATCH ? ORDER BY score LIMIT ?",
+                (query, limit),
+            ).fetchall()
+        if not rows:
+            return []
+        cutoff = max(min_score, -rows[0][3] * min_relative_score)
+        return [
+            {"key": key, "summary": summary, "status": status, "score": score}
+            for key, summary, status, score in rows if -score >= cutoff
+        ]
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+def get_jira_index():
+    """Process-wide issue index stored under JIRA_INDEX_DIR, next to the fingerprint index."""
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            index_dir = os.getenv("JIRA_INDEX_DIR", DEFAULT_INDEX_DIR)
+            _default_index = JiraIssueIndex(os.path.join(index_dir, "jira_issues.sqlite3"))
+        return _default_index
+
+def start_periodic_sync(jira, interval_seconds, jql_filter=None):
+    """Keep the shared index up to date from a daemon thread."""
+    def run():
+        while True:
+            try:
+                get_jira_index().sync(jira, jql_filter=jql_filter)
+            except Exception as e:
+                logger.error(f"Jira index sync failed: {e}")
+            time.sleep(interval_seconds)
+
+    thread = threading.Thread(target=run, name="jira-index-sync", daemon=True)
+    thread.start()
+    return thread
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally sync Jira issues into the local full-text index.")
+    parser.add_argument('--jql', default=os.getenv("JIRA_INDEX_JQL"), help="Extra JQL filter, e.g. 'project in (BUILD, INFRA)'")
+    parser.add_argument('--search', help="Instead of syncing, search the index for this error line")
+    args = parser.parse_args()
+
+    index = get_jira_index()
+    if args.search:
+        for issue in index.search(args.search):
+            print(f"{issue['key']}\t{issue['score']:.2f}\t{issue['status']}\t{issue['summary']}")
+        return
+
+    from src.api_integration.clients import get_jira_api
+    fetched = index.sync(get_jira_api().jira, jql_filter=args.jql)
+    print(f"Fetched {fetched} issues; {len(index)} issues indexed")
+
+if __name__ == "__main__":
+    main()
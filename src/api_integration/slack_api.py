@@ -1,11 +1,15 @@
 import os
 import requests
-from error_handling.exceptions import SlackAPIError, APIRequestError
+from src.error_handling.exceptions import SlackAPIError, APIRequestError
+from src.api_integration.slack_rate_limit import get_slack_rate_limiter
 from src.utils.logging import logger
 
 class SlackAPI:
-    def __init__(self):
+    def __init__(self, session=None, limiter=None):
         self.token = os.environ.get("SLACK_BOT_TOKEN")
+        self.session = session or requests.Session()
+        # Paces calls for the workspace and resends them after the Retry-After of a 429
+        self.limiter = limiter or get_slack_rate_limiter()
         self.base_url = "https://slack.com/api"
         self.headers = {
             "Authorization": f"Bearer {self.token}",
@@ -21,7 +25,7 @@ class SlackAPI:
         }
         
         try:
-            response = requests.post(url, headers=self.headers, json=payload)
+            response = self.limiter.request(lambda: self.session.post(url, headers=self.headers, json=payload))
             response.raise_for_status()  # Raise HTTP error for bad responses (4xx, 5xx)
             data = response.json()
             
@@ -33,6 +37,29 @@ class SlackAPI:
             logger.error(f"Error posting message to {channel}: {e}")
             raise APIRequestError(f"Failed to post message to Slack: {str(e)}")
 
+    def update_message(self, channel, ts, text, blocks=None):
+        url = f"{self.base_url}/chat.update"
+        payload = {
+            "channel": channel,
+            "ts": ts,
+            "text": text
+        }
+        if blocks is not None:
+            payload["blocks"] = blocks
+
+        try:
+            response = self.limiter.request(lambda: self.session.post(url, headers=self.headers, json=payload))
+            response.raise_for_status()
+            data = response.json()
+
+            if not data.get("ok"):
+                raise SlackAPIError(f"Slack API error: {data.get('error', 'Unknown error')}")
+
+            return data
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error updating message {ts} in {channel}: {e}")
+            raise APIRequestError(f"Failed to update Slack message: {str(e)}")
+
     def get_channel_info(self, channel):
         url = f"{self.base_url}/conversations.info"
         params = {
@@ -40,7 +67,7 @@ class SlackAPI:
         }
         
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self.limiter.request(lambda: self.session.get(url, headers=self.headers, params=params))
             response.raise_for_status()  # Raise HTTP error for bad responses (4xx, 5xx)
             data = response.json()
             
@@ -0,0 +1,114 @@
+import time
+import logging
+import threading
+from slack_sdk.errors import SlackApiError
+from src.utils.config import load_config
+
+logger = logging.getLogger(__name__)
+
+def retry_after_seconds(headers, default=1.0):
+    """Seconds to wait from a 429 response's Retry-After header."""
+    for name in ("Retry-After", "retry-after"):
+        value = (headers or {}).get(name)
+        if value is not None:
+            if isinstance(value, list):
+                value = value[0]
+            try:
+                return float(value)
+            except ValueError:
+                break
+    return default
+
+class TokenBucket:
+    """
+    Token bucket allowing `rate` calls per second with bursts of up to `capacity`.
+
+    pause() empties the bucket and blocks every caller until the given time has
+    passed, which is how a Retry-After from Slack is honoured for all threads.
+    """
+
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.paused_until = 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Take one token, sleeping until one is available. Returns the time spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                else:
+                    wait = (1 - self.tokens) / self.rate
+            self._sleep(wait)
+            waited += wait
+
+    def pause(self, seconds):
+        with self._lock:
+            now = self._clock()
+            self.paused_until = max(self.paused_until, now + seconds)
+            self.tokens = 0
+            self._updated = now
+
+class SlackRateLimiter:
+    """Paces Slack Web API calls for one workspace and retries them after a 429."""
+
+    def __init__(self, rate=1.0, burst=5, max_retries=3):
+        self.bucket = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.throttled = 0
+
+    def pause(self, seconds):
+        self.throttled += 1
+        logger.warning(f"Slack rate limited us, pausing calls for {seconds:.1f}s")
+        self.bucket.pause(seconds)
+
+    def call(self, method, *args, **kwargs):
+        """Call a slack_sdk WebClient method within the rate limit, retrying on HTTP 429."""
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            try:
+                return method(*args, **kwargs)
+            except SlackApiError as e:
+                if e.response.status_code != 429 or attempt == self.max_retries:
+                    raise
+                self.pause(retry_after_seconds(e.response.headers))
+
+    def request(self, send):
+        """Like call() for raw HTTP: send() returns a requests.Response, resent after a 429."""
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            response = send()
+            if response.status_code != 429 or attempt == self.max_retries:
+                return response
+            self.pause(retry_after_seconds(response.headers))
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def get_slack_rate_limiter(team_id=None):
+    """Shared limiter per Slack workspace, configured by slack.rate_limit in config.yml."""
+    with _limiters_lock:
+        if team_id not in _limiters:
+            settings = (load_config().get("slack") or {}).get("rate_limit") or {}
+            _limiters[team_id] = SlackRateLimiter(
+                rate=settings.get("rate_per_second", 1.0),
+                burst=settings.get("burst", 5),
+                max_retries=settings.get("max_retries", 3),
+            )
+        return _limiters[team_id]
@@ -0,0 +1,201 @@
+import re
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Slack Block Kit limits
+MAX_BLOCKS_PER_MESSAGE = 50
+MAX_SECTION_TEXT = 3000
+
+def section(text):
+    return {"type": "section", "text": {"type": "mrkdwn", "text": text}}
+
+def split_text(text, limit=MAX_SECTION_TEXT):
+    """Split text into pieces no longer than limit, preferring line boundaries."""
+    pieces = []
+    while len(text) > limit:
+        cut = text.rfind("\n", 0, limit)
+        cut = cut if cut > 0 else limit
+        pieces.append(text[:cut])
+        text = text[cut:].lstrip("\n")
+    if text:
+        pieces.append(text)
+    return pieces
+
+def log_filename(title):
+    name = re.sub(r'[^a-z0-9]+', '-', title.lower()).strip('-')[:40] or "output"
+    return f"{name}.log"
+
+class ReplyGroup:
+    """The part of a reply about one target, shown under its own heading (see ReplyBuilder.group)."""
+
+    def __init__(self, builder, heading):
+        self.builder = builder
+        self.heading = heading
+        self.sections = []
+
+    def __call__(self, text=None, **kwargs):
+        self.builder.add(text or "", group=self)
+
+    def status(self, text):
+        self.builder.status(text)
+
+class ReplyBuilder:
+    """
+    Collects everything a handler says about one mention into a single Slack message.
+
+    It is called like Bolt's say(), so handlers do not change. Each reply becomes
+    a Block Kit section instead of its own chat.postMessage. Replies with a long
+    body (build logs) keep their first line in the message and the body is
+    uploaded as a file. publish() posts the message, or updates it with
+    chat.update once posted, so results can be shown progressively. All calls go
+    through the workspace's rate limiter.
+
+    When a mention has several targets whose handlers run concurrently, each
+    gets a ReplyGroup from group(); a group's replies are kept together under
+    its heading, and groups appear in the order they were created.
+
+    With stream=True every reply or status change is published as it happens.
+    Publishing runs on a background thread and only ever sends the latest
+    state, so handlers never wait on Slack and updates that pile up while the
+    limiter is throttling collapse into one chat.update.
+    """
+
+    def __init__(self, client, channel, thread_ts=None, limiter=None, long_text_lines=15, long_text_chars=2500, stream=False):
+        self.client = client
+        self.channel = channel
+        self.thread_ts = thread_ts
+        self.limiter = limiter
+        self.long_text_lines = long_text_lines
+        self.long_text_chars = long_text_chars
+        self.stream = stream
+        self.ts = None  # Set once the message has been posted
+        self.api_calls = 0
+        self._sections = []
+        self._groups = OrderedDict()  # key -> ReplyGroup
+        self._files = []
+        self._status = None
+        self._dirty = False
+        self._publishing = False
+        self._finished = False
+        self._lock = threading.RLock()  # Guards the message state
+        self._publish_lock = threading.Lock()  # Serializes Slack calls, which are made without holding _lock
+
+    def __call__(self, text=None, **kwargs):
+        self.add(text or "")
+
+    def group(self, key, heading):
+        """Create the reply group for a target, e.g. one URL of the mention."""
+        with self._lock:
+            group = self._groups[key] = ReplyGroup(self, heading)
+            return group
+
+    def group_for(self, key):
+        """The group created for key, or the builder itself when there is none."""
+        with self._lock:
+            return self._groups.get(key, self)
+
+    def add(self, text, group=None):
+        header, _, body = text.partition("\n")
+        if body and (body.count("\n") + 1 > self.long_text_lines or len(body) > self.long_text_chars):
+            with self._lock:
+                self._files.append((header.rstrip(":"), body))
+            text = f"{header} _(attached as a file)_"
+        with self._lock:
+            (group.sections if group is not None else self._sections).append(text)
+        self._changed()
+
+    def status(self, text):
+        """Set a transient progress line, shown while results are still coming in."""
+        with self._lock:
+            self._status = text
+        self._changed()
+
+    def _changed(self):
+        if not self.stream:
+            return
+        with self._lock:
+            self._dirty = True
+            if self._publishing or self._finished:
+                return
+            self._publishing = True
+        threading.Thread(target=self._publish_pending, name="reply-publisher", daemon=True).start()
+
+    def _publish_pending(self):
+        while True:
+            with self._lock:
+                if not self._dirty or self._finished:
+                    self._publishing = False
+                    return
+                self._dirty = False
+            try:
+                self.publish()
+            except Exception as e:
+                logger.error(f"Failed to publish progress to {self.channel}: {e}")
+
+    def _texts(self):
+        texts = list(self._sections)
+        for group in self._groups.values():
+            if group.sections:
+                texts.append(group.heading)
+                texts.extend(group.sections)
+        return texts
+
+    def blocks(self):
+        with self._lock:
+            blocks = [section(piece) for text in self._texts() for piece in split_text(text)]
+            if self._status:
+                blocks.append({"type": "context", "elements": [{"type": "mrkdwn", "text": self._status}]})
+            return blocks
+
+    def fallback_text(self):
+        with self._lock:
+            texts = self._texts() or [self._status or ""]
+            return texts[0].split("\n", 1)[0]
+
+    def _call(self, method, **kwargs):
+        with self._lock:
+            self.api_calls += 1
+        if self.limiter is not None:
+            return self.limiter.call(method, **kwargs)
+        return method(**kwargs)
+
+    def publish(self):
+        """Post the message, or update it in place once it has been posted."""
+        with self._publish_lock:
+            with self._lock:
+                blocks = self.blocks()[:MAX_BLOCKS_PER_MESSAGE]
+                text = self.fallback_text()
+            if not blocks:
+                return None
+            if self.ts is None:
+                response = self._call(
+                    self.client.chat_postMessage, channel=self.channel, thread_ts=self.thread_ts, text=text, blocks=blocks,
+                )
+                self.ts = response["ts"]
+            else:
+                self._call(self.client.chat_update, channel=self.channel, ts=self.ts, text=text, blocks=blocks)
+            return self.ts
+
+    def flush(self):
+        """Publish the final message (without the status line), then any overflow blocks and attached files."""
+        with self._lock:
+            self._status = None
+            self._finished = True  # Stops the background publisher; this is the last update
+        self.publish()
+        with self._lock:
+            overflow = self.blocks()[MAX_BLOCKS_PER_MESSAGE:]
+            text = self.fallback_text()
+            files, self._files = self._files, []
+        for start in range(0, len(overflow), MAX_BLOCKS_PER_MESSAGE):
+            self._call(
+                self.client.chat_postMessage, channel=self.channel, thread_ts=self.thread_ts,
+                text=text, blocks=overflow[start:start + MAX_BLOCKS_PER_MESSAGE],
+            )
+        for title, content in files:
+            self._call(
+                self.client.files_upload_v2, channel=self.channel, thread_ts=self.thread_ts or self.ts,
+                title=title, filename=log_filename(title), content=content,
+            )
@@ -1,56 +1,162 @@
 import os
 from slack_bolt import App
 from slack_bolt.adapter.socket_mode import SocketModeHandler
-from src.nlp_processing.inference import process_with_gpt_j
+from src.nlp_processing.inference import process_with_gpt_j, warm_up
+from src.nlp_processing.utils import extract_urls
 from src.handlers.build_url_handler import handle_gerrit, handle_jenkins_url
 from src.handlers.cr_status_handler import handle_gerrit_url
+from src.handlers.artifact_handler import ArtifactHandler
+from src.utils.url_router import UrlRouter, GerritChange, JenkinsBuild, BlueOceanRun, JenkinsArtifact
+from src.api_integration.clients import get_jira_api
+from src.api_integration.jira_index import start_periodic_sync
+from src.api_integration.slack_reply import ReplyBuilder
+from src.api_integration.slack_rate_limit import get_slack_rate_limiter
 from src.utils.logging import setup_logging
+from src.utils.config import load_config
+from src.utils.work_queue import FairWorkQueue, ACCEPTED, DUPLICATE
+from src.utils.build_watcher import BuildWatcher
 
 class SlackBot:
     def __init__(self):
         self.app = App(token=os.getenv("SLACK_BOT_TOKEN"))
         self.logger = setup_logging()
+        config = load_config()
+        events_config = config.get("events") or {}
+        self.stream_replies = (config.get("slack") or {}).get("stream_replies", True)
+        # Mentions are processed off the Bolt listener threads so Slack is acked right away
+        self.work_queue = FairWorkQueue(
+            workers=events_config.get("workers", 8),
+            max_pending=events_config.get("max_pending", 200),
+            max_pending_per_key=events_config.get("max_pending_per_channel", 20),
+            dedup_ttl_seconds=events_config.get("dedup_ttl_seconds", 600),
+        )
+        self.router = self.build_router()
+        self.watcher = self.build_watcher(config.get("watcher") or {})
         self.register_event_handlers()
 
     def register_event_handlers(self):
         @self.app.event("app_mention")
-        def handle_mention_events(event, say):
-            text = event.get('text', '')
-            thread_ts = event.get('ts') or event.get('ts')
-
-            result = process_with_gpt_j(text, thread_ts)
-            intent = result["intent"]
-            urls = result["urls"]
-
-            # Ensure there's at least one URL extracted
-            if not urls:
-                say("Please provide a valid URL in your request.")
-                return
-            
-            url = urls[0]
-            if "gerrit" in url:
-                # Handle Gerrit URL
-                if intent == "Build_Status" or intent == "Build Failure":
-                    say("Checking build status from Gerrit...")
-                    handle_gerrit(url, say)
-                elif intent == "CR Status":
-                    say("Fetching CR status from Gerrit...")
-                    handle_gerrit_url(url, say)
-                else:
-                    say("Sorry, I didn't understand that. Please specify if you need to check build status or CR status.")
-
-            elif "jenkins" in url:
-                # Handle Jenkins URL
-                if intent == "Build_Status" or intent == "Build Failure":
-                    say("Checking the latest Jenkins build status...")
-                    handle_jenkins_url(url, say)
-                else:
-                    say("Sorry, I didn't understand that. Please specify if you need to check for build failure, status, etc.")
+        def handle_mention_events(event, say, body, client):
+            # Replies are coalesced into one message, paced per workspace
+            reply = ReplyBuilder(
+                client, event.get('channel'), thread_ts=event.get('thread_ts'),
+                limiter=get_slack_rate_limiter(body.get('team_id')), stream=self.stream_replies,
+            )
+            # Slack redelivers an event (same event_id) when it thinks the ack was late
+            outcome = self.work_queue.submit(
+                lambda: self.process_mention(event, reply), key=event.get('channel'), task_id=body.get('event_id'),
+            )
+            if outcome == ACCEPTED:
+                self.watch_mentioned(event, body.get('team_id'))
+            elif outcome == DUPLICATE:
+                self.logger.info(f"Ignoring retried delivery of event {body.get('event_id')}")
             else:
-                say("Unsupported URL provided. Please provide a valid Jenkins or Gerrit URL.")
+                say("I'm handling a lot of requests right now. Please try again in a minute.")
 
+    def build_router(self):
+        router = UrlRouter()
+        router.register(GerritChange, self.grouped(self.handle_gerrit_target))
+        router.register(JenkinsBuild, self.grouped(self.handle_jenkins_target))
+        router.register(BlueOceanRun, self.grouped(self.handle_jenkins_target))
+        router.register(JenkinsArtifact, self.grouped(self.handle_artifact_target))
+        return router
+
+    @staticmethod
+    def grouped(handler):
+        """Give a handler the reply group of its own target, so concurrent handlers do not interleave."""
+        def run(target, intent, reply):
+            handler(target, intent, reply.group_for(target))
+        return run
+
+    def build_watcher(self, watcher_config):
+        if not watcher_config.get("enabled", True):
+            return None
+        notify = self.notify_thread if watcher_config.get("notify", False) else None
+        return BuildWatcher(
+            min_interval=watcher_config.get("min_interval_seconds", 15),
+            max_interval=watcher_config.get("max_interval_seconds", 300),
+            watch_seconds=watcher_config.get("watch_minutes", 120) * 60,
+            max_watches=watcher_config.get("max_watches", 200),
+            workers=watcher_config.get("workers", 4),
+            notify=notify,
+        )
+
+    def watch_mentioned(self, event, team_id=None):
+        """Have the watcher keep the changes and builds in a mention warm for follow-up questions."""
+        if self.watcher is None:
+            return
+        thread_ts = event.get('thread_ts') or event.get('ts')
+        for target in self.router.parse_all(extract_urls(event.get('text', ''))):
+            self.watcher.watch(target, event.get('channel'), thread_ts, team_id)
+
+    def notify_thread(self, channel, thread_ts, text, team_id=None):
+        # Share the mention's workspace bucket with the replies posted there
+        get_slack_rate_limiter(team_id).call(self.app.client.chat_postMessage, channel=channel, thread_ts=thread_ts, text=text)
+
+    def process_mention(self, event, reply):
+        # With streaming, this placeholder is posted at once and then updated stage by stage
+        reply.status("Looking into it...")
+        try:
+            self.answer_mention(event, reply)
+        finally:
+            reply.flush()
+
+    def answer_mention(self, event, say):
+        text = event.get('text', '')
+        thread_ts = event.get('ts') or event.get('ts')
+
+        result = process_with_gpt_j(text, thread_ts)
+        intent = result["intent"]
+        urls = result["urls"]
+
+        # Ensure there's at least one URL extracted
+        if not urls:
+            say("Please provide a valid URL in your request.")
+            return
+
+        # Every supported URL in the message is parsed once and handled concurrently
+        targets = self.router.parse_all(urls)
+        if not targets:
+            say("Unsupported URL provided. Please provide a valid Jenkins or Gerrit URL.")
+            return
+        if len(targets) > 1:
+            # Created up front so the groups appear in the order of the URLs in the message
+            for target in targets:
+                say.group(target, f"*{target.url}*")
+        self.router.dispatch(targets, intent, say)
+
+    def handle_gerrit_target(self, target, intent, say):
+        if intent == "Build_Status" or intent == "Build Failure":
+            say.status("Checking build status from Gerrit...")
+            handle_gerrit(target, say)
+        elif intent == "CR Status":
+            say.status("Fetching CR status from Gerrit...")
+            handle_gerrit_url(target, say)
+        else:
+            say("Sorry, I didn't understand that. Please specify if you need to check build status or CR status.")
+
+    def handle_jenkins_target(self, target, intent, say):
+        if intent == "Build_Status" or intent == "Build Failure":
+            say.status("Checking the latest Jenkins build status...")
+            handle_jenkins_url(target.url, say)
+        else:
+            say("Sorry, I didn't understand that. Please specify if you need to check for build failure, status, etc.")
+
+    def handle_artifact_target(self, target, intent, say):
+        if ArtifactHandler(self.app.client).validate_artifact(target.url):
+            say(f"Artifact available: <{target.url}|{target.relative_path}>")
+        else:
+            say(f"The artifact {target.relative_path} of build {target.build_number} could not be found.")
 
     def start(self):
+        # Load the intent model in the background so the socket connects right away
+        warm_up(background=True)
+        if self.watcher is not None:
+            self.watcher.start()
+        # Keep the local Jira index fresh so ticket lookups stay offline
+        sync_interval = os.getenv("JIRA_INDEX_SYNC_INTERVAL")
+        if sync_interval:
+            start_periodic_sync(get_jira_api().jira, int(sync_interval), jql_filter=os.getenv("JIRA_INDEX_JQL"))
         SocketModeHandler(self.app, os.getenv("SLACK_APP_TOKEN")).start()
 
 if __name__ == "__main__":
@@ -1,13 +1,46 @@
 import os
-import requests
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote
+from src.api_integration.clients import get_client_registry
+
+# Slack Block Kit limits
+MAX_BLOCKS_PER_MESSAGE = 50
+MAX_SECTION_TEXT = 3000
+
+DEFAULT_VALIDATION_WORKERS = 16
+
+def artifact_blocks(artifact_urls):
+    """
+    Block Kit sections listing artifact download links.
+
+    Links are packed into as few sections as the per-section text limit allows.
+    """
+    blocks = [{"type": "section", "text": {"type": "mrkdwn", "text": f"*{len(artifact_urls)} artifact(s) available*"}}]
+    text = ""
+    for url in artifact_urls:
+        line = f"• <{url}|{unquote(url.rsplit('/', 1)[-1])}>"
+        if text and len(text) + 1 + len(line) > MAX_SECTION_TEXT:
+            blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": text}})
+            text = ""
+        text = f"{text}\n{line}" if text else line
+    if text:
+        blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": text}})
+    return blocks
+
+def chunk_blocks(blocks, max_blocks=MAX_BLOCKS_PER_MESSAGE):
+    """Split a block list into messages that each fit Slack's block limit."""
+    return [blocks[i:i + max_blocks] for i in range(0, len(blocks), max_blocks)]
 
 class ArtifactHandler:
-    def __init__(self, slack_client):
+    def __init__(self, slack_client, session=None, max_workers=DEFAULT_VALIDATION_WORKERS):
         self.jenkins_url = os.getenv('JENKINS_URL')
         self.jenkins_user = os.getenv('JENKINS_USER')
         self.jenkins_token = os.getenv('JENKINS_TOKEN')
         self.slack_client = slack_client
+        # Pooled session from the client registry; build JSON for finished builds is cached indefinitely
+        self.session = session or get_client_registry().session("artifacts")
+        self.max_workers = max_workers
 
     def fetch_artifacts(self, job_name, build_number):
         """
@@ -19,7 +52,7 @@ class ArtifactHandler:
         """
         try:
             url = f"{self.jenkins_url}/job/{job_name}/{build_number}/api/json"
-            response = requests.get(url, auth=(self.jenkins_user, self.jenkins_token))
+            response = self.session.get(url, auth=(self.jenkins_user, self.jenkins_token))
 
             if response.status_code != 200:
                 logging.error(f"Failed to fetch build details: {response.status_code} {response.text}")
@@ -43,22 +76,44 @@ class ArtifactHandler:
         :return: True if the artifact is valid, False otherwise
         """
         try:
-            response = requests.head(artifact_url)
+            response = self.session.head(artifact_url)
             return response.status_code == 200
         except Exception as e:
             logging.error(f"Error validating artifact: {str(e)}")
             return False
 
+    def validate_artifacts(self, artifact_urls):
+        """
+        Validates many artifact URLs concurrently.
+
+        HEAD requests run on a bounded thread pool sharing the pooled session, so
+        validating any number of artifacts takes about one round trip per batch
+        of max_workers rather than one per artifact.
+
+        :param artifact_urls: List of artifact URLs
+        :return: The valid URLs, in their original order
+        """
+        if not artifact_urls:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(artifact_urls)), thread_name_prefix="artifact-head") as executor:
+            results = list(executor.map(self.validate_artifact, artifact_urls))
+        for url, valid in zip(artifact_urls, results):
+            if not valid:
+                logging.error(f"Artifact URL is not valid: {url}")
+        return [url for url, valid in zip(artifact_urls, results) if valid]
+
     def post_artifact_to_slack(self, channel, artifact_urls):
         """
         Posts artifact URLs to a specified Slack channel.
 
+        All valid artifacts go into a single Block Kit message, split into
+        several only when it exceeds Slack's block limit.
+
         :param channel: Slack channel to post the artifact URLs
         :param artifact_urls: List of artifact URLs to post
         """
-        for url in artifact_urls:
-            if self.validate_artifact(url):
-                message = f"Artifact available: <{url}|Download Here>"
-                self.slack_client.chat_postMessage(channel=channel, text=message)
-            else:
-                logging.error(f"Artifact URL is not valid: {url}")
+        valid_urls = self.validate_artifacts(artifact_urls)
+        if not valid_urls:
+            return
+        for blocks in chunk_blocks(artifact_blocks(valid_urls)):
+            self.slack_client.chat_postMessage(channel=channel, text=f"{len(valid_urls)} artifact(s) available", blocks=blocks)
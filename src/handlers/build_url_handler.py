@@ -1,72 +1,127 @@
-from src.api_integration.jenkins_api import JenkinsAPI
-from src.api_integration.jira_api import JiraAPI 
-from src.api_integration.gerrit_api import GerritAPI 
+from concurrent.futures import ThreadPoolExecutor
+from src.api_integration.clients import get_jenkins_api, get_jira_api, get_async_gerrit_api
+from src.log_analysis.triage import triage_builds, get_cached_scan, cache_scan
 import logging
 
 logger = logging.getLogger(__name__)
 
+def show_status(say, text):
+    """Update the progress line of a streamed reply (see ReplyBuilder); a plain say() has none."""
+    if hasattr(say, "status"):
+        say.status(text)
+
+def say_jira_tickets(jira_tickets_response, say):
+    if jira_tickets_response.startswith("No Jira tickets found"):
+        say("No relevant Jira tickets found.")
+        logger.info(f"No relevant Jira tickets found for the error.")
+    else:
+        say(f"Found relevant Jira tickets:\n{jira_tickets_response}")
+        logger.info(f"Relevant Jira tickets found")
+
 def handle_jenkins_url(jenkins_url, say):
     logger.info(f"Received Jenkins URL: {jenkins_url}")
     
     try:
-        error_log, error_message = JenkinsAPI.get_jenkins_error_log(jenkins_url)
-        if error_message:
-            say(f"Error identified in Jenkins build: {error_message}")
-            say(f"Here is the relevant Jenkins log:\n{error_log}")
+        show_status(say, "Scanning the Jenkins log...")
+        # Errors are streamed out of the log, so the first one is shown before the download finishes
+        found = []
+        jira_lookup = None
+        # Finished builds the watcher has already scanned are answered without touching Jenkins
+        blocks = get_cached_scan(jenkins_url)
+        scanned = blocks is None
+        if scanned:
+            blocks = get_jenkins_api(jenkins_url).iter_jenkins_error_blocks(jenkins_url)
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="jira-lookup") as executor:
+            for block in blocks:
+                if not found:
+                    show_status(say, f"Found an error, scanning the rest of the log: {block.error_line}")
+                    # A specific first error is searched in Jira while the rest of the log is scanned. A generic
+                    # one is not: it is rarely the cause, and the search would also fill the fingerprint cache.
+                    if block.signature is not None and not block.signature.is_generic:
+                        jira_lookup = executor.submit(get_jira_api().find_jira_tickets, block.error_line)
+                found.append(block)
+
+            if found:
+                # A generic "ERROR" line often comes before the OOM or compiler error that caused the failure
+                top_block = max(found, key=lambda block: block.severity)
+                error_message = top_block.error_line
+                if top_block.signature is not None:
+                    say(f"Error identified in Jenkins build ({top_block.signature.name}): {error_message}")
+                else:
+                    say(f"Error identified in Jenkins build: {error_message}")
 
-            logger.info(f"Jenkins error log for {jenkins_url}:\n{error_log}")
+                error_log = "\n".join(block.text for block in found)
+                say(f"Here is the relevant Jenkins log:\n{error_log}")
 
-            jira_api = JiraAPI()
-            jira_tickets_response = jira_api.find_jira_tickets(error_message)
+                logger.info(f"Jenkins error log for {jenkins_url}:\n{error_log}")
 
-            if jira_tickets_response.startswith("No Jira tickets found"):
-                say("No relevant Jira tickets found.")
-                logger.info(f"No relevant Jira tickets found for the error.")
+                if jira_lookup is not None and top_block is found[0]:
+                    jira_tickets = jira_lookup.result()
+                else:
+                    show_status(say, "Searching Jira...")
+                    jira_tickets = get_jira_api().find_jira_tickets(error_message)
+                say_jira_tickets(jira_tickets, say)
             else:
-                say(f"Found relevant Jira tickets:\n{jira_tickets_response}")
-                logger.info(f"Relevant Jira tickets found")
-        else:
-            say("No errors identified in the Jenkins build. Please try re-triggering the build.")
-            logger.info(f"No errors found in Jenkins build")
+                say("No errors identified in the Jenkins build. Please try re-triggering the build.")
+                logger.info(f"No errors found in Jenkins build")
+
+        # Kept for follow-up questions, and so the build watcher does not download the log again
+        if scanned and get_jenkins_api(jenkins_url).is_build_finished(jenkins_url):
+            cache_scan(jenkins_url, found)
     
     except Exception as e:
         logger.error(f"An error occurred while processing the Jenkins URL: {jenkins_url}. Error details: {str(e)}")
         say("An error occurred while processing the Jenkins URL.")
         say(f"Error details: {str(e)}")
 
-def handle_gerrit(gerrit_url, say):
-    change_id = extract_change_id(gerrit_url)
-    if change_id:
-        gerrit_api = GerritAPI(base_url="https://gerrit.eng.nutanix.com")
-        
-        try:
-            cr_status = gerrit_api.get_cr_status(gerrit_url)
-            if cr_status:
-                merge_status = cr_status.get("merge_status", "UNKNOWN")
-                verification_score = cr_status.get("verification_score", "Not Available")
-                
-                say(f"The current merge status of the CR is: {merge_status}")
-                say(f"Verification score: {verification_score}")
-                
-                build_url = gerrit_api.get_build_url(gerrit_url)
-                if build_url:
-                    handle_jenkins_url(build_url, say)
-                else:
-                    say("Could not retrieve the Jenkins build URL.")
-            else:
-                say("Could not retrieve change request status.")
-        
-        except Exception as e:
-            say("An error occurred while processing the Gerrit URL.")
-            say(f"Error details: {str(e)}")
+def handle_failed_builds(build_urls, say):
+    """Triage every failed build of a change at once and report one merged summary."""
+    logger.info(f"Triaging {len(build_urls)} failed builds: {build_urls}")
+    say(f"Found {len(build_urls)} failed builds, checking their logs...")
+
+    scanned = []
+    def on_result(build):
+        scanned.append(build)
+        show_status(say, f"Scanned {len(scanned)} of {len(build_urls)} build logs...")
+
+    report = triage_builds(build_urls, on_result=on_result)
+    say(report.format_summary())
+
+    error_message = report.top_error_line
+    if error_message:
+        show_status(say, "Searching Jira...")
+        say_jira_tickets(get_jira_api().find_jira_tickets(error_message), say)
     else:
-        say("Invalid Gerrit URL provided. Please check the format and try again.")
+        say("No errors identified in the failed builds. Please try re-triggering the build.")
 
+def handle_gerrit(target, say):
+    """Report a change's status and triage its failed builds; target is the GerritChange parsed by the URL router."""
+    gerrit_api = get_async_gerrit_api()
 
-def extract_change_id(gerrit_url):
-    """Extract the change ID from the Gerrit URL."""
     try:
-        # Assuming the change ID is the last segment after the last '/'
-        return gerrit_url.split('/')[-1]
+        show_status(say, "Fetching the change from Gerrit...")
+        # Status, messages and comments all come from a single change fetch
+        snapshot = gerrit_api.get_change_snapshot(target.rest_url)
+        cr_status = snapshot.status
+        if cr_status:
+            merge_status = cr_status.get("merge_status", "UNKNOWN")
+            verification_score = cr_status.get("verification_score", "Not Available")
+            
+            # One reply per stage, so a streamed reply shows each result as soon as it is known
+            say(f"The current merge status of the CR is: {merge_status}\nVerification score: {verification_score}")
+            
+            failure_urls = snapshot.build_failure_urls
+            build_url = snapshot.build_url
+            if len(failure_urls) > 1:
+                handle_failed_builds(failure_urls, say)
+            elif build_url:
+                say(f"Jenkins build: {build_url}")
+                handle_jenkins_url(build_url, say)
+            else:
+                say("Could not retrieve the Jenkins build URL.")
+        else:
+            say("Could not retrieve change request status.")
+    
     except Exception as e:
-        return None
+        say("An error occurred while processing the Gerrit URL.")
+        say(f"Error details: {str(e)}")
@@ -0,0 +1,98 @@
+import argparse
+import random
+import re
+import string
+import time
+from src.log_analysis.signatures import Signature, SignatureEngine, DEFAULT_SIGNATURES_PATH, ahocorasick
+
+SAMPLE_FAILURES = [
+    "src/core/buffer.cc:120:17: error: 'size_t' was not declared in this scope",
+    "[ERROR] Failed to execute goal org.apache.maven.plugins:maven-surefire-plugin:2.22.2:test",
+    "FAILED tests/test_api.py::TestApi::test_timeout - AssertionError: 504 != 200",
+    "java.lang.OutOfMemoryError: Java heap space",
+    "fatal: unable to access 'https://git.example.com/repo.git/': Could not resolve host: git.example.com",
+]
+
+def synthetic_log(num_lines, failure_rate=0.001, seed=0):
+    """Build a log that looks like a long precommit job: mostly noise, a few real failures."""
+    rng = random.Random(seed)
+    noise = [
+        "[INFO] Building module {n}",
+        "+ make -j16 target_{n}",
+        "Downloading https://repo.example.com/artifact-{n}.jar",
+        "test_case_{n} ... ok",
+        "Compiling src/module_{n}.cc",
+    ]
+    lines = []
+    for i in range(num_lines):
+        if rng.random() < failure_rate:
+            lines.append(rng.choice(SAMPLE_FAILURES))
+        else:
+            lines.append(rng.choice(noise).format(n=i))
+    return lines
+
+def random_signatures(count, seed=0):
+    """Extra literal and regex signatures to show how the scan scales with library size."""
+    rng = random.Random(seed)
+    signatures = []
+    for i in range(count):
+        word = "".join(rng.choice(string.ascii_lowercase) for _ in range(12))
+        if i % 2:
+            signatures.append(Signature(f"extra_literal_{i}", "extra", 40, literal=f"E{word}"))
+        else:
+            signatures.append(Signature(f"extra_regex_{i}", "extra", 40, pattern=f"{word}\\d+ failed"))
+    return signatures
+
+def naive_scan(signatures, lines):
+    """One search per signature per line: the cost the engine avoids."""
+    compiled = [re.compile(s.pattern if s.pattern else re.escape(s.literal)) for s in signatures]
+    hits = 0
+    for line in lines:
+        for regex in compiled:
+            if regex.search(line):
+                hits += 1
+                break
+    return hits
+
+def time_it(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the failure signature engine against a per-pattern scan.")
+    parser.add_argument('logs', nargs='*', help="Log files to scan (a synthetic log is used if none are given)")
+    parser.add_argument('--lines', type=int, default=200_000, help="Lines in the synthetic log")
+    parser.add_argument('--extra-signatures', type=int, nargs='*', default=[0, 1000, 5000], help="Library sizes to add on top of the configured signatures")
+    parser.add_argument('--signatures', default=DEFAULT_SIGNATURES_PATH)
+    args = parser.parse_args()
+
+    if args.logs:
+        lines = []
+        for path in args.logs:
+            with open(path, errors="replace") as f:
+                lines.extend(line.rstrip("\n") for line in f)
+    else:
+        lines = synthetic_log(args.lines)
+
+    base = SignatureEngine.from_yaml(args.signatures).signatures
+    print(f"Scanning {len(lines)} lines (prefilter: {'Aho-Corasick' if ahocorasick else 'substring tests'})")
+    print(f"{'signatures':>11}{'compile s':>11}{'engine s':>10}{'lines/s':>12}{'naive s':>10}{'speedup':>9}")
+
+    for extra in args.extra_signatures:
+        signatures = base + random_signatures(extra)
+        engine, compile_seconds = time_it(SignatureEngine, signatures)
+        failures, engine_seconds = time_it(engine.scan, lines)
+        _, naive_seconds = time_it(naive_scan, signatures, lines)
+        print(
+            f"{len(signatures):>11}{compile_seconds:>11.3f}{engine_seconds:>10.3f}{len(lines) / engine_seconds:>12.0f}"
+            f"{naive_seconds:>10.3f}{naive_seconds / engine_seconds:>8.1f}x"
+        )
+
+    print("\nTop failures:")
+    for failure in failures[:5]:
+        summary = failure.to_dict()
+        print(f"  [{summary['category']}] {summary['name']} x{summary['count']} (line {summary['first_line_number']}): {summary['first_line']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import os
+import re
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+
+DEFAULT_INDEX_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'data')
+
+# Applied in order; earlier rules protect structure (URLs, timestamps) from the generic ones
+NORMALIZATION_RULES = [
+    (re.compile(r'\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?'), '<TS>'),
+    (re.compile(r'\b\d{1,2}:\d{2}:\d{2}(?:[.,]\d+)?\b'), '<TS>'),
+    (re.compile(r'''https?://[^\s'"<>]+'''), '<URL>'),
+    (re.compile(r'\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b'), '<UUID>'),
+    (re.compile(r'\b0x[0-9a-fA-F]+\b'), '<HEX>'),
+    (re.compile(r'\b(?=[0-9a-f]*[a-f])(?=[0-9a-f]*\d)[0-9a-f]{7,}\b'), '<HEX>'),
+    # Keep only the file name of a path: workspaces and temp dirs differ between runs
+    (re.compile(r'(?:[A-Za-z]:)?(?:[\w.~-]*[/\\])+([\w.-]+)'), r'\1'),
+    (re.compile(r'\d+'), '<N>'),
+    (re.compile(r'\s+'), ' '),
+]
+
+def normalize_error(message):
+    """
+    Reduce an error line to the part that is stable across builds.
+
+    Timestamps, URLs, UUIDs, hashes and numbers are replaced by placeholders and
+    paths are cut down to their file name, so the same failure on another
+    agent, workspace or build number normalizes to the same text.
+    """
+    for pattern, replacement in NORMALIZATION_RULES:
+        message = pattern.sub(replacement, message)
+    return message.strip()
+
+def fingerprint_error(message):
+    """Return (fingerprint, normalized message) for an error line."""
+    normalized = normalize_error(message)
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16], normalized
+
+class FingerprintIndex:
+    """
+    Persistent map from error fingerprint to the Jira issues found for it.
+
+    Entries expire after ttl_seconds so new tickets are eventually picked up;
+    fingerprints with no matching issues expire sooner (negative_ttl_seconds).
+    """
+
+    def __init__(self, path, ttl_seconds=24 * 3600, negative_ttl_seconds=3600):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jira_fingerprints ("
+                "fingerprint TEXT PRIMARY KEY, normalized TEXT, issues TEXT, updated_at REAL)"
+            )
+
+    def get(self, fingerprint):
+        """Return the cached list of issue dicts, or None if unknown or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT issues, updated_at FROM jira_fingerprints WHERE fingerprint = ?", (fingerprint,)
+            ).fetchone()
+        if row is None:
+            return None
+        issues = json.loads(row[0])
+        ttl = self.ttl_seconds if issues else self.negative_ttl_seconds
+        if time.time() - row[1] > ttl:
+            return None
+        return issues
+
+    def set(self, fingerprint, normalized, issues):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jira_fingerprints (fingerprint, normalized, issues, updated_at) VALUES (?, ?, ?, ?)",
+                (fingerprint, normalized, json.dumps(issues), time.time()),
+            )
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+def get_fingerprint_index():
+    """Process-wide index stored under JIRA_INDEX_DIR (default: data/ in the project root)."""
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            index_dir = os.getenv("JIRA_INDEX_DIR", DEFAULT_INDEX_DIR)
+            _default_index = FingerprintIndex(os.path.join(index_dir, "jira_fingerprints.sqlite3"))
+        return _default_index
@@ -0,0 +1,88 @@
+from collections import deque
+
+def is_error_line(line):
+    """Default error detector, matching what get_jenkins_error_log has always looked for."""
+    return "ERROR" in line or "Exception" in line
+
+class ErrorBlock:
+    """An error line together with the lines of context that preceded it."""
+
+    def __init__(self, line_number, error_line, context, signature=None):
+        self.line_number = line_number
+        self.error_line = error_line
+        self.context = context
+        self.signature = signature  # Matching failure Signature, when a signature engine was used
+
+    @property
+    def severity(self):
+        return self.signature.severity if self.signature is not None else 0
+
+    @property
+    def lines(self):
+        return self.context + [self.error_line]
+
+    @property
+    def text(self):
+        return "\n".join(self.lines)
+
+def scan_log_lines(lines, is_error=is_error_line, context_lines=10, max_errors=None):
+    """
+    Scan a log line by line and yield an ErrorBlock as soon as each error is seen.
+
+    Only a ring buffer of the last context_lines lines is kept, so memory stays
+    constant however long the log is. Context never overlaps: lines already
+    emitted with one error are not repeated before the next. Scanning stops after
+    max_errors blocks, letting callers close the underlying download early.
+
+    :param lines: Iterable of log lines (e.g. response.iter_lines())
+    :param is_error: Callable deciding whether a line is an error; it may return the
+                     matching Signature (e.g. SignatureEngine.match_line) instead of True
+    :param context_lines: Number of preceding lines to include with each error
+    :param max_errors: Stop after this many errors (None scans the whole log)
+    """
+    buffer = deque(maxlen=context_lines)
+    found = 0
+    for line_number, line in enumerate(lines, start=1):
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", errors="replace")
+        match = is_error(line)
+        if match:
+            yield ErrorBlock(line_number, line, list(buffer), signature=None if match is True else match)
+            buffer.clear()
+            found += 1
+            if max_errors is not None and found >= max_errors:
+                return
+        else:
+            buffer.append(line)
+
+def iter_byte_lines(chunks, skip_first=False, limit=None):
+    """
+    Split a stream of byte chunks into lines, tracking byte offsets.
+
+    Used to read a slice of a log that starts and ends at arbitrary byte offsets.
+
+    :param chunks: Iterable of bytes (e.g. response.iter_content())
+    :param skip_first: Drop everything up to and including the first newline, for
+                       streams that start mid-line
+    :param limit: Stop before the first line starting at or after this byte offset
+                  into the stream, or None to read to the end
+    """
+    pending = b""
+    offset = 0
+    skipping = skip_first
+    for chunk in chunks:
+        pending += chunk
+        while True:
+            newline = pending.find(b"\n")
+            if newline < 0:
+                break
+            line, pending = pending[:newline], pending[newline + 1:]
+            line_start, offset = offset, offset + newline + 1
+            if skipping:
+                skipping = False
+                continue
+            if limit is not None and line_start >= limit:
+                return
+            yield line.rstrip(b"\r")
+    if pending and not skipping and (limit is None or offset < limit):
+        yield pending.rstrip(b"\r")
@@ -0,0 +1,226 @@
+import os
+import re
+import logging
+import threading
+import yaml
+
+try:
+    import ahocorasick
+except ImportError:  # Falls back to per-atom substring tests, which grow with library size
+    ahocorasick = None
+
+try:
+    from re import _parser as sre_parse, _constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIGNATURES_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'config', 'failure_signatures.yml')
+
+# Category of the catch-all fallback signatures in the library
+GENERIC_CATEGORY = "generic"
+
+class Signature:
+    """One known failure pattern from the signature library."""
+
+    def __init__(self, name, category, severity=50, pattern=None, literal=None, ignore_case=False):
+        if (pattern is None) == (literal is None):
+            raise ValueError(f"Signature {name} needs exactly one of 'pattern' or 'literal'")
+        self.name = name
+        self.category = category
+        self.severity = severity
+        self.pattern = pattern
+        self.literal = literal
+        self.ignore_case = ignore_case
+
+    @property
+    def is_generic(self):
+        """Catch-all signatures (a bare ERROR, Exception or traceback) that say little about the cause."""
+        return self.category == GENERIC_CATEGORY
+
+    def __repr__(self):
+        return f"Signature({self.name!r}, {self.category!r}, severity={self.severity})"
+
+class FailureMatch:
+    """Aggregated occurrences of one signature in a log."""
+
+    def __init__(self, signature, line_number, line):
+        self.signature = signature
+        self.count = 1
+        self.first_line_number = line_number
+        self.first_line = line
+
+    def to_dict(self):
+        return {
+            "name": self.signature.name,
+            "category": self.signature.category,
+            "severity": self.signature.severity,
+            "count": self.count,
+            "first_line_number": self.first_line_number,
+            "first_line": self.first_line,
+        }
+
+def required_atoms(pattern, min_length=3):
+    """
+    Literal substrings of which at least one must occur in any line the regex matches.
+
+    Used to prefilter regex signatures with the literal automaton, so a regex is
+    only run on lines that contain one of its atoms. Returns None when no
+    usable atoms can be derived (the signature is then checked on every line).
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except re.error:
+        return None
+    atoms = _atoms_for_sequence(list(parsed))
+    if atoms is None or min(len(atom) for atom in atoms) < min_length:
+        return None
+    return atoms
+
+def _atoms_for_sequence(items):
+    candidates = []
+    run = []
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            run.append(chr(av))
+            continue
+        if run:
+            candidates.append(["".join(run)])
+            run = []
+        if op is sre_constants.BRANCH:
+            branches = [_atoms_for_sequence(list(seq)) for seq in av[1]]
+            if all(branch is not None for branch in branches):
+                candidates.append([atom for branch in branches for atom in branch])
+        elif op is sre_constants.SUBPATTERN:
+            inner = _atoms_for_sequence(list(av[-1]))
+            if inner is not None:
+                candidates.append(inner)
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) and av[0] >= 1:
+            inner = _atoms_for_sequence(list(av[2]))
+            if inner is not None:
+                candidates.append(inner)
+    if run:
+        candidates.append(["".join(run)])
+    if not candidates:
+        return None
+    # The best candidate is the one whose shortest alternative is longest (fewest false positives)
+    return max(candidates, key=lambda atoms: min(len(atom) for atom in atoms))
+
+class SignatureEngine:
+    """
+    Matches log lines against a whole signature library in a single pass per line.
+
+    Every literal signature, and a required literal "atom" of every regex
+    signature, goes into one Aho-Corasick automaton (pyahocorasick). Each line is
+    scanned once by the automaton, in time linear in the line length regardless
+    of how many signatures are loaded; only the regexes whose atoms were found
+    are then run. Signatures without a usable atom (or with ignore_case) are
+    combined into a single fallback alternation. The highest-severity hit wins.
+    """
+
+    def __init__(self, signatures):
+        self.signatures = list(signatures)
+        self._atoms = {}  # atom -> [(signature, compiled regex or None for plain literals)]
+        self._automaton = None
+        self._fallback_groups = {}
+        self._fallback_regex = None
+        self._compile()
+
+    @classmethod
+    def from_yaml(cls, file_path=DEFAULT_SIGNATURES_PATH):
+        with open(file_path) as f:
+            data = yaml.safe_load(f) or {}
+        signatures = [Signature(**entry) for entry in data.get("signatures", [])]
+        logger.info(f"Loaded {len(signatures)} failure signatures from {file_path}")
+        return cls(signatures)
+
+    def _compile(self):
+        fallback = []
+        for signature in self.signatures:
+            if signature.ignore_case:
+                fallback.append(signature)
+            elif signature.literal is not None:
+                self._atoms.setdefault(signature.literal, []).append((signature, None))
+            else:
+                atoms = required_atoms(signature.pattern)
+                if atoms is None:
+                    fallback.append(signature)
+                    continue
+                regex = re.compile(signature.pattern)
+                for atom in set(atoms):
+                    self._atoms.setdefault(atom, []).append((signature, regex))
+
+        if self._atoms and ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for atom, entries in self._atoms.items():
+                self._automaton.add_word(atom, entries)
+            self._automaton.make_automaton()
+
+        if fallback:
+            # Higher severity first so ties at the same position prefer the more serious failure
+            parts = []
+            for i, signature in enumerate(sorted(fallback, key=lambda s: s.severity, reverse=True)):
+                group = f"s{i}"
+                self._fallback_groups[group] = signature
+                body = re.escape(signature.literal) if signature.literal is not None else signature.pattern
+                if signature.ignore_case:
+                    body = f"(?i:{body})"
+                parts.append(f"(?P<{group}>{body})")
+            self._fallback_regex = re.compile("|".join(parts))
+
+    def _atom_hits(self, line):
+        if self._automaton is not None:
+            return (entries for _, entries in self._automaton.iter(line))
+        # Without pyahocorasick: one C-level substring test per atom
+        return (entries for atom, entries in self._atoms.items() if atom in line)
+
+    def match_line(self, line):
+        """Return the highest-severity Signature matching the line, or None."""
+        best = None
+        for entries in self._atom_hits(line):
+            for signature, regex in entries:
+                if best is not None and signature.severity <= best.severity:
+                    continue
+                if regex is None or regex.search(line):
+                    best = signature
+
+        if self._fallback_regex is not None:
+            match = self._fallback_regex.search(line)
+            if match:
+                signature = self._fallback_groups[match.lastgroup]
+                if best is None or signature.severity > best.severity:
+                    best = signature
+        return best
+
+    def scan(self, lines):
+        """
+        Match every line once and return failures ranked by severity, then first occurrence.
+
+        :return: List of FailureMatch objects, most important first
+        """
+        found = {}
+        for line_number, line in enumerate(lines, start=1):
+            signature = self.match_line(line)
+            if signature is None:
+                continue
+            if signature.name in found:
+                found[signature.name].count += 1
+            else:
+                found[signature.name] = FailureMatch(signature, line_number, line)
+        return rank_failures(found.values())
+
+def rank_failures(failures):
+    return sorted(failures, key=lambda failure: (-failure.signature.severity, failure.first_line_number))
+
+_default_engine = None
+_default_engine_lock = threading.Lock()
+
+def get_default_engine():
+    """Engine for the configured library (FAILURE_SIGNATURES_PATH overrides the default file)."""
+    global _default_engine
+    with _default_engine_lock:
+        if _default_engine is None:
+            _default_engine = SignatureEngine.from_yaml(os.getenv("FAILURE_SIGNATURES_PATH", DEFAULT_SIGNATURES_PATH))
+        return _default_engine
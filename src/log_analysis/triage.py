@@ -0,0 +1,127 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from src.api_integration.clients import get_jenkins_api
+from src.utils.cache import TTLCache
+from src.utils.url_router import parse_url, JenkinsBuild, BlueOceanRun
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 4
+
+# Error blocks of finished builds (their logs no longer change), filled by whoever scans them first
+_scan_cache = TTLCache(max_entries=512, ttl_seconds=6 * 3600)
+
+def scan_cache_key(build_url):
+    """Builds are keyed by console URL, so /console, /consoleFull and the bare build URL share an entry."""
+    target = parse_url(build_url)
+    return target.console_url if isinstance(target, (JenkinsBuild, BlueOceanRun)) else build_url
+
+def get_cached_scan(build_url):
+    """Cached error blocks of a finished build, or None."""
+    return _scan_cache.get(scan_cache_key(build_url))
+
+def cache_scan(build_url, blocks):
+    """Remember the error blocks of a build; only call this once the build has finished."""
+    _scan_cache.set(scan_cache_key(build_url), list(blocks))
+
+def scan_build(build_url):
+    """Collect the error blocks of one build (tail-first, signature-tagged), reusing a cached scan."""
+    blocks = get_cached_scan(build_url)
+    if blocks is not None:
+        return blocks
+    jenkins_api = get_jenkins_api(build_url)
+    blocks = list(jenkins_api.iter_jenkins_error_blocks(build_url))
+    # A finished build's scan is kept for follow-up questions and the build watcher
+    if jenkins_api.is_build_finished(build_url):
+        cache_scan(build_url, blocks)
+    return blocks
+
+class BuildTriage:
+    """Scan result for one failed build."""
+
+    def __init__(self, build_url, blocks=None, error=None):
+        self.build_url = build_url
+        self.blocks = blocks or []
+        self.error = error  # Exception raised while fetching or scanning, if any
+
+    @property
+    def top_block(self):
+        return max(self.blocks, key=lambda block: block.severity) if self.blocks else None
+
+class SignatureSummary:
+    """One failure signature (or untagged error line) merged across all builds it appeared in."""
+
+    def __init__(self, key, block):
+        self.key = key
+        self.signature = block.signature
+        self.severity = block.severity
+        self.example = block.error_line
+        self.count = 0
+        self.builds = []
+
+    def add(self, build_url):
+        self.count += 1
+        if build_url not in self.builds:
+            self.builds.append(build_url)
+
+class TriageReport:
+    """Merged view of several failed builds with deduplicated signatures, most severe first."""
+
+    def __init__(self, builds):
+        self.builds = builds
+        summaries = {}
+        for build in builds:
+            for block in build.blocks:
+                key = block.signature.name if block.signature is not None else block.error_line
+                summaries.setdefault(key, SignatureSummary(key, block)).add(build.build_url)
+        self.signatures = sorted(summaries.values(), key=lambda summary: (-summary.severity, -len(summary.builds)))
+
+    @property
+    def top_error_line(self):
+        return self.signatures[0].example if self.signatures else None
+
+    def format_summary(self):
+        lines = [f"Triaged {len(self.builds)} failed builds:"]
+        for build in self.builds:
+            if build.error is not None:
+                lines.append(f"• {build.build_url}: could not read log ({build.error})")
+            elif build.top_block is not None:
+                lines.append(f"• {build.build_url}: {build.top_block.error_line}")
+            else:
+                lines.append(f"• {build.build_url}: no errors identified")
+        if self.signatures:
+            lines.append("Distinct failures:")
+            for summary in self.signatures:
+                label = summary.signature.name if summary.signature is not None else "error"
+                lines.append(f"• [{label}] in {len(summary.builds)} build(s), {summary.count} occurrence(s): {summary.example}")
+        return "\n".join(lines)
+
+def triage_builds(build_urls, scan=scan_build, max_workers=DEFAULT_MAX_WORKERS, on_result=None):
+    """
+    Fetch and scan several build logs concurrently and merge the results.
+
+    Each build is scanned on a bounded thread pool, so the wall-clock time is
+    about that of the slowest build rather than the sum. A build that fails to
+    load is reported in the summary instead of failing the whole triage.
+
+    :param build_urls: Jenkins build URLs, in the order they should be reported
+    :param scan: Callable returning the list of ErrorBlocks for one build URL
+    :param max_workers: Maximum number of logs fetched at the same time
+    :param on_result: Optional callable given each BuildTriage as soon as its build is scanned
+    :return: TriageReport
+    """
+    build_urls = list(dict.fromkeys(build_urls))
+    results = {}
+    if build_urls:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(build_urls)), thread_name_prefix="triage") as executor:
+            futures = {executor.submit(scan, url): url for url in build_urls}
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    results[url] = BuildTriage(url, blocks=future.result())
+                except Exception as e:
+                    logger.error(f"Error triaging build {url}: {e}")
+                    results[url] = BuildTriage(url, error=e)
+                if on_result is not None:
+                    on_result(results[url])
+    return TriageReport([results[url] for url in build_urls])
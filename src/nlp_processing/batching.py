@@ -0,0 +1,99 @@
+import queue
+import threading
+import time
+import logging
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+class InferenceScheduler:
+    """
+    Collects concurrent inference requests into micro-batches.
+
+    Callers submit a request and get a Future back. A single worker thread waits for
+    the first request, keeps collecting for up to batch_window_ms (or until
+    max_batch_size is reached), runs batch_fn once over the whole batch and resolves
+    each caller's Future with its own result.
+    """
+
+    def __init__(self, batch_fn, max_batch_size=8, batch_window_ms=20, name="inference-scheduler"):
+        """
+        :param batch_fn: Callable taking a list of requests and returning a list of results in the same order
+        :param max_batch_size: Maximum number of requests run through the model together
+        :param batch_window_ms: How long to wait for more requests after the first one arrives
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window_ms / 1000.0
+        self._queue = queue.Queue()
+        self._stopped = threading.Event()
+
+        self.batches = 0
+        self.requests = 0
+
+        self._worker = threading.Thread(target=self._run, name=name, daemon=True)
+        self._worker.start()
+
+    def submit(self, request):
+        """Queue a request and return a Future resolved with its result."""
+        if self._stopped.is_set():
+            raise RuntimeError("Inference scheduler has been stopped")
+        future = Future()
+        self._queue.put((request, future))
+        return future
+
+    def stop(self):
+        self._stopped.set()
+        self._queue.put(None)
+        self._worker.join()
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "average_batch_size": self.requests / self.batches if self.batches else 0.0,
+            "queued": self._queue.qsize(),
+        }
+
+    def _collect(self):
+        item = self._queue.get()
+        if item is None:
+            return None
+
+        batch = [item]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)  # Let the outer loop see the stop marker
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while not self._stopped.is_set():
+            batch = self._collect()
+            if batch is None:
+                break
+
+            # Skip requests whose callers already gave up
+            batch = [(request, future) for request, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            self.batches += 1
+            self.requests += len(batch)
+            try:
+                results = self.batch_fn([request for request, _ in batch])
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception as e:
+                logger.error(f"Error running inference batch of {len(batch)} request(s): {e}")
+                for _, future in batch:
+                    future.set_exception(e)
@@ -0,0 +1,80 @@
+import argparse
+import logging
+import resource
+import statistics
+import time
+from src.nlp_processing.utils import load_excel
+from src.nlp_processing.quantization import model_size_bytes
+from src.nlp_processing.inference import load_intent_model, score_intents_batch
+from src.nlp_processing.thread_memory import ThreadMemory
+
+logger = logging.getLogger(__name__)
+
+def peak_rss_mb():
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def run_backend(name, overrides, texts, labels):
+    """Load one backend variant and measure size, latency and accuracy over the dataset."""
+    load_start = time.perf_counter()
+    intent_model = load_intent_model(overrides)
+    load_seconds = time.perf_counter() - load_start
+    # A private history counted with this model's tokenizer; the shared thread memory would load the default model
+    tokenizer = intent_model.tokenizer
+    memory = ThreadMemory(token_counter=lambda text: len(tokenizer.encode(text)))
+
+    predictions = []
+    latencies = []
+    for i, text in enumerate(texts):
+        start = time.perf_counter()
+        intent, _ = score_intents_batch([(text, f"benchmark-{name}-{i}")], intent_model=intent_model, memory=memory)[0]
+        latencies.append((time.perf_counter() - start) * 1000)
+        predictions.append(intent)
+
+    labelled = [(prediction, label) for prediction, label in zip(predictions, labels) if label]
+    accuracy = sum(prediction == label for prediction, label in labelled) / len(labelled) if labelled else None
+
+    result = {
+        "backend": name,
+        "device": str(intent_model.device),
+        "weights_mb": model_size_bytes(intent_model.model) / 2 ** 20,
+        "peak_rss_mb": peak_rss_mb(),
+        "load_seconds": load_seconds,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": sorted(latencies)[int(0.95 * (len(latencies) - 1))],
+        "accuracy": accuracy,
+    }
+    del intent_model, memory
+    return result, predictions
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare int8 quantized and unquantized intent inference on the chat dataset.")
+    parser.add_argument('--excel', default='../../data/chat_data/chat_data.xlsx', help="Path to the chat data spreadsheet")
+    parser.add_argument('--text-column', default='Input')
+    parser.add_argument('--label-column', default='Intent')
+    parser.add_argument('--limit', type=int, default=200, help="Maximum number of rows to evaluate")
+    parser.add_argument('--baseline-dtype', default='auto', help="torch dtype of the unquantized baseline (float16 on accelerators by default)")
+    args = parser.parse_args()
+
+    df = load_excel(args.excel).head(args.limit)
+    texts = [str(text) for text in df[args.text_column].fillna('')]
+    labels = list(df[args.label_column].fillna('')) if args.label_column in df.columns else [''] * len(texts)
+
+    # The baseline runs first; peak RSS only grows, so the quantized figure is an upper bound
+    baseline, baseline_predictions = run_backend("baseline", {"quantization": None, "torch_dtype": args.baseline_dtype}, texts, labels)
+    quantized, quantized_predictions = run_backend("int8", {"quantization": "int8"}, texts, labels)
+
+    agreement = sum(a == b for a, b in zip(baseline_predictions, quantized_predictions)) / len(texts) if texts else 0.0
+
+    print(f"{'backend':<10}{'device':<8}{'weights MB':>12}{'peak RSS MB':>13}{'load s':>9}{'p50 ms':>9}{'p95 ms':>9}{'accuracy':>10}")
+    for result in (baseline, quantized):
+        accuracy = f"{result['accuracy']:.3f}" if result['accuracy'] is not None else "n/a"
+        print(
+            f"{result['backend']:<10}{result['device']:<8}{result['weights_mb']:>12.0f}{result['peak_rss_mb']:>13.0f}"
+            f"{result['load_seconds']:>9.1f}{result['p50_ms']:>9.1f}{result['p95_ms']:>9.1f}{accuracy:>10}"
+        )
+    print(f"Label agreement between baseline and int8: {agreement:.3f}")
+    print(f"Weight memory reduction: {baseline['weights_mb'] / quantized['weights_mb']:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import argparse
+import logging
+import os
+from urllib.parse import urlparse
+import joblib
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from src.nlp_processing.utils import clean_text, extract_urls, load_excel
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_PATH = './models/intent_classifier/intent_classifier.joblib'
+
+def classifier_features(text):
+    """Turns a raw mention into the text the classifier sees: cleaned words plus URL-kind markers."""
+    markers = []
+    for url in extract_urls(text):
+        host = urlparse(url).netloc.lower()
+        if "gerrit" in host:
+            markers.append("gerriturl")
+        elif "jenkins" in host:
+            markers.append("jenkinsurl")
+        else:
+            markers.append("otherurl")
+    return " ".join([clean_text(text).lower()] + markers)
+
+def load_training_data(file_path, text_column='Input', label_column='Intent', teacher=None):
+    """
+    Loads labelled mentions from the chat data spreadsheet.
+
+    :param file_path: Path to the Excel file used by the fine-tuning pipeline
+    :param text_column: Column holding the user message
+    :param label_column: Column holding the intent label, if the sheet has one
+    :param teacher: Optional callable (text, thread_id) -> label used to fill in missing labels, e.g. GPT-J
+    :return: Tuple of (texts, labels)
+    """
+    df = load_excel(file_path)
+    if text_column not in df.columns:
+        raise ValueError(f"Excel file must contain a '{text_column}' column.")
+
+    texts = [str(text) for text in df[text_column].fillna('')]
+    labels = list(df[label_column]) if label_column in df.columns else [None] * len(texts)
+
+    if teacher is not None:
+        for i, (text, label) in enumerate(zip(texts, labels)):
+            if label is None or label != label:  # Missing or NaN
+                labels[i] = teacher(text, f"distill-{i}")
+        logger.info(f"Filled in teacher labels for {len(texts)} rows")
+
+    pairs = [(text, label) for text, label in zip(texts, labels) if text and label and label == label]
+    if not pairs:
+        raise ValueError("No labelled rows found; provide a label column or a teacher.")
+    texts, labels = zip(*pairs)
+    return list(texts), list(labels)
+
+def train_classifier(texts, labels):
+    """Fits a TF-IDF + logistic regression pipeline on the given mentions."""
+    pipeline = Pipeline([
+        ("tfidf", TfidfVectorizer(preprocessor=classifier_features, ngram_range=(1, 2), sublinear_tf=True, min_df=1)),
+        ("clf", LogisticRegression(max_iter=1000, class_weight="balanced")),
+    ])
+    pipeline.fit(texts, labels)
+    logger.info(f"Trained intent classifier on {len(texts)} examples, labels: {list(pipeline.classes_)}")
+    return pipeline
+
+class DistilledIntentClassifier:
+    """Small CPU-only intent classifier served in place of GPT-J."""
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+        self.labels = list(pipeline.classes_)
+
+    @classmethod
+    def load(cls, file_path=DEFAULT_MODEL_PATH):
+        try:
+            return cls(joblib.load(file_path))
+        except FileNotFoundError:
+            logger.error(f"Distilled intent classifier not found: {file_path}")
+            raise
+
+    def save(self, file_path=DEFAULT_MODEL_PATH):
+        directory = os.path.dirname(file_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        joblib.dump(self.pipeline, file_path)
+        logger.info(f"Distilled intent classifier saved to {file_path}")
+
+    def predict(self, text):
+        """Return (most likely label, dict mapping each label to its probability)."""
+        probabilities = self.pipeline.predict_proba([text])[0]
+        distribution = dict(zip(self.labels, probabilities.tolist()))
+        return max(distribution, key=distribution.get), distribution
+
+    def classify(self, text, thread_id=None):
+        """Same signature as the other intent tiers; always returns a label."""
+        label, _ = self.predict(text)
+        return label
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the distilled intent classifier from chat data.")
+    parser.add_argument('--excel', default='../../data/chat_data/chat_data.xlsx', help="Path to the chat data spreadsheet")
+    parser.add_argument('--text-column', default='Input')
+    parser.add_argument('--label-column', default='Intent')
+    parser.add_argument('--teacher', action='store_true', help="Label rows without an intent using GPT-J")
+    parser.add_argument('--output', default=DEFAULT_MODEL_PATH)
+    args = parser.parse_args()
+
+    teacher = None
+    if args.teacher:
+        # Imported lazily: loading GPT-J is only needed when generating teacher labels
+        from src.nlp_processing.inference import classify_intent
+        teacher = classify_intent
+
+    texts, labels = load_training_data(args.excel, args.text_column, args.label_column, teacher=teacher)
+    classifier = DistilledIntentClassifier(train_classifier(texts, labels))
+    classifier.save(args.output)
+    print(f"Distilled intent classifier saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
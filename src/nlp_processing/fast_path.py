@@ -0,0 +1,98 @@
+import re
+import time
+import threading
+import logging
+from urllib.parse import urlparse
+from src.nlp_processing.utils import clean_text, extract_urls
+
+logger = logging.getLogger(__name__)
+
+FAILURE_PATTERN = re.compile(r"\b(fail\w*|error\w*|broke\w*|crash\w*|exception\w*)\b")
+STATUS_PATTERN = re.compile(r"\b(status|merged?|mergeable|submitted|approved|verified|reviews?|score)\b")
+# Build/CI wording: about a change, "status" or "verified" may mean its CI run rather than its review state
+BUILD_PATTERN = re.compile(r"\b(builds?|jenkins|ci|pipelines?|jobs?|verif\w*)\b")
+
+class RuleClassifier:
+    """
+    Keyword/URL-pattern intent classifier for unambiguous mentions.
+
+    Returns a label only when the URL type and the wording agree on a single
+    intent; everything else is left to the next tier by returning None.
+    """
+
+    def classify(self, text, thread_id=None):
+        urls = extract_urls(text)
+        if not urls:
+            return None
+
+        hosts = [urlparse(url).netloc.lower() for url in urls]
+        has_gerrit = any("gerrit" in host for host in hosts)
+        has_jenkins = any("jenkins" in host for host in hosts)
+        if has_gerrit == has_jenkins:
+            return None  # No recognised URL, or both kinds in one message
+
+        words = clean_text(text).lower()
+        mentions_failure = bool(FAILURE_PATTERN.search(words))
+        mentions_status = bool(STATUS_PATTERN.search(words))
+
+        if mentions_failure and not mentions_status:
+            return "Build Failure"
+        if mentions_status and not mentions_failure:
+            if has_gerrit and BUILD_PATTERN.search(words):
+                return None
+            return "CR Status" if has_gerrit else "Build_Status"
+        return None
+
+class TieredClassifier:
+    """
+    Runs classifier tiers from cheapest to most expensive and stops at the first answer.
+
+    Each tier is a (name, callable) pair; the callable takes (text, thread_id) and
+    returns a label, or None to abstain. Per-tier call and hit counts and time
+    spent (abstentions included) are recorded so the savings of the cheap tiers
+    can be monitored.
+    """
+
+    def __init__(self, tiers):
+        self.tiers = tiers
+        self._lock = threading.Lock()
+        self._calls = {name: 0 for name, _ in tiers}
+        self._hits = {name: 0 for name, _ in tiers}
+        self._seconds = {name: 0.0 for name, _ in tiers}
+        self.total = 0
+
+    def classify(self, text, thread_id):
+        """Return (label, tier name) from the first tier that does not abstain."""
+        for name, tier in self.tiers:
+            start = time.perf_counter()
+            label = tier(text, thread_id)
+            elapsed = time.perf_counter() - start
+
+            with self._lock:
+                self._calls[name] += 1
+                self._seconds[name] += elapsed
+                if label is not None:
+                    self._hits[name] += 1
+                    self.total += 1
+
+            if label is not None:
+                logger.debug(f"Intent '{label}' answered by tier '{name}' in {elapsed * 1000:.2f} ms")
+                return label, name
+
+        with self._lock:
+            self.total += 1
+        return None, None
+
+    def stats(self):
+        """Return per-tier call and hit counts, hit rates and average latency per call."""
+        with self._lock:
+            return {
+                name: {
+                    "calls": self._calls[name],
+                    "hits": self._hits[name],
+                    "hit_rate": self._hits[name] / self.total if self.total else 0.0,
+                    "seconds": self._seconds[name],
+                    "average_ms": self._seconds[name] * 1000 / self._calls[name] if self._calls[name] else 0.0,
+                }
+                for name, _ in self.tiers
+            }
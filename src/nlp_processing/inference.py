@@ -1,12 +1,19 @@
+import copy
+import logging
 import torch
 from transformers import AutoTokenizer, GPTJForCausalLM
-import re
 from src.error_handling.exceptions import NLPProcessingError
+from src.nlp_processing.thread_memory import ThreadMemory
+from src.nlp_processing.batching import InferenceScheduler
+from src.nlp_processing.utils import load_model_config, extract_urls, clean_text
+from src.nlp_processing.fast_path import RuleClassifier, TieredClassifier
+from src.nlp_processing.model_registry import ModelRegistry, select_device, select_dtype
+from src.nlp_processing.quantization import apply_quantization
+from src.utils.cache import TTLCache
 
-# Load GPT-J model and tokenizer (loaded once at the top)
-model_name = "EleutherAI/gpt-j-6B"
-tokenizer = AutoTokenizer.from_pretrained(model_name)
-model = GPTJForCausalLM.from_pretrained(model_name, torch_dtype=torch.float16).to("mps")
+logger = logging.getLogger(__name__)
+
+inference_config = load_model_config().get("inference", {})
 
 # Static few-shot examples (will be tokenized and used once)
 few_shot_prompt = """"
@@ -23,59 +30,271 @@ few_shot_prompt = """"
         "Intent: 'Build Failure'\n\n"
 """
 
-# Generate reusable context once at the start (bot initialization)
-def generate_context():
-    inputs = tokenizer(few_shot_prompt, return_tensors="pt", padding=True, truncation=True).to("mps")
-    return inputs.input_ids
+# Fixed label set SlackBot.handle_mention_events knows how to route
+INTENT_LABELS = ["Build Failure", "CR Status", "Build_Status"]
+
+# "score" ranks INTENT_LABELS with a single forward pass, "generate" decodes free-form text
+classification_mode = inference_config.get("classification_mode", "score")
+
+class IntentModel:
+    """GPT-J plus the per-process state derived from it (prefix KV cache, label token ids)."""
+
+    def __init__(self, tokenizer, model, context, prefix_cache, label_token_ids):
+        self.tokenizer = tokenizer
+        self.model = model
+        self.context = context
+        self.prefix_cache = prefix_cache
+        self.label_token_ids = label_token_ids
+
+    @property
+    def device(self):
+        return self.context.device
+
+def generate_prefix_cache(model, context_ids):
+    """Run the few-shot prefix through the model once and keep its KV state."""
+    with torch.no_grad():
+        outputs = model(context_ids, use_cache=True)
+    return outputs.past_key_values
+
+def load_intent_model(overrides=None):
+    """
+    Load GPT-J and precompute the few-shot prefix state.
+
+    :param overrides: Optional dict overriding keys of the "inference" config (used by benchmarks)
+    """
+    config = dict(inference_config, **(overrides or {}))
+    model_name = config.get("model_name", "EleutherAI/gpt-j-6B")
+    quantization = config.get("quantization")
+
+    if quantization:
+        # Dynamic int8 quantization runs on CPU and needs float32 weights to start from
+        device, dtype = torch.device("cpu"), torch.float32
+    else:
+        device = select_device(config.get("device", "auto"))
+        dtype = select_dtype(device, config.get("torch_dtype", "auto"))
+    logger.info(f"Loading {model_name} on {device} ({dtype}, quantization: {quantization or 'none'})")
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = GPTJForCausalLM.from_pretrained(model_name, torch_dtype=dtype, low_cpu_mem_usage=True).to(device)
+    model.eval()
+    model = apply_quantization(model, quantization)
 
-# Global variable to hold the context
-context = generate_context()  # Generated once
+    # Generate reusable context once and compute its attention state
+    context = tokenizer(few_shot_prompt, return_tensors="pt", truncation=True).input_ids.to(device)
+    prefix_cache = generate_prefix_cache(model, context)
 
-thread_memory = {}
+    # Token ids of each label written the way the few-shot examples write it (Intent: 'Label')
+    label_token_ids = [tokenizer(f" '{label}'").input_ids for label in INTENT_LABELS]
+
+    return IntentModel(tokenizer, model, context, prefix_cache, label_token_ids)
+
+# GPT-J is loaded on first use (or by warm_up()), not at import time
+model_registry = ModelRegistry(load_intent_model, name="GPT-J intent model")
+
+def warm_up(background=True):
+    """Start loading the intent model ahead of the first mention."""
+    if inference_config.get("backend", "gpt-j") == "gpt-j":
+        model_registry.warm_up(background=background)
+
+def is_model_ready():
+    return model_registry.is_ready()
+
+def get_intent_model():
+    return model_registry.get(timeout=inference_config.get("load_timeout"))
+
+# Recent turns per Slack thread, bounded by thread count, idle time and token budget
+thread_memory = ThreadMemory(
+    max_threads=1000,
+    ttl_seconds=6 * 60 * 60,
+    token_budget=256,
+    token_counter=lambda text: len(get_intent_model().tokenizer.encode(text)),
+)
+
+def expand_prefix_cache(intent_model, batch_size):
+    """Return a private copy of the prefix cache repeated along the batch dimension."""
+    past = copy.deepcopy(intent_model.prefix_cache)
+    if batch_size == 1:
+        return past
+    if hasattr(past, "batch_repeat_interleave"):
+        past.batch_repeat_interleave(batch_size)
+        return past
+    # Legacy tuple-of-tuples cache format
+    return tuple(tuple(t.repeat_interleave(batch_size, dim=0) for t in layer) for layer in past)
 
 def classify_intent(prompt, thread_id):
-    """Classify intent from the prompt using the pre-generated context."""
-    # Get thread-specific context (each thread stores its own inputs)
-    if thread_id not in thread_memory:
-        thread_memory[thread_id] = []
-
-    # Append new input to the thread's memory
-    thread_memory[thread_id].append(f'\nInput: "{prompt}"\nIntent:')
-
-    # Combine the static context with the thread-specific memory
-    full_prompt = tokenizer.decode(context[0], skip_special_tokens=True) + ''.join(thread_memory[thread_id])
-    inputs = tokenizer(full_prompt, return_tensors="pt", padding=True, truncation=True).to("mps")
-
-    # Generate response (predict intent)
-    outputs = model.generate(inputs.input_ids, max_length=50, num_return_sequences=1)
-    generated_text = tokenizer.decode(outputs[0], skip_special_tokens=True)
-    
+    """Classify intent from the prompt using the configured classification mode."""
+    if classification_mode == "score":
+        intent, _ = score_intents(prompt, thread_id)
+        return intent
+    return generate_intent(prompt, thread_id)
+
+def generate_intent(prompt, thread_id):
+    """Classify intent by free-form generation on top of the pre-computed prefix cache."""
+    intent_model = get_intent_model()
+    tokenizer, context = intent_model.tokenizer, intent_model.context
+
+    # Append new input to the thread's memory and get the recent window of turns back
+    history = thread_memory.append(thread_id, f'\nInput: "{prompt}"\nIntent:')
+
+    # Only the thread-specific suffix is tokenized; the prefix tokens are already cached
+    suffix_ids = tokenizer(history, return_tensors="pt").input_ids.to(context.device)
+    input_ids = torch.cat([context, suffix_ids], dim=-1)
+
+    # generate() skips the tokens already covered by past_key_values, so only the suffix
+    # is run through the model. The cache is copied because generate() extends it in place.
+    outputs = intent_model.model.generate(
+        input_ids,
+        past_key_values=expand_prefix_cache(intent_model, 1),
+        max_new_tokens=10,
+        num_return_sequences=1,
+    )
+    generated_text = tokenizer.decode(outputs[0, context.shape[-1]:], skip_special_tokens=True)
+
     # Extract intent
     intent = generated_text.split("Intent:")[-1].split('\n')[0].strip()
-    
+
     return intent
 
-def extract_urls(input_text):
-    """Extract URLs from the input text using regex."""
-    url_pattern = r"(https?://\S+)"
-    return re.findall(url_pattern, input_text)
+def score_intents(prompt, thread_id):
+    """
+    Score each label in INTENT_LABELS as the continuation of the prompt.
+
+    :return: Tuple of (most likely label, dict mapping each label to its probability)
+    """
+    return score_intents_batch([(prompt, thread_id)])[0]
+
+def score_intents_batch(requests, intent_model=None, memory=None):
+    """
+    Score INTENT_LABELS for several (prompt, thread_id) requests at once.
+
+    Every request/label combination becomes one row, and all rows are run through
+    the model together in a single forward pass on top of the prefix cache, so the
+    result is always one of the known labels.
+
+    :param requests: List of (prompt, thread_id) tuples
+    :param intent_model: Model to score with; defaults to the shared registry model
+    :param memory: ThreadMemory holding the threads' history; defaults to the shared one, whose
+        token counter loads the registry model, so callers passing their own model pass this too
+    :return: List of (most likely label, {label: probability}) tuples in request order
+    """
+    intent_model = intent_model or get_intent_model()
+    memory = memory or thread_memory
+    tokenizer, context, label_token_ids = intent_model.tokenizer, intent_model.context, intent_model.label_token_ids
+
+    suffixes = [
+        tokenizer(memory.append(thread_id, f'\nInput: "{prompt}"\nIntent:')).input_ids
+        for prompt, thread_id in requests
+    ]
+
+    # One row per candidate: thread suffix followed by the label, right-padded to equal length
+    rows = [suffix_ids + ids for suffix_ids in suffixes for ids in label_token_ids]
+    width = max(len(row) for row in rows)
+    pad_id = tokenizer.pad_token_id if tokenizer.pad_token_id is not None else tokenizer.eos_token_id
+    input_ids = torch.tensor([row + [pad_id] * (width - len(row)) for row in rows], device=context.device)
+    row_mask = torch.tensor([[1] * len(row) + [0] * (width - len(row)) for row in rows], device=context.device)
+    attention_mask = torch.cat([torch.ones(len(rows), context.shape[-1], dtype=row_mask.dtype, device=context.device), row_mask], dim=-1)
+
+    with torch.no_grad():
+        logits = intent_model.model(
+            input_ids=input_ids,
+            attention_mask=attention_mask,
+            past_key_values=expand_prefix_cache(intent_model, len(rows)),
+        ).logits
+    log_probs = torch.log_softmax(logits.float(), dim=-1)
+
+    results = []
+    for request_idx, suffix_ids in enumerate(suffixes):
+        # The logit at position i predicts the token at position i + 1, so the label tokens
+        # starting at len(suffix_ids) are scored by the logits one step earlier.
+        scores = []
+        offset = len(suffix_ids)
+        for label_idx, ids in enumerate(label_token_ids):
+            row_idx = request_idx * len(label_token_ids) + label_idx
+            positions = torch.arange(offset - 1, offset - 1 + len(ids), device=context.device)
+            targets = torch.tensor(ids, device=context.device)
+            token_log_probs = log_probs[row_idx, positions, targets]
+            scores.append(token_log_probs.mean())  # Length-normalized so longer labels are not penalized
+
+        probabilities = torch.softmax(torch.stack(scores), dim=0).tolist()
+        distribution = dict(zip(INTENT_LABELS, probabilities))
+        results.append((max(distribution, key=distribution.get), distribution))
+
+    return results
+
+def classify_intents_batch(requests):
+    """Classify a batch of (prompt, thread_id) requests collected by the scheduler."""
+    if classification_mode == "score":
+        return [intent for intent, _ in score_intents_batch(requests)]
+    return [generate_intent(prompt, thread_id) for prompt, thread_id in requests]
+
+# Concurrent mentions are queued here and run through the model together
+scheduler = InferenceScheduler(
+    classify_intents_batch,
+    max_batch_size=inference_config.get("max_batch_size", 8),
+    batch_window_ms=inference_config.get("batch_window_ms", 20),
+)
 
 def detect_intent(prompt, thread_id):
     """Detect intent by classifying it using the few-shot method."""
     try:
-        intent = classify_intent(prompt, thread_id)
+        # Goes through the micro-batching scheduler so concurrent mentions share a forward pass
+        future = scheduler.submit((prompt, thread_id))
+        timeout = inference_config.get("request_timeout", 30)
+        if not model_registry.is_ready():
+            # The first requests may arrive while the model is still warming up
+            timeout += inference_config.get("load_timeout", 600)
+        intent = future.result(timeout=timeout)
         return intent if intent else "unknown_intent"
     except Exception as e:
         raise NLPProcessingError(f"Error detecting intent: {str(e)}")
 
+def build_intent_classifier(backend):
+    """Rules first, then either GPT-J ("gpt-j") or the distilled classifier ("distilled")."""
+    if backend == "distilled":
+        from src.nlp_processing.distill import DistilledIntentClassifier, DEFAULT_MODEL_PATH
+        model_path = inference_config.get("distilled_model_path", DEFAULT_MODEL_PATH)
+        model_tier = ("distilled", DistilledIntentClassifier.load(model_path).classify)
+    else:
+        model_tier = ("llm", detect_intent)
+    return TieredClassifier([("rules", RuleClassifier().classify), model_tier])
+
+# Cheap keyword/URL rules answer unambiguous mentions; the model only runs when they abstain
+intent_classifier = build_intent_classifier(inference_config.get("backend", "gpt-j"))
+
+# Results for recently seen mentions, keyed on normalized text plus the set of URLs
+result_cache_config = inference_config.get("result_cache", {})
+intent_cache = TTLCache(
+    max_entries=result_cache_config.get("max_entries", 1024),
+    ttl_seconds=result_cache_config.get("ttl_seconds", 600),
+)
+
+def intent_cache_key(input_text, urls, thread_id=None):
+    """
+    Mentions that differ only in casing, punctuation, spacing or URL order share a key.
+
+    A thread_id is only given for answers that depended on the thread's earlier
+    turns, so they are not reused for the same words in another thread.
+    """
+    return clean_text(input_text).lower(), frozenset(url.rstrip('/>.,') for url in urls), thread_id
+
 def process_with_gpt_j(input_text, thread_id):
     """Main function to process input text, extract URLs, and detect intent."""
     try:
         # Extract URLs from input
         urls = extract_urls(input_text)
 
-        # Detect intent from generated text
-        intent = detect_intent(input_text, thread_id)
+        intent = intent_cache.get(intent_cache_key(input_text, urls, thread_id))
+        if intent is None:
+            intent = intent_cache.get(intent_cache_key(input_text, urls))
+        if intent is None:
+            had_history = thread_id in thread_memory
+            # Detect intent, falling back to the model only when the rules abstain
+            intent, tier = intent_classifier.classify(input_text, thread_id)
+            # A failed classification is not remembered, so a repeat gets another chance
+            if intent and intent != "unknown_intent":
+                # Only the LLM is prompted with the thread's history
+                scope = thread_id if tier == "llm" and had_history else None
+                intent_cache.set(intent_cache_key(input_text, urls, scope), intent)
 
         return {"intent": intent, "urls": urls}
     except Exception as e:
@@ -0,0 +1,116 @@
+import threading
+import logging
+import time
+import torch
+from src.error_handling.exceptions import NLPProcessingError
+
+logger = logging.getLogger(__name__)
+
+def select_device(preference="auto"):
+    """Pick the torch device to run on: cuda, then mps, then cpu unless one is configured explicitly."""
+    if preference and preference != "auto":
+        return torch.device(preference)
+    if torch.cuda.is_available():
+        return torch.device("cuda")
+    if getattr(torch.backends, "mps", None) is not None and torch.backends.mps.is_available():
+        return torch.device("mps")
+    return torch.device("cpu")
+
+def select_dtype(device, preference="auto"):
+    """Half precision on accelerators, float32 on CPU where fp16 kernels are slow or missing."""
+    if preference and preference != "auto":
+        return getattr(torch, preference)
+    return torch.float32 if device.type == "cpu" else torch.float16
+
+class ModelRegistry:
+    """
+    Loads a model lazily, once, and shares it between threads.
+
+    The loader runs on first use, or ahead of time in a background thread via
+    warm_up(), so the process can start serving (e.g. open the Slack socket)
+    while the model is still loading. is_ready() tells callers whether the
+    model is available without blocking. A failed load is reported to callers
+    and retried on a later call once retry_backoff seconds have passed (the
+    backoff doubles with each consecutive failure, up to max_retry_backoff).
+    """
+
+    def __init__(self, loader, name="model", retry_backoff=30, max_retry_backoff=600):
+        """
+        :param loader: Zero-argument callable that loads and returns the model object
+        :param name: Name used in log messages
+        :param retry_backoff: Seconds after a failed load before the next call tries again
+        :param max_retry_backoff: Upper bound for the doubling backoff
+        """
+        self.loader = loader
+        self.name = name
+        self.retry_backoff = retry_backoff
+        self.max_retry_backoff = max_retry_backoff
+        self._value = None
+        self._error = None
+        self._failures = 0
+        self._retry_at = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._warm_up_thread = None
+
+    def get(self, timeout=None):
+        """Return the loaded model, loading it now if nobody has started yet (or a failed load may be retried)."""
+        if self._ready.is_set() and not self._retry_due():
+            return self._result()
+
+        if self._warm_up_thread is not None and self._warm_up_thread.is_alive():
+            # A background load is in progress; wait for it instead of loading twice
+            if not self._ready.wait(timeout):
+                raise NLPProcessingError(f"Timed out waiting for {self.name} to load")
+            return self._result()
+
+        self._load()
+        return self._result()
+
+    def warm_up(self, background=True):
+        """Start loading the model, in a daemon thread unless background is False."""
+        if self._ready.is_set() and not self._retry_due():
+            return
+        if self._warm_up_thread is not None and self._warm_up_thread.is_alive():
+            return
+        if not background:
+            self._load()
+            return
+        self._warm_up_thread = threading.Thread(target=self._load, name=f"{self.name}-warm-up", daemon=True)
+        self._warm_up_thread.start()
+
+    def is_ready(self):
+        return self._ready.is_set() and self._error is None
+
+    def wait_until_ready(self, timeout=None):
+        return self._ready.wait(timeout) and self._error is None
+
+    def _retry_due(self):
+        return self._error is not None and time.monotonic() >= self._retry_at
+
+    def _load(self):
+        with self._lock:
+            if self._ready.is_set() and not self._retry_due():
+                return
+            # Waiters block again while the retry runs instead of seeing the old error
+            self._ready.clear()
+            self._error = None
+            start = time.monotonic()
+            logger.info(f"Loading {self.name}...")
+            try:
+                self._value = self.loader()
+                self._failures = 0
+                logger.info(f"{self.name} loaded in {time.monotonic() - start:.1f}s")
+            except Exception as e:
+                self._failures += 1
+                backoff = min(self.max_retry_backoff, self.retry_backoff * 2 ** (self._failures - 1))
+                logger.error(f"Error loading {self.name}: {e} (retrying on the next call after {backoff}s)")
+                self._error = e
+                self._retry_at = time.monotonic() + backoff
+            finally:
+                self._ready.set()
+
+    def _result(self):
+        if self._error is not None:
+            raise NLPProcessingError(f"{self.name} failed to load: {self._error}")
+        return self._value
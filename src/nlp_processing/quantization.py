@@ -0,0 +1,40 @@
+import logging
+import platform
+import torch
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_QUANTIZATION = ("int8",)
+
+def quantize_dynamic_int8(model):
+    """
+    Apply int8 dynamic quantization to every nn.Linear in the model.
+
+    Weights are stored as int8 and activations are quantized on the fly, which cuts
+    the memory of the linear layers by ~4x versus fp32 and speeds up CPU matmuls.
+    The model must be a float32 model on the CPU.
+    """
+    if platform.machine().lower() in ("arm64", "aarch64") and "qnnpack" in torch.backends.quantized.supported_engines:
+        torch.backends.quantized.engine = "qnnpack"
+    quantized = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    logger.info(f"Applied int8 dynamic quantization using the {torch.backends.quantized.engine} engine")
+    return quantized
+
+def apply_quantization(model, mode):
+    """Quantize the model according to the configured mode (None leaves it untouched)."""
+    if not mode:
+        return model
+    if mode == "int8":
+        return quantize_dynamic_int8(model)
+    raise ValueError(f"Unsupported quantization mode: {mode}. Expected one of {SUPPORTED_QUANTIZATION}")
+
+def model_size_bytes(model):
+    """Bytes held by the model's weights, including the packed weights of quantized layers."""
+    total = 0
+    for module in model.modules():
+        tensors = list(module.parameters(recurse=False)) + list(module.buffers(recurse=False))
+        if isinstance(module, torch.ao.nn.quantized.dynamic.Linear):
+            # Packed int8 weights are not registered as parameters
+            tensors += [t for t in (module.weight(), module.bias()) if t is not None]
+        total += sum(t.numel() * t.element_size() for t in tensors)
+    return total
@@ -0,0 +1,112 @@
+import threading
+import time
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+class ThreadMemory:
+    """
+    Bounded store of recent conversation turns keyed by Slack thread_ts.
+
+    Threads are evicted least-recently-used once max_threads is reached, and
+    dropped entirely after ttl_seconds without activity. Within a thread only the
+    most recent turns that fit into token_budget are kept.
+    """
+
+    def __init__(self, max_threads=1000, ttl_seconds=6 * 60 * 60, token_budget=256, token_counter=None):
+        """
+        :param max_threads: Maximum number of threads kept in memory
+        :param ttl_seconds: Seconds of inactivity after which a thread is forgotten
+        :param token_budget: Maximum number of tokens of history kept per thread
+        :param token_counter: Callable returning the token count of a string (defaults to whitespace split)
+        """
+        self.max_threads = max_threads
+        self.ttl_seconds = ttl_seconds
+        self.token_budget = token_budget
+        self.token_counter = token_counter or (lambda text: len(text.split()))
+
+        self._threads = OrderedDict()  # thread_id -> (last_access, [(turn, token_count), ...])
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.lru_evictions = 0
+        self.ttl_evictions = 0
+        self.trimmed_turns = 0
+
+    def append(self, thread_id, turn):
+        """Record a new turn for the thread and return the thread's history as a single string."""
+        now = time.monotonic()
+        tokens = self.token_counter(turn)
+
+        with self._lock:
+            self._expire(now)
+
+            entry = self._threads.pop(thread_id, None)
+            if entry is None:
+                self.misses += 1
+                turns = []
+            else:
+                self.hits += 1
+                turns = entry[1]
+
+            turns.append((turn, tokens))
+            self._trim(turns)
+            self._threads[thread_id] = (now, turns)
+
+            while len(self._threads) > self.max_threads:
+                evicted_id, _ = self._threads.popitem(last=False)
+                self.lru_evictions += 1
+                logger.debug(f"Evicted thread {evicted_id} from thread memory (LRU)")
+
+            return ''.join(text for text, _ in turns)
+
+    def get(self, thread_id):
+        """Return the thread's history as a single string, or an empty string if unknown."""
+        with self._lock:
+            self._expire(time.monotonic())
+            entry = self._threads.get(thread_id)
+            return ''.join(text for text, _ in entry[1]) if entry else ''
+
+    def clear(self):
+        with self._lock:
+            self._threads.clear()
+
+    def stats(self):
+        """Return hit, eviction and size counters for monitoring."""
+        with self._lock:
+            return {
+                "threads": len(self._threads),
+                "turns": sum(len(turns) for _, turns in self._threads.values()),
+                "tokens": sum(tokens for _, turns in self._threads.values() for _, tokens in turns),
+                "hits": self.hits,
+                "misses": self.misses,
+                "lru_evictions": self.lru_evictions,
+                "ttl_evictions": self.ttl_evictions,
+                "trimmed_turns": self.trimmed_turns,
+            }
+
+    def __len__(self):
+        return len(self._threads)
+
+    def __contains__(self, thread_id):
+        return thread_id in self._threads
+
+    def _trim(self, turns):
+        # Drop the oldest turns until the window fits, but always keep the newest one
+        total = sum(tokens for _, tokens in turns)
+        while len(turns) > 1 and total > self.token_budget:
+            _, tokens = turns.pop(0)
+            total -= tokens
+            self.trimmed_turns += 1
+
+    def _expire(self, now):
+        # Entries are kept in access order, so expired threads are always at the front
+        while self._threads:
+            thread_id, (last_access, _) = next(iter(self._threads.items()))
+            if now - last_access < self.ttl_seconds:
+                break
+            del self._threads[thread_id]
+            self.ttl_evictions += 1
+            logger.debug(f"Expired thread {thread_id} from thread memory (TTL)")
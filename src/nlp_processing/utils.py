@@ -1,10 +1,32 @@
 import re
+import os
+import json
 import logging
 from transformers import GPT2TokenizerFast
 
 # Initialize logger
 logger = logging.getLogger(__name__)
 
+DEFAULT_MODEL_CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'config', 'model_config.json')
+
+def load_model_config(file_path=None):
+    """Loads the model configuration JSON (MODEL_CONFIG_PATH overrides the default location)."""
+    file_path = file_path or os.getenv("MODEL_CONFIG_PATH", DEFAULT_MODEL_CONFIG_PATH)
+    try:
+        with open(file_path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        logger.warning(f"Model config not found at {file_path}, using defaults")
+        return {}
+    except Exception as e:
+        logger.error(f"Error loading model config: {e}")
+        raise
+
+def extract_urls(input_text):
+    """Extract URLs from the input text using regex."""
+    url_pattern = r"(https?://\S+)"
+    return re.findall(url_pattern, input_text)
+
 def clean_text(text):
     """Cleans input text by removing unwanted characters, spaces, and URLs."""
     try:
@@ -0,0 +1,257 @@
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from src.api_integration.clients import get_async_gerrit_api, get_jenkins_api, get_jira_api
+from src.api_integration.jenkins_api import build_job
+from src.log_analysis.triage import scan_build, cache_scan, get_cached_scan
+from src.utils.url_router import parse_url, GerritChange, JenkinsBuild, BlueOceanRun
+
+logger = logging.getLogger(__name__)
+
+# Change states after which nothing more will happen to a change
+CLOSED_CHANGE_STATES = ("MERGED", "ABANDONED")
+
+def top_error_line(blocks):
+    """Error line of the most severe block (the one the handlers report), or None."""
+    return max(blocks, key=lambda block: block.severity).error_line if blocks else None
+
+class Watch:
+    """A change or build that was mentioned recently, with its polling schedule."""
+
+    def __init__(self, key, target, channel, thread_ts, expires_at, team_id=None):
+        self.key = key
+        self.target = target
+        self.channel = channel
+        self.thread_ts = thread_ts
+        self.team_id = team_id  # Workspace of the mention, so notifications share its rate limit
+        self.expires_at = expires_at
+        self.state = None  # Last observed state, None until the first poll
+        self.top_error = None
+        self.interval = None
+        self.next_poll = 0.0
+        self.polling = False
+        self.done = False
+
+    @property
+    def is_build(self):
+        return isinstance(self.target, (JenkinsBuild, BlueOceanRun))
+
+class BuildWatcher:
+    """
+    Polls recently mentioned Gerrit changes and Jenkins builds in the background.
+
+    Changes are re-fetched so their snapshot stays warm in the Gerrit client's
+    cache, and the builds they report are watched too. A build is polled until
+    it finishes; its log is then scanned once and cached (and its first error
+    looked up in Jira), so follow-up questions are answered without another
+    download. Polling is adaptive: a running build is next polled around its
+    estimated end, and anything that did not change is polled less and less
+    often, up to max_interval. Watches end when the build finishes, the change
+    is merged or abandoned, or watch_seconds pass without another mention.
+
+    When notify is given it is called as notify(channel, thread_ts, text, team_id=...)
+    whenever a watched change or build changes state.
+    """
+
+    def __init__(
+        self, min_interval=15, max_interval=300, backoff=1.5, watch_seconds=2 * 3600, max_watches=200, workers=4,
+        notify=None, gerrit=None, jenkins_for=get_jenkins_api, scan=scan_build, jira=None, clock=time.monotonic,
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.watch_seconds = watch_seconds
+        self.max_watches = max_watches
+        self.workers = workers
+        self.notify = notify
+        self.gerrit = gerrit
+        self.jenkins_for = jenkins_for
+        self.scan = scan
+        self.jira = jira
+        self._clock = clock
+        self._watches = {}
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+        self.polls = 0
+        self.prefetched = 0
+
+    def watch(self, target, channel=None, thread_ts=None, team_id=None):
+        """
+        Start (or extend) watching a parsed URL target; other target types are ignored.
+
+        :return: True if the target is being watched
+        """
+        if isinstance(target, (JenkinsBuild, BlueOceanRun)):
+            key = target.console_url
+        elif isinstance(target, GerritChange):
+            key = target.rest_url  # The same change pasted as different links is watched once
+        else:
+            return False
+
+        with self._condition:
+            now = self._clock()
+            watch = self._watches.get(key)
+            if watch is not None:
+                # Mentioned again: keep it longer and report to the latest thread
+                watch.expires_at = now + self.watch_seconds
+                watch.channel, watch.thread_ts = channel or watch.channel, thread_ts or watch.thread_ts
+                watch.team_id = team_id or watch.team_id
+                return True
+            if len(self._watches) >= self.max_watches:
+                oldest = min(self._watches.values(), key=lambda item: item.expires_at)
+                del self._watches[oldest.key]
+            watch = Watch(key, target, channel, thread_ts, now + self.watch_seconds, team_id)
+            if watch.is_build:
+                # Whoever mentioned the build is scanning it right now; a finished build's scan is then
+                # cached by the time of the first poll instead of being downloaded twice
+                watch.next_poll = now + self.min_interval
+            self._watches[key] = watch
+            self._condition.notify()
+        return True
+
+    def watched(self):
+        with self._condition:
+            return list(self._watches)
+
+    def _take_due(self):
+        """Remove finished or expired watches and claim the ones due for a poll."""
+        now = self._clock()
+        for key in [key for key, watch in self._watches.items() if watch.done or watch.expires_at <= now]:
+            del self._watches[key]
+        due = [watch for watch in self._watches.values() if not watch.polling and watch.next_poll <= now]
+        for watch in due:
+            watch.polling = True
+        return due
+
+    def run_due(self):
+        """Poll everything that is due, in the calling thread. Returns the number of polls."""
+        with self._condition:
+            due = self._take_due()
+        for watch in due:
+            self._poll(watch)
+        return len(due)
+
+    def _poll(self, watch):
+        try:
+            if watch.is_build:
+                state, estimate = self.poll_build(watch)
+            else:
+                state, estimate = self.poll_change(watch), None
+            changed = watch.state is not None and state != watch.state
+            if changed and self.notify is not None and watch.channel:
+                self.notify(watch.channel, watch.thread_ts, self.describe(watch, state), team_id=watch.team_id)
+            first = watch.state is None
+            watch.state = state
+            watch.interval = self._next_interval(watch, changed or first, estimate)
+        except Exception as e:
+            logger.warning(f"Polling {watch.key} failed: {e}")
+            watch.interval = self._next_interval(watch, False, None)
+        with self._condition:
+            self.polls += 1
+            watch.polling = False
+            watch.next_poll = self._clock() + watch.interval
+            self._condition.notify()
+
+    def _next_interval(self, watch, changed, estimate):
+        if estimate is not None and estimate > 0:
+            interval = estimate
+        elif changed or watch.interval is None:
+            interval = self.min_interval
+        else:
+            interval = watch.interval * self.backoff
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def poll_build(self, watch):
+        """Returns (state, seconds until the build is expected to end or None)."""
+        target = watch.target
+        job_name, build_number = build_job(target)
+        # Through the client's caching session, so the handlers reuse what the watcher fetched
+        info = self.jenkins_for(target.url).get_cached_build_info(job_name, build_number)
+        if info is None:
+            raise ValueError(f"No build info for {job_name} #{build_number}")
+        if info.get("building"):
+            estimate = None
+            if info.get("timestamp") and info.get("estimatedDuration", -1) > 0:
+                estimate = (info["timestamp"] + info["estimatedDuration"]) / 1000 - time.time()
+            return "BUILDING", estimate
+
+        state = info.get("result") or "UNKNOWN"
+        watch.done = True
+        if state != "SUCCESS":
+            blocks = get_cached_scan(target.url)
+            if blocks is None:
+                blocks = self.prefetch(target.url)
+            watch.top_error = top_error_line(blocks)
+        return state, None
+
+    def prefetch(self, build_url):
+        """Scan a finished build's log into the scan cache and warm the Jira lookup for its top error. Returns the blocks."""
+        blocks = self.scan(build_url)
+        cache_scan(build_url, blocks)
+        with self._condition:
+            self.prefetched += 1
+        if blocks:
+            jira = self.jira if self.jira is not None else get_jira_api()
+            jira.find_jira_tickets(top_error_line(blocks))
+        logger.info(f"Prefetched {len(blocks)} error blocks of {build_url}")
+        return blocks
+
+    def poll_change(self, watch):
+        gerrit = self.gerrit if self.gerrit is not None else get_async_gerrit_api()
+        snapshot = gerrit.get_change_snapshot(watch.target.rest_url, refresh=True)
+        # Keep the snapshot warm until the next poll instead of the client's short default TTL
+        gerrit.snapshots.set(watch.target.rest_url, snapshot, ttl_seconds=self.max_interval)
+
+        build_urls = snapshot.build_failure_urls or ([snapshot.build_url] if snapshot.build_url else [])
+        for build_url in build_urls:
+            self.watch(parse_url(build_url), watch.channel, watch.thread_ts, watch.team_id)
+
+        status = snapshot.status
+        if status["merge_status"] in CLOSED_CHANGE_STATES:
+            watch.done = True
+        return (status["merge_status"], snapshot.current_revision, status["verification_score"])
+
+    def describe(self, watch, state):
+        if watch.is_build:
+            if watch.top_error:
+                return f"Build {watch.target.url} finished: {state}\nError: {watch.top_error}"
+            return f"Build {watch.target.url} finished: {state}"
+        merge_status, revision, verification_score = state
+        old_status, old_revision, old_score = watch.state
+        if merge_status != old_status:
+            return f"Change {watch.target.url} is now {merge_status}"
+        if revision != old_revision:
+            return f"Change {watch.target.url} has a new patch set"
+        return f"Change {watch.target.url} verification score changed: {old_score} -> {verification_score}"
+
+    def start(self):
+        """Run the scheduler on a daemon thread, polling due watches on a small thread pool."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="build-watcher", daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def _run(self):
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="build-watcher-poll") as executor:
+            while True:
+                with self._condition:
+                    if self._stopped:
+                        return
+                    due = self._take_due()
+                    if not due:
+                        pending = [watch.next_poll for watch in self._watches.values() if not watch.polling]
+                        timeout = max(0.0, min(pending) - self._clock()) if pending else None
+                        self._condition.wait(timeout)
+                        continue
+                for watch in due:
+                    executor.submit(self._poll, watch)
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,33 @@
+import os
+import re
+import logging
+import yaml
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'config', 'config.yml')
+
+ENV_REFERENCE = re.compile(r'\$\{(\w+)\}')
+
+def expand_env(value):
+    """Substitute ${VAR} references in config values; a value naming an unset variable becomes None."""
+    if isinstance(value, dict):
+        return {key: expand_env(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [expand_env(item) for item in value]
+    if isinstance(value, str):
+        names = ENV_REFERENCE.findall(value)
+        if names and any(name not in os.environ for name in names):
+            return None
+        return ENV_REFERENCE.sub(lambda match: os.environ[match.group(1)], value)
+    return value
+
+def load_config(file_path=None):
+    """Loads config.yml with environment references expanded (CONFIG_PATH overrides the default location)."""
+    file_path = file_path or os.getenv("CONFIG_PATH", DEFAULT_CONFIG_PATH)
+    try:
+        with open(file_path) as f:
+            return expand_env(yaml.safe_load(f) or {})
+    except FileNotFoundError:
+        logger.warning(f"Config not found at {file_path}, using defaults")
+        return {}
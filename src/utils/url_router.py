@@ -0,0 +1,177 @@
+import os
+import re
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Compiled once at import; matched against the URL path (and Gerrit's old #/c/ fragment)
+BLUE_OCEAN_PATH = re.compile(r'^/blue/organizations/jenkins/(?P<pipeline>[^/]+)/detail/(?P<branch>[^/]+)/(?P<run>\d+)(?:/.*)?$')
+ARTIFACT_PATH = re.compile(r'^(?P<job_path>(?:/job/[^/]+)+)/(?P<build>\d+)/artifact/(?P<relative_path>.+)$')
+CLASSIC_BUILD_PATH = re.compile(r'^(?P<job_path>(?:/job/[^/]+)+)/(?P<build>\d+)(?:/.*)?$')
+GERRIT_CHANGE_PATH = re.compile(r'^/c/(?:(?P<project>.+?)/\+/)?(?P<change>\d+)(?:/.*)?$')
+GERRIT_REST_CHANGE_PATH = re.compile(r'^(?:/a)?/changes/(?P<change>[^/]+)/?.*$')
+GERRIT_NUMBER_PATH = re.compile(r'^/(?P<change>\d+)/?$')
+
+class UrlTarget:
+    """A URL from a message, parsed once into the parts its handler needs."""
+
+    kind = None
+
+    def __init__(self, url, parts):
+        self.url = url
+        self.server = f"{parts.scheme}://{parts.netloc}"
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.url == other.url
+
+    def __hash__(self):
+        return hash((type(self), self.url))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.url!r})"
+
+class GerritChange(UrlTarget):
+    kind = "gerrit_change"
+
+    def __init__(self, url, parts, change, project=None):
+        super().__init__(url, parts)
+        self.change = change  # Change number, or a change id for REST URLs
+        self.project = project
+
+    @property
+    def rest_url(self):
+        """Authenticated REST URL of the change, whichever UI or REST form was pasted."""
+        return f"{self.server}/a/changes/{self.change}"
+
+class JenkinsBuild(UrlTarget):
+    """A classic Jenkins build (/job/<name>[/job/<name>...]/<number>/...)."""
+
+    kind = "jenkins_build"
+
+    def __init__(self, url, parts, job_path, build_number):
+        super().__init__(url, parts)
+        self.job_path = job_path
+        self.job_name = "/".join(job_path.split("/job/")[1:])
+        self.build_number = build_number
+
+    @property
+    def build_url(self):
+        return f"{self.server}{self.job_path}/{self.build_number}/"
+
+    @property
+    def console_url(self):
+        return f"{self.server}{self.job_path}/{self.build_number}/consoleText"
+
+class BlueOceanRun(UrlTarget):
+    kind = "blue_ocean_run"
+
+    def __init__(self, url, parts, pipeline, branch, run_number):
+        super().__init__(url, parts)
+        self.pipeline = pipeline
+        self.branch = branch
+        self.run_number = run_number
+
+    @property
+    def console_url(self):
+        return (
+            f"{self.server}/blue/rest/organizations/jenkins/pipelines/{self.pipeline}"
+            f"/branches/{self.branch}/runs/{self.run_number}/log/?start=0"
+        )
+
+class JenkinsArtifact(JenkinsBuild):
+    kind = "jenkins_artifact"
+
+    def __init__(self, url, parts, job_path, build_number, relative_path):
+        super().__init__(url, parts, job_path, build_number)
+        self.relative_path = relative_path
+
+def clean_url(url):
+    """Strip Slack's <url|label> wrapping and trailing punctuation from a URL taken from a message."""
+    url = url.strip().lstrip("<")
+    url = url.split("|", 1)[0].split(">", 1)[0]
+    return url.rstrip(".,;:)")
+
+def is_gerrit_host(netloc):
+    gerrit_base = os.getenv("GERRIT_BASE_URL")
+    return "gerrit" in netloc or (gerrit_base is not None and urlsplit(gerrit_base).netloc == netloc)
+
+def parse_url(url):
+    """
+    Parse a URL into a typed target (GerritChange, BlueOceanRun, JenkinsArtifact or JenkinsBuild).
+
+    :return: The target, or None if the URL is not one the bot handles
+    """
+    url = clean_url(url)
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return None
+    path = parts.path
+
+    match = BLUE_OCEAN_PATH.match(path)
+    if match:
+        return BlueOceanRun(url, parts, match["pipeline"], match["branch"], int(match["run"]))
+    match = ARTIFACT_PATH.match(path)
+    if match:
+        return JenkinsArtifact(url, parts, match["job_path"], int(match["build"]), match["relative_path"])
+    match = CLASSIC_BUILD_PATH.match(path)
+    if match:
+        return JenkinsBuild(url, parts, match["job_path"], int(match["build"]))
+
+    if parts.fragment.startswith("/c/"):
+        path = parts.fragment  # Old Gerrit UI: https://gerrit/#/c/12345/
+    match = GERRIT_CHANGE_PATH.match(path)
+    if match:
+        return GerritChange(url, parts, match["change"], project=match["project"])
+    if is_gerrit_host(parts.netloc):
+        match = GERRIT_REST_CHANGE_PATH.match(path) or GERRIT_NUMBER_PATH.match(path)
+        if match:
+            return GerritChange(url, parts, match["change"])
+    return None
+
+class UrlRouter:
+    """
+    Dispatches every URL in a message to the handler registered for its target type.
+
+    URLs are parsed once with the precompiled patterns above; the handlers for
+    the different targets of one message then run concurrently.
+    """
+
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self._handlers = {}
+
+    def register(self, target_type, handler):
+        """Register handler(target, *args) for a target type (subclasses match their base's handler too)."""
+        self._handlers[target_type] = handler
+
+    def handler_for(self, target):
+        for target_type in type(target).__mro__:
+            if target_type in self._handlers:
+                return self._handlers[target_type]
+        return None
+
+    def parse_all(self, urls):
+        """Parse URLs into routable targets, dropping duplicates and unsupported URLs."""
+        targets = []
+        for url in urls:
+            target = parse_url(url)
+            if target is not None and self.handler_for(target) is not None and target not in targets:
+                targets.append(target)
+        return targets
+
+    def dispatch(self, targets, *args):
+        """Run each target's handler with (target, *args), concurrently when there are several."""
+        if len(targets) == 1:
+            self._run(targets[0], *args)
+            return
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(targets)), thread_name_prefix="url-router") as executor:
+            for future in [executor.submit(self._run, target, *args) for target in targets]:
+                future.result()
+
+    def _run(self, target, *args):
+        try:
+            self.handler_for(target)(target, *args)
+        except Exception as e:
+            logger.error(f"Error handling {target}: {e}", exc_info=True)
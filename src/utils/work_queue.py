@@ -0,0 +1,120 @@
+import threading
+import logging
+from collections import deque, OrderedDict
+from src.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+ACCEPTED = "accepted"
+DUPLICATE = "duplicate"
+REJECTED = "rejected"
+
+class FairWorkQueue:
+    """
+    Bounded work queue that runs tasks on a fixed pool of worker threads.
+
+    Tasks are queued per key (the Slack channel) and workers take them round-robin
+    across keys, so one busy channel cannot starve the others. Submissions beyond
+    max_pending (or max_pending_per_key for one key) are rejected rather than
+    queued, giving callers backpressure. Tasks carrying an id already seen within
+    dedup_ttl_seconds are dropped, which absorbs Slack's retried deliveries.
+    """
+
+    def __init__(self, workers=8, max_pending=200, max_pending_per_key=20, dedup_ttl_seconds=600, name="event-worker"):
+        self.max_pending = max_pending
+        self.max_pending_per_key = max_pending_per_key
+        self._queues = OrderedDict()  # key -> deque of tasks; insertion order is the round-robin order
+        self._pending = 0
+        self._seen = TTLCache(max_entries=10000, ttl_seconds=dedup_ttl_seconds)
+        self._condition = threading.Condition()
+        self._stopped = False
+
+        self.completed = 0
+        self.failed = 0
+        self.duplicates = 0
+        self.rejected = 0
+
+        self._workers = [threading.Thread(target=self._run, name=f"{name}-{i}", daemon=True) for i in range(workers)]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, task, key=None, task_id=None):
+        """
+        Queue a callable without waiting for it to run.
+
+        :param task: Callable taking no arguments
+        :param key: Fairness key (e.g. channel id); tasks with the same key start in order of submission
+        :param task_id: Optional id used to drop repeated submissions (e.g. Slack event_id)
+        :return: ACCEPTED, DUPLICATE or REJECTED
+        """
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("Work queue has been stopped")
+            if task_id is not None and self._seen.get(task_id) is not None:
+                self.duplicates += 1
+                return DUPLICATE
+
+            tasks = self._queues.get(key)
+            if self._pending >= self.max_pending or (tasks is not None and len(tasks) >= self.max_pending_per_key):
+                self.rejected += 1
+                logger.warning(f"Work queue full, rejecting task for {key} ({self._pending} pending)")
+                return REJECTED
+
+            # Only accepted ids are remembered, so a retry of a rejected event gets another chance
+            if task_id is not None:
+                self._seen.set(task_id, True)
+            if tasks is None:
+                tasks = self._queues[key] = deque()
+            tasks.append(task)
+            self._pending += 1
+            self._condition.notify()
+            return ACCEPTED
+
+    def _next_task(self):
+        with self._condition:
+            while not self._pending and not self._stopped:
+                self._condition.wait()
+            if self._stopped and not self._pending:
+                return None
+            # Take from the key at the front, then move it to the back of the rotation
+            key, tasks = next(iter(self._queues.items()))
+            task = tasks.popleft()
+            if tasks:
+                self._queues.move_to_end(key)
+            else:
+                del self._queues[key]
+            self._pending -= 1
+            return task
+
+    def _run(self):
+        while True:
+            task = self._next_task()
+            if task is None:
+                return
+            try:
+                task()
+                outcome = "completed"
+            except Exception as e:
+                logger.error(f"Queued task failed: {e}", exc_info=True)
+                outcome = "failed"
+            with self._condition:
+                setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def stop(self):
+        """Finish the queued tasks, then stop the workers."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        for worker in self._workers:
+            worker.join()
+
+    def stats(self):
+        with self._condition:
+            return {
+                "pending": self._pending,
+                "keys": len(self._queues),
+                "completed": self.completed,
+                "failed": self.failed,
+                "duplicates": self.duplicates,
+                "rejected": self.rejected,
+            }
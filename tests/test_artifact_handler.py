@@ -0,0 +1,47 @@
+import time
+import unittest
+from unittest.mock import MagicMock
+from src.handlers.artifact_handler import ArtifactHandler, artifact_blocks, chunk_blocks, MAX_SECTION_TEXT
+
+class TestArtifactHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.slack_client = MagicMock()
+        self.session = MagicMock()
+        self.handler = ArtifactHandler(self.slack_client, session=self.session, max_workers=16)
+
+    def test_validation_is_concurrent_and_keeps_order(self):
+        def head(url):
+            time.sleep(0.1)
+            return MagicMock(status_code=404 if url.endswith("missing.log") else 200)
+
+        self.session.head.side_effect = head
+        urls = [f"https://jenkins.example.com/job/j/1/artifact/out/{i}.tar.gz" for i in range(16)]
+        urls.insert(3, "https://jenkins.example.com/job/j/1/artifact/missing.log")
+
+        start = time.monotonic()
+        valid = self.handler.validate_artifacts(urls)
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(valid, [url for url in urls if not url.endswith("missing.log")])
+
+    def test_posts_one_block_kit_message(self):
+        self.session.head.return_value = MagicMock(status_code=200)
+        urls = [f"https://jenkins.example.com/job/j/1/artifact/logs/test_{i}.log" for i in range(60)]
+        self.handler.post_artifact_to_slack("C123", urls)
+
+        self.slack_client.chat_postMessage.assert_called_once()
+        blocks = self.slack_client.chat_postMessage.call_args.kwargs["blocks"]
+        self.assertIn("60 artifact(s)", blocks[0]["text"]["text"])
+        self.assertIn("<https://jenkins.example.com/job/j/1/artifact/logs/test_0.log|test_0.log>", blocks[1]["text"]["text"])
+
+    def test_large_lists_are_chunked_within_limits(self):
+        urls = [f"https://jenkins.example.com/job/j/1/artifact/{'x' * 80}/{i}.bin" for i in range(3000)]
+        blocks = artifact_blocks(urls)
+        self.assertTrue(all(len(block["text"]["text"]) <= MAX_SECTION_TEXT for block in blocks))
+        messages = chunk_blocks(blocks)
+        self.assertGreater(len(messages), 1)
+        self.assertTrue(all(len(message) <= 50 for message in messages))
+        self.assertEqual(sum(block["text"]["text"].count("• <") for block in blocks), 3000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import threading
+import unittest
+from src.nlp_processing.batching import InferenceScheduler
+
+class TestInferenceScheduler(unittest.TestCase):
+
+    def test_concurrent_requests_share_a_batch(self):
+        batches = []
+        release = threading.Event()
+
+        def batch_fn(requests):
+            release.wait(timeout=1)
+            batches.append(list(requests))
+            return [request * 2 for request in requests]
+
+        scheduler = InferenceScheduler(batch_fn, max_batch_size=8, batch_window_ms=200)
+        futures = [scheduler.submit(i) for i in range(4)]
+        release.set()
+
+        self.assertEqual([future.result(timeout=2) for future in futures], [0, 2, 4, 6])
+        self.assertEqual(batches, [[0, 1, 2, 3]])
+        self.assertEqual(scheduler.stats()["batches"], 1)
+        scheduler.stop()
+
+    def test_batch_size_limit(self):
+        scheduler = InferenceScheduler(lambda requests: [len(requests)] * len(requests), max_batch_size=2, batch_window_ms=200)
+        futures = [scheduler.submit(i) for i in range(3)]
+        sizes = [future.result(timeout=2) for future in futures]
+        self.assertEqual(max(sizes), 2)
+        scheduler.stop()
+
+    def test_errors_are_routed_to_every_caller(self):
+        def batch_fn(requests):
+            raise ValueError("model failure")
+
+        scheduler = InferenceScheduler(batch_fn, batch_window_ms=1)
+        future = scheduler.submit("text")
+        with self.assertRaises(ValueError):
+            future.result(timeout=2)
+        scheduler.stop()
+
+if __name__ == '__main__':
+    unittest.main()
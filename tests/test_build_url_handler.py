@@ -0,0 +1,89 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from src.handlers.build_url_handler import handle_gerrit, handle_jenkins_url
+from src.handlers.cr_status_handler import handle_gerrit_url
+from src.log_analysis.log_scanner import ErrorBlock
+from src.log_analysis.signatures import Signature
+from src.utils.url_router import parse_url
+
+class TestGerritHandlers(unittest.TestCase):
+
+    def setUp(self):
+        self.gerrit = MagicMock()
+        snapshot = self.gerrit.get_change_snapshot.return_value
+        snapshot.status = {"merge_status": "NEW", "verification_score": 1}
+        snapshot.build_failure_urls = []
+        snapshot.build_url = None
+        snapshot.comments = []
+
+    def test_old_ui_link_with_trailing_slash_reaches_gerrit(self):
+        say = MagicMock()
+        with patch("src.handlers.build_url_handler.get_async_gerrit_api", return_value=self.gerrit):
+            handle_gerrit(parse_url("https://gerrit.example.com/#/c/12345/"), say)
+
+        self.gerrit.get_change_snapshot.assert_called_once_with("https://gerrit.example.com/a/changes/12345")
+        self.assertIn("The current merge status of the CR is: NEW", say.call_args_list[0].args[0])
+
+    def test_patch_set_file_link_uses_change_number(self):
+        say = MagicMock()
+        with patch("src.handlers.cr_status_handler.get_async_gerrit_api", return_value=self.gerrit):
+            handle_gerrit_url(parse_url("https://gerrit.example.com/c/infra/tools/+/12345/3/src/main.py"), say)
+
+        self.gerrit.get_change_snapshot.assert_called_once_with("https://gerrit.example.com/a/changes/12345")
+        self.assertTrue(say.call_args.args[0].startswith("Change ID: 12345\n"))
+
+class TestJenkinsHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.jenkins = MagicMock()
+        self.jenkins.is_build_finished.return_value = False
+        self.jira = MagicMock()
+        self.jira.find_jira_tickets.side_effect = lambda error_line: f"BUILD-1: {error_line}"
+        generic = Signature("generic_error", "generic", severity=10, literal="ERROR")
+        oom = Signature("java_oom", "resource", severity=95, literal="OutOfMemoryError")
+        self.blocks = [
+            ErrorBlock(10, "ERROR: could not load optional plugin", [], generic),
+            ErrorBlock(90, "java.lang.OutOfMemoryError: Java heap space", [], oom),
+        ]
+
+    def run_handler(self, say):
+        with patch("src.handlers.build_url_handler.get_cached_scan", return_value=None), \
+                patch("src.handlers.build_url_handler.get_jenkins_api", return_value=self.jenkins), \
+                patch("src.handlers.build_url_handler.get_jira_api", return_value=self.jira):
+            handle_jenkins_url("https://jenkins.example.com/job/verify/7/", say)
+
+    def test_most_severe_error_is_reported_and_searched(self):
+        self.jenkins.iter_jenkins_error_blocks.return_value = iter(self.blocks)
+        say = MagicMock()
+        self.run_handler(say)
+
+        replies = [call.args[0] for call in say.call_args_list]
+        self.assertEqual(replies[0], "Error identified in Jenkins build (java_oom): java.lang.OutOfMemoryError: Java heap space")
+        self.assertEqual(replies[-1], "Found relevant Jira tickets:\nBUILD-1: java.lang.OutOfMemoryError: Java heap space")
+        self.jira.find_jira_tickets.assert_called_with("java.lang.OutOfMemoryError: Java heap space")
+
+    def test_generic_first_error_is_not_searched_early(self):
+        self.jenkins.iter_jenkins_error_blocks.return_value = iter(self.blocks)
+        self.run_handler(MagicMock())
+        self.jira.find_jira_tickets.assert_called_once_with("java.lang.OutOfMemoryError: Java heap space")
+
+    def test_specific_first_error_is_searched_while_scanning(self):
+        self.jenkins.iter_jenkins_error_blocks.return_value = iter([self.blocks[1], self.blocks[0]])
+        self.run_handler(MagicMock())
+        self.jira.find_jira_tickets.assert_called_once_with("java.lang.OutOfMemoryError: Java heap space")
+
+    def test_finished_build_scan_is_cached(self):
+        self.jenkins.iter_jenkins_error_blocks.return_value = iter(self.blocks)
+        self.jenkins.is_build_finished.return_value = True
+        with patch("src.handlers.build_url_handler.cache_scan") as mock_cache_scan:
+            self.run_handler(MagicMock())
+        mock_cache_scan.assert_called_once_with("https://jenkins.example.com/job/verify/7/", self.blocks)
+
+    def test_first_error_is_streamed_as_status(self):
+        self.jenkins.iter_jenkins_error_blocks.return_value = iter(self.blocks)
+        say = MagicMock()
+        self.run_handler(say)
+        say.status.assert_any_call("Found an error, scanning the rest of the log: ERROR: could not load optional plugin")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+import unittest
+from unittest.mock import MagicMock
+from src.log_analysis.log_scanner import ErrorBlock
+from src.log_analysis.signatures import Signature
+from src.log_analysis.triage import get_cached_scan, cache_scan
+from src.utils.build_watcher import BuildWatcher, build_job
+from src.utils.cache import TTLCache
+from src.utils.url_router import parse_url
+
+BUILD_URL = "https://jenkins.example.com/job/verify/job/core/42/"
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class FakeSnapshot:
+    def __init__(self, merge_status="NEW", revision="abc", score=0, build_failure_urls=None):
+        self.status = {"merge_status": merge_status, "verification_score": score}
+        self.current_revision = revision
+        self.build_failure_urls = build_failure_urls or []
+        self.build_url = None
+
+class TestBuildWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.jenkins = MagicMock()
+        self.scan = MagicMock(return_value=[
+            ErrorBlock(3, "ERROR: optional plugin missing", [], Signature("generic_error", "generic", severity=10, literal="ERROR")),
+            ErrorBlock(7, "fatal: unable to access repository", [], Signature("git_network", "network", severity=80, literal="fatal:")),
+        ])
+        self.jira = MagicMock()
+        self.notify = MagicMock()
+        self.gerrit = MagicMock()
+        self.gerrit.snapshots = TTLCache()
+        self.watcher = BuildWatcher(
+            min_interval=10, max_interval=100, notify=self.notify, gerrit=self.gerrit,
+            jenkins_for=lambda url: self.jenkins, scan=self.scan, jira=self.jira, clock=self.clock,
+        )
+
+    def test_running_build_is_polled_until_it_finishes_then_prefetched(self):
+        self.jenkins.get_cached_build_info.return_value = {"building": True}
+        self.assertTrue(self.watcher.watch(parse_url(BUILD_URL), "C1", "100.000", "T1"))
+
+        # The mention's handler is scanning the build, so the first poll waits min_interval
+        self.assertEqual(self.watcher.run_due(), 0)
+        self.clock.now += 10
+        self.assertEqual(self.watcher.run_due(), 1)
+        self.jenkins.get_cached_build_info.assert_called_once_with("verify/core", 42)
+        self.assertEqual(self.watcher.run_due(), 0)  # Not due again yet
+        self.scan.assert_not_called()
+
+        self.jenkins.get_cached_build_info.return_value = {"building": False, "result": "FAILURE"}
+        self.clock.now += 10
+        self.assertEqual(self.watcher.run_due(), 1)
+
+        self.scan.assert_called_once_with(BUILD_URL)
+        self.assertEqual(get_cached_scan(BUILD_URL + "console")[1].error_line, "fatal: unable to access repository")
+        self.jira.find_jira_tickets.assert_called_once_with("fatal: unable to access repository")
+        channel, thread_ts, text = self.notify.call_args.args
+        self.assertEqual((channel, thread_ts), ("C1", "100.000"))
+        self.assertEqual(self.notify.call_args.kwargs, {"team_id": "T1"})
+        self.assertIn("finished: FAILURE", text)
+        self.assertIn("fatal: unable to access repository", text)
+
+        self.clock.now += 100
+        self.watcher.run_due()
+        self.assertEqual(self.watcher.watched(), [])
+
+    def test_build_scanned_by_the_handler_is_not_downloaded_again(self):
+        url = "https://jenkins.example.com/job/verify/job/core/43/"
+        cache_scan(url, [ErrorBlock(9, "error: 'size_t' was not declared", [])])
+        self.jenkins.get_cached_build_info.return_value = {"building": False, "result": "FAILURE"}
+        self.watcher.watch(parse_url(url), "C1", "100.000")
+        self.clock.now += 10
+        self.watcher.run_due()
+
+        self.scan.assert_not_called()
+        self.jira.find_jira_tickets.assert_not_called()
+        self.assertEqual(self.watcher._watches[parse_url(url).console_url].top_error, "error: 'size_t' was not declared")
+
+    def test_unchanged_change_backs_off_and_reports_its_builds(self):
+        failed_build = "https://jenkins.example.com/job/verify/7/"
+        self.gerrit.get_change_snapshot.return_value = FakeSnapshot(build_failure_urls=[failed_build])
+        change = parse_url("https://gerrit.example.com/c/project/+/12345")
+        self.watcher.watch(change, "C1", "100.000", "T1")
+
+        self.watcher.run_due()
+        self.gerrit.get_change_snapshot.assert_called_once_with("https://gerrit.example.com/a/changes/12345", refresh=True)
+        self.assertIsNotNone(self.gerrit.snapshots.get(change.rest_url))
+        self.assertIn("https://jenkins.example.com/job/verify/7/consoleText", self.watcher.watched())
+        self.assertEqual(self.watcher._watches["https://jenkins.example.com/job/verify/7/consoleText"].team_id, "T1")
+
+        intervals = []
+        for _ in range(4):
+            self.clock.now += 1000
+            self.jenkins.get_cached_build_info.return_value = {"building": True}
+            self.watcher.run_due()
+            intervals.append(self.watcher._watches[change.rest_url].interval)
+        self.assertEqual(intervals, [15, 22.5, 33.75, 50.625])
+        self.notify.assert_not_called()
+
+    def test_state_change_notifies_and_closed_change_stops(self):
+        change = parse_url("https://gerrit.example.com/c/project/+/12345")
+        self.gerrit.get_change_snapshot.return_value = FakeSnapshot()
+        self.watcher.watch(change, "C1", "100.000")
+        self.watcher.run_due()
+
+        self.gerrit.get_change_snapshot.return_value = FakeSnapshot(merge_status="MERGED")
+        self.clock.now += 10
+        self.watcher.run_due()
+        self.assertIn("is now MERGED", self.notify.call_args.args[2])
+
+        self.clock.now += 10
+        self.watcher.run_due()
+        self.assertEqual(self.watcher.watched(), [])
+
+    def test_watches_expire_and_are_bounded(self):
+        watcher = BuildWatcher(watch_seconds=60, max_watches=2, clock=self.clock, jenkins_for=lambda url: self.jenkins)
+        for number in (1, 2, 3):
+            self.clock.now += 1
+            watcher.watch(parse_url(f"https://jenkins.example.com/job/verify/{number}/"))
+        self.assertEqual(len(watcher.watched()), 2)
+        self.assertNotIn("https://jenkins.example.com/job/verify/1/consoleText", watcher.watched())
+        self.assertFalse(watcher.watch(parse_url("https://example.com/not-a-build")))
+
+        self.clock.now += 61
+        self.jenkins.get_cached_build_info.return_value = {"building": True}
+        self.assertEqual(watcher.run_due(), 0)
+        self.assertEqual(watcher.watched(), [])
+
+    def test_blue_ocean_run_maps_to_branch_job(self):
+        target = parse_url("https://jenkins.example.com/blue/organizations/jenkins/core/detail/feature%2Fx/9/pipeline")
+        self.assertEqual(build_job(target), ("core/feature%2Fx", 9))
+        target = parse_url("https://jenkins.example.com/blue/organizations/jenkins/team%2Fcore/detail/main/9/pipeline")
+        self.assertEqual(build_job(target), ("team/core/main", 9))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+from unittest.mock import patch
+from src.utils.cache import TTLCache
+
+class TestTTLCache(unittest.TestCase):
+
+    def test_get_and_set(self):
+        cache = TTLCache()
+        cache.set("key", "value")
+        self.assertEqual(cache.get("key"), "value")
+        self.assertIsNone(cache.get("missing"))
+        stats = cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_lru_eviction(self):
+        cache = TTLCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # a is now most recently used
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    @patch('src.utils.cache.time.monotonic')
+    def test_ttl_expiry(self, mock_monotonic):
+        cache = TTLCache(ttl_seconds=10)
+        mock_monotonic.return_value = 100
+        cache.set("short", 1)
+        cache.set("forever", 2, ttl_seconds=None)
+        mock_monotonic.return_value = 110
+        self.assertIsNone(cache.get("short"))
+        self.assertEqual(cache.get("forever"), 2)
+        self.assertEqual(cache.stats()["expirations"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from unittest.mock import patch
+from src.api_integration.clients import ClientRegistry, PooledCachingSession, PooledSession
+
+CONFIG = {
+    "http": {
+        "pool_maxsize": 20,
+        "read_timeout": 30,
+        "retries": {"total": 2},
+        "backends": {"jenkins": {"read_timeout": 60}, "artifacts": {"pool_maxsize": 32}},
+    }
+}
+
+class TestClientRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = ClientRegistry(config=CONFIG)
+
+    def test_backend_settings_override_defaults(self):
+        settings = self.registry.settings_for("jenkins")
+        self.assertEqual(settings["read_timeout"], 60)
+        self.assertEqual(settings["connect_timeout"], 5)
+        self.assertEqual(settings["retries"]["total"], 2)
+        self.assertEqual(settings["retries"]["backoff_factor"], 0.5)
+        self.assertEqual(self.registry.settings_for("slack")["read_timeout"], 30)
+
+    def test_sessions_are_pooled_and_shared(self):
+        session = self.registry.session("artifacts")
+        self.assertIs(session, self.registry.session("artifacts"))
+        self.assertIsInstance(session, PooledCachingSession)
+        self.assertIsInstance(self.registry.session("slack"), PooledSession)
+        adapter = session.get_adapter("https://jenkins.example.com")
+        self.assertEqual(adapter._pool_maxsize, 32)
+        self.assertEqual(adapter.max_retries.total, 2)
+        self.assertEqual(session.timeout, (5, 30))
+
+    def test_slack_session_leaves_429_to_the_rate_limiter(self):
+        self.assertEqual(self.registry.settings_for("slack")["retries"]["status_forcelist"], [500, 502, 503, 504])
+        self.assertIn(429, self.registry.settings_for("jenkins")["retries"]["status_forcelist"])
+        adapter = self.registry.session("slack").get_adapter("https://slack.com")
+        self.assertNotIn(429, adapter.max_retries.status_forcelist)
+
+    def test_one_jenkins_client_per_server(self):
+        first = self.registry.jenkins("https://jenkins.example.com/job/precommit/1/")
+        second = self.registry.jenkins("https://jenkins.example.com/job/nightly/7/")
+        other = self.registry.jenkins("https://ci.example.com/job/precommit/1/")
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertIs(first.session, self.registry.session("jenkins"))
+        self.assertEqual(first.log_timeout, (10, 60))
+
+    @patch('src.api_integration.clients.JiraAPI')
+    def test_jira_client_created_once(self, mock_jira_api):
+        self.assertIs(self.registry.jira(), self.registry.jira())
+        mock_jira_api.assert_called_once_with(timeout=(5, 30), max_retries=2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+from unittest.mock import patch
+from src.nlp_processing.fast_path import RuleClassifier, TieredClassifier
+
+class TestRuleClassifier(unittest.TestCase):
+
+    def setUp(self):
+        self.classifier = RuleClassifier()
+
+    def test_jenkins_failure(self):
+        text = "Jenkins pipeline failed: https://jenkins.example.com/job/Precommit/7498/ can you help?"
+        self.assertEqual(self.classifier.classify(text), "Build Failure")
+
+    def test_gerrit_status(self):
+        text = "Is https://gerrit.example.com/c/main/+/940392 merged yet?"
+        self.assertEqual(self.classifier.classify(text), "CR Status")
+
+    def test_gerrit_failure(self):
+        text = "the build is failing for this change https://gerrit.example.com/c/main/+/940392"
+        self.assertEqual(self.classifier.classify(text), "Build Failure")
+
+    def test_abstains_when_ambiguous(self):
+        self.assertIsNone(self.classifier.classify("what's the status of this failure? https://gerrit.example.com/c/main/+/1"))
+        self.assertIsNone(self.classifier.classify("can you take a look https://gerrit.example.com/c/main/+/1"))
+        self.assertIsNone(self.classifier.classify("the build failed, no link though"))
+
+    def test_abstains_on_build_wording_about_a_change(self):
+        self.assertIsNone(self.classifier.classify("what's the build status of https://gerrit.example.com/c/main/+/1"))
+        self.assertIsNone(self.classifier.classify("why isn't this verified https://gerrit.example.com/c/main/+/1"))
+        self.assertIsNone(self.classifier.classify("CI score on https://gerrit.example.com/c/main/+/1?"))
+        self.assertIsNone(self.classifier.classify("jenkins status for https://gerrit.example.com/c/main/+/1"))
+
+class TestTieredClassifier(unittest.TestCase):
+
+    def test_falls_through_to_next_tier(self):
+        calls = []
+
+        def expensive(text, thread_id):
+            calls.append(text)
+            return "CR Status"
+
+        classifier = TieredClassifier([("rules", lambda text, thread_id: None), ("llm", expensive)])
+        self.assertEqual(classifier.classify("hello", "t1"), ("CR Status", "llm"))
+        self.assertEqual(calls, ["hello"])
+
+    def test_hit_rates(self):
+        classifier = TieredClassifier([
+            ("rules", lambda text, thread_id: "Build Failure" if "failed" in text else None),
+            ("llm", lambda text, thread_id: "CR Status"),
+        ])
+        classifier.classify("build failed", "t1")
+        classifier.classify("build failed again", "t1")
+        classifier.classify("what now", "t1")
+
+        stats = classifier.stats()
+        self.assertEqual(stats["rules"]["hits"], 2)
+        self.assertAlmostEqual(stats["rules"]["hit_rate"], 2 / 3)
+        self.assertEqual(stats["llm"]["hits"], 1)
+
+    def test_average_latency_counts_abstentions(self):
+        clock = iter([0.0, 0.001, 1.0, 1.001, 2.0, 2.003])
+        classifier = TieredClassifier([
+            ("rules", lambda text, thread_id: "Build Failure" if "failed" in text else None),
+            ("llm", lambda text, thread_id: "CR Status"),
+        ])
+        with patch("src.nlp_processing.fast_path.time.perf_counter", side_effect=lambda: next(clock)):
+            classifier.classify("build failed", "t1")
+            classifier.classify("what now", "t1")
+
+        stats = classifier.stats()
+        self.assertEqual(stats["rules"]["calls"], 2)
+        self.assertEqual(stats["rules"]["hits"], 1)
+        # 1 ms for the hit and 1 ms for the abstention, averaged over both calls
+        self.assertAlmostEqual(stats["rules"]["average_ms"], 1.0)
+        self.assertAlmostEqual(stats["llm"]["average_ms"], 3.0)
+
+if __name__ == '__main__':
+    unittest.main()
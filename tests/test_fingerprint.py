@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+from src.log_analysis.fingerprint import normalize_error, fingerprint_error, FingerprintIndex
+from src.api_integration.jira_api import JiraAPI, escape_jql_text
+from src.api_integration.jira_index import JiraIssueIndex
+
+class TestFingerprint(unittest.TestCase):
+
+    def test_same_failure_on_different_builds_has_same_fingerprint(self):
+        first = "2024-05-01T12:03:44Z /home/jenkins/ws/precommit-41/src/buffer.cc:120:17: error: 'size_t' was not declared"
+        second = "2024-06-02T08:00:01Z /var/lib/agent-7/precommit-98/src/buffer.cc:131:17: error: 'size_t' was not declared"
+        self.assertEqual(fingerprint_error(first)[0], fingerprint_error(second)[0])
+        self.assertEqual(normalize_error(first), "<TS> buffer.cc:<N>:<N>: error: 'size_t' was not declared")
+
+    def test_different_failures_have_different_fingerprints(self):
+        self.assertNotEqual(
+            fingerprint_error("java.lang.OutOfMemoryError: Java heap space")[0],
+            fingerprint_error("java.lang.OutOfMemoryError: Metaspace")[0],
+        )
+
+    def test_escape_jql_text(self):
+        self.assertEqual(escape_jql_text('FAILED "test_api.py::test" (x+y)'), "FAILED test_api.py test x y")
+
+class TestFingerprintIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.index = FingerprintIndex(os.path.join(self.tmpdir.name, "fp.sqlite3"), ttl_seconds=60, negative_ttl_seconds=10)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_entries_expire(self):
+        issues = [{"key": "BUILD-1", "summary": "OOM in precommit", "status": "Open"}]
+        with patch("src.log_analysis.fingerprint.time.time", return_value=1000):
+            self.index.set("abc", "normalized", issues)
+            self.index.set("empty", "normalized", [])
+        with patch("src.log_analysis.fingerprint.time.time", return_value=1030):
+            self.assertEqual(self.index.get("abc"), issues)
+            self.assertIsNone(self.index.get("empty"))
+        with patch("src.log_analysis.fingerprint.time.time", return_value=1100):
+            self.assertIsNone(self.index.get("abc"))
+
+    @patch.object(JiraAPI, "load_auth_details")
+    def test_repeated_failure_queries_jira_once(self, mock_auth):
+        issue_index = JiraIssueIndex(os.path.join(self.tmpdir.name, "issues.sqlite3"))
+        jira_api = JiraAPI(fingerprints=self.index, issue_index=issue_index)
+        jira_api.server_url = "https://jira.example.com"
+        issue = MagicMock(key="BUILD-7")
+        issue.fields.summary = "Heap exhaustion in precommit"
+        issue.fields.status.name = "Open"
+        jira_api.jira = MagicMock()
+        jira_api.jira.search_issues.return_value = [issue]
+
+        first = jira_api.find_jira_tickets("java.lang.OutOfMemoryError at build 41")
+        second = jira_api.find_jira_tickets("java.lang.OutOfMemoryError at build 42")
+
+        self.assertEqual(jira_api.jira.search_issues.call_count, 1)
+        self.assertIn("https://jira.example.com/browse/BUILD-7", second)
+        self.assertIn("BUILD-7: Heap exhaustion in precommit (Status: Open)", first)
+
+    @patch.object(JiraAPI, "load_auth_details")
+    def test_stale_issue_index_falls_back_to_jira(self, mock_auth):
+        issue_index = MagicMock()
+        issue_index.search.return_value = [{"key": "BUILD-3", "summary": "Local match", "status": "Open"}]
+        jira_api = JiraAPI(fingerprints=self.index, issue_index=issue_index, index_max_age=3600)
+        jira_api.jira = MagicMock()
+        jira_api.jira.search_issues.return_value = []
+
+        issue_index.last_synced = 10000
+        with patch("src.api_integration.jira_api.time.time", return_value=10000 + 60):
+            self.assertEqual(jira_api.find_issues("error: 'size_t' was not declared")[0]["key"], "BUILD-3")
+        with patch("src.api_integration.jira_api.time.time", return_value=10000 + 7200):
+            self.assertEqual(jira_api.find_issues("error: 'size_t' was not declared"), [])
+        self.assertEqual(issue_index.search.call_count, 1)
+        jira_api.jira.search_issues.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,7 @@ import unittest
 from unittest.mock import patch, MagicMock
 
 import requests
-from src.api_integration.gerrit_api import GerritAPI
+from src.api_integration.gerrit_api import GerritAPI, ChangeSnapshot, snapshot_url
 
 class TestGerritAPI(unittest.TestCase):
 
@@ -62,5 +62,59 @@ class TestGerritAPI(unittest.TestCase):
         self.assertEqual(response[0]["author"], "Reviewer 1")
         self.assertEqual(response[1]["comment"], "Please fix this issue")
 
+class TestChangeSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.snapshot = ChangeSnapshot("https://gerrit.example.com/a/changes/12345", {
+            "status": "NEW",
+            "labels": {"Verified": {"value": -1}},
+            "current_revision": "abc123",
+            "messages": [
+                {"author": {"name": "Jenkins Build.svc"}, "message": "Build Failed\n\nhttps://jenkins.example.com/job/precommit/41/ : FAILURE"},
+                {"author": {"name": "Jenkins Build.svc"}, "message": "Build Failed\n\nhttps://jenkins.example.com/job/precommit/42/ : FAILURE"},
+                {"author": {"name": "Reviewer 1"}, "message": "Patch Set 2: Code-Review+1"},
+            ],
+            "comments": [{"message": "Rerun at https://jenkins.example.com/job/precommit/43/"}],
+        })
+
+    def test_status(self):
+        self.assertEqual(self.snapshot.status, {"merge_status": "NEW", "verification_score": -1})
+        self.assertEqual(self.snapshot.current_revision, "abc123")
+
+    def test_build_failure_url_is_most_recent(self):
+        self.assertEqual(self.snapshot.build_failure_url, "https://jenkins.example.com/job/precommit/42/")
+        self.assertEqual(self.snapshot.build_url, "https://jenkins.example.com/job/precommit/42/")
+
+    def test_build_url_falls_back_to_comments(self):
+        snapshot = ChangeSnapshot("https://gerrit.example.com/a/changes/1", {
+            "messages": [],
+            "comments": [{"message": "Rerun at https://jenkins.example.com/job/precommit/43/"}],
+        })
+        self.assertIsNone(snapshot.build_failure_url)
+        self.assertEqual(snapshot.build_url, "https://jenkins.example.com/job/precommit/43/")
+
+    def test_build_failure_urls_for_latest_patch_set(self):
+        snapshot = ChangeSnapshot("https://gerrit.example.com/a/changes/1", {
+            "messages": [
+                {"author": {"name": "Jenkins Build.svc"}, "_revision_number": 1, "message": "Build Failed\n\nhttps://jenkins.example.com/job/old/1/ : FAILURE"},
+                {"author": {"name": "Jenkins Build.svc"}, "_revision_number": 2, "message": (
+                    "Build Failed\n\nhttps://jenkins.example.com/job/unit/7/ : FAILURE\n"
+                    "https://jenkins.example.com/job/lint/3/ : SUCCESS\n"
+                    "https://jenkins.example.com/job/integration/9/ : FAILURE"
+                )},
+                {"author": {"name": "Jenkins Build.svc"}, "_revision_number": 2, "message": "Build Failed\n\nhttps://jenkins.example.com/job/unit/7/ : FAILURE"},
+            ],
+        })
+        self.assertEqual(snapshot.build_failure_urls, [
+            "https://jenkins.example.com/job/unit/7/",
+            "https://jenkins.example.com/job/integration/9/",
+        ])
+
+    def test_snapshot_url_options(self):
+        self.assertEqual(
+            snapshot_url("https://gerrit.example.com/a/changes/12345/"),
+            "https://gerrit.example.com/a/changes/12345?o=LABELS&o=MESSAGES&o=CURRENT_REVISION&o=DETAILED_ACCOUNTS",
+        )
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,83 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+import httpx
+from src.api_integration.gerrit_async import AsyncGerritAPI
+from src.api_integration.http_cache import HTTPCache
+
+CHANGE_URL = "https://gerrit.example.com/a/changes/12345"
+
+def change_body(number, status="NEW"):
+    return f')]}}\'\n{{"_number": {number}, "status": "{status}"}}'.encode()
+
+class TestAsyncGerritAPI(unittest.TestCase):
+
+    def make_api(self, handler, max_concurrency=10):
+        api = AsyncGerritAPI(token="secret", max_concurrency=max_concurrency, transport=httpx.MockTransport(handler))
+        api.http_cache = HTTPCache()
+        self.addCleanup(api.close)
+        return api
+
+    def test_fresh_hit_then_304_revalidation(self):
+        requests = []
+        def handler(request):
+            requests.append(request)
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304, headers={"ETag": '"v1"'})
+            return httpx.Response(200, content=change_body(12345), headers={"ETag": '"v1"'})
+
+        api = self.make_api(handler)
+        with patch("src.api_integration.http_cache.time.time", return_value=1000):
+            first = api.get_change_snapshot(CHANGE_URL)
+            api.get_change_snapshot(CHANGE_URL, refresh=True)  # Still within the open-change TTL
+        self.assertEqual(len(requests), 1)
+        self.assertEqual(requests[0].headers["Authorization"], "Bearer secret")
+
+        with patch("src.api_integration.http_cache.time.time", return_value=1031):
+            revalidated = api.get_change_snapshot(CHANGE_URL, refresh=True)
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(revalidated.data, first.data)
+        stats = api.http_cache.stats()
+        self.assertEqual((stats["misses"], stats["fresh_hits"], stats["revalidated"]), (1, 1, 1))
+
+    def test_failed_link_returns_none(self):
+        def handler(request):
+            if "/changes/2" in request.url.path:
+                return httpx.Response(500)
+            return httpx.Response(200, content=change_body(1))
+
+        api = self.make_api(handler)
+        snapshots = api.get_change_snapshots(["https://gerrit.example.com/a/changes/1", "https://gerrit.example.com/a/changes/2"])
+        self.assertEqual(snapshots[0].data["_number"], 1)
+        self.assertIsNone(snapshots[1])
+
+    def test_requests_in_flight_are_bounded(self):
+        in_flight = []
+        peak = []
+        async def handler(request):
+            in_flight.append(request)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(request)
+            return httpx.Response(200, content=change_body(1))
+
+        api = self.make_api(handler, max_concurrency=2)
+        links = [f"https://gerrit.example.com/a/changes/{number}" for number in range(6)]
+        snapshots = api.get_change_snapshots(links)
+        self.assertEqual(len([snapshot for snapshot in snapshots if snapshot is not None]), 6)
+        self.assertEqual(max(peak), 2)
+
+    def test_close_stops_the_loop_thread(self):
+        api = AsyncGerritAPI(token="secret", transport=httpx.MockTransport(lambda request: httpx.Response(200, content=change_body(1))))
+        api.http_cache = HTTPCache()
+        api.get_change_snapshot(CHANGE_URL)
+        thread = api._loop_thread
+        self.assertTrue(thread.is_alive())
+
+        api.close()
+        self.assertFalse(thread.is_alive())
+        self.assertIsNone(api._loop)
+        self.assertIsNone(api._client)
+
+if __name__ == '__main__':
+    unittest.main()
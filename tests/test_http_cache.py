@@ -0,0 +1,77 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from src.api_integration.http_cache import HTTPCache, CachingSession
+
+BUILD_URL = "https://jenkins.example.com/job/precommit/42/api/json"
+CHANGE_URL = "https://gerrit.example.com/a/changes/12345"
+
+def make_response(status_code, content=b"", headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = content
+    response.encoding = "utf-8"
+    response.headers = headers or {}
+    return response
+
+class TestHTTPCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = HTTPCache()
+        self.session = CachingSession(cache=self.cache)
+
+    @patch('src.api_integration.http_cache.requests.Session.request')
+    def test_finished_build_is_served_from_cache(self, mock_request):
+        mock_request.return_value = make_response(200, b'{"building": false, "result": "FAILURE"}')
+
+        self.session.get(BUILD_URL)
+        second = self.session.get(BUILD_URL)
+
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(second.json()["result"], "FAILURE")
+        self.assertTrue(second.from_cache)
+        self.assertEqual(self.cache.stats()["fresh_hits"], 1)
+
+    @patch('src.api_integration.http_cache.time.time')
+    @patch('src.api_integration.http_cache.requests.Session.request')
+    def test_stale_entry_is_revalidated_with_etag(self, mock_request, mock_time):
+        mock_time.return_value = 1000
+        mock_request.return_value = make_response(200, b'{"status": "NEW"}', {"ETag": '"abc"'})
+        self.session.get(CHANGE_URL)
+
+        mock_time.return_value = 1031  # Past the 30s TTL for open changes
+        mock_request.return_value = make_response(304, headers={"ETag": '"abc"'})
+        response = self.session.get(CHANGE_URL)
+
+        _, kwargs = mock_request.call_args
+        self.assertEqual(kwargs["headers"]["If-None-Match"], '"abc"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "NEW")
+        self.assertEqual(self.cache.stats()["revalidated"], 1)
+
+    @patch('src.api_integration.http_cache.requests.Session.request')
+    def test_running_build_is_not_reused_forever(self, mock_request):
+        mock_request.return_value = make_response(200, b'{"building": true, "result": null}')
+        self.session.get(BUILD_URL)
+        entry = self.cache.lookup(BUILD_URL)
+        self.assertIsNotNone(entry.fresh_until)
+
+    def test_ui_change_links_are_cached_briefly(self):
+        for url in ("https://gerrit.example.com/c/infra/tools/+/12345", "https://gerrit.example.com/c/12345/3"):
+            self.assertEqual(self.cache.ttl_for(url, b"<html></html>"), 30)
+        self.assertEqual(self.cache.ttl_for("https://example.com/docs/c/intro", b"{}"), 0)
+
+    def test_running_blue_ocean_run_is_not_reused_forever(self):
+        run_url = "https://jenkins.example.com/blue/rest/organizations/jenkins/pipelines/core/branches/main/runs/9/"
+        self.assertEqual(self.cache.ttl_for(run_url, b'{"state": "RUNNING", "result": "UNKNOWN"}'), 10)
+        self.assertIsNone(self.cache.ttl_for(run_url, b'{"state": "FINISHED", "result": "FAILURE"}'))
+
+    @patch('src.api_integration.http_cache.requests.Session.request')
+    def test_non_get_requests_bypass_cache(self, mock_request):
+        mock_request.return_value = make_response(200, b'{}')
+        self.session.post(CHANGE_URL, json={})
+        self.session.post(CHANGE_URL, json={})
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertIsNone(self.cache.lookup(CHANGE_URL))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from unittest.mock import patch
+from src.nlp_processing import inference
+from src.nlp_processing.inference import intent_cache_key, process_with_gpt_j
+from src.nlp_processing.thread_memory import ThreadMemory
+
+CHANGE_URL = "https://gerrit.example.com/c/main/+/940392"
+
+class TestIntentCache(unittest.TestCase):
+
+    def setUp(self):
+        inference.intent_cache.clear()
+        # Counted by words so the tests do not load the model's tokenizer
+        memory_patch = patch.object(inference, "thread_memory", ThreadMemory(token_counter=lambda text: len(text.split())))
+        memory_patch.start()
+        self.addCleanup(memory_patch.stop)
+
+    def test_mentions_in_different_threads_share_the_cache(self):
+        # Each mention is classified under its own message ts
+        with patch.object(inference.intent_classifier, "classify", return_value=("Build Failure", "llm")) as mock_classify:
+            first = process_with_gpt_j(f"Why did this fail? {CHANGE_URL}", "100.000")
+            second = process_with_gpt_j(f"why did this fail {CHANGE_URL}", "200.000")
+
+        self.assertEqual(mock_classify.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual(second, {"intent": "Build Failure", "urls": [CHANGE_URL]})
+
+    def test_answer_from_thread_history_stays_in_its_thread(self):
+        inference.thread_memory.append("100.000", '\nInput: "the build failed"\nIntent:')
+        with patch.object(inference.intent_classifier, "classify", return_value=("Build Failure", "llm")) as mock_classify:
+            process_with_gpt_j(f"and this one? {CHANGE_URL}", "100.000")
+            process_with_gpt_j(f"and this one? {CHANGE_URL}", "100.000")
+            process_with_gpt_j(f"and this one? {CHANGE_URL}", "200.000")
+        self.assertEqual(mock_classify.call_count, 2)
+
+    def test_unknown_intent_is_not_cached(self):
+        outcomes = [("unknown_intent", "llm"), ("CR Status", "llm")]
+        with patch.object(inference.intent_classifier, "classify", side_effect=lambda text, thread_id: outcomes.pop(0)):
+            self.assertEqual(process_with_gpt_j(f"hm {CHANGE_URL}", "100.000")["intent"], "unknown_intent")
+            self.assertEqual(process_with_gpt_j(f"hm {CHANGE_URL}", "200.000")["intent"], "CR Status")
+        self.assertEqual(outcomes, [])
+
+    def test_key_ignores_formatting(self):
+        self.assertEqual(intent_cache_key("Status?", [CHANGE_URL]), intent_cache_key("status", [CHANGE_URL + "/"]))
+        self.assertNotEqual(intent_cache_key("status", [CHANGE_URL]), intent_cache_key("status", [CHANGE_URL], "100.000"))
+
+if __name__ == '__main__':
+    unittest.main()
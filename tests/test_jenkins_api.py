@@ -1,6 +1,7 @@
 import unittest
-from unittest.mock import patch
+from unittest.mock import patch, MagicMock
 from src.api_integration.jenkins_api import JenkinsAPI
+from src.api_integration.http_cache import HTTPCache, CachingSession
 import jenkins
 
 class TestJenkinsAPI(unittest.TestCase):
@@ -87,5 +88,56 @@ class TestJenkinsAPI(unittest.TestCase):
         result = self.jenkins_api.get_build_logs("fake-job", 1)
         self.assertIsNone(result)
 
+    # Test build info fetched through a caching session is reused once the build has finished
+    @patch('src.api_integration.http_cache.requests.Session.request')
+    def test_cached_build_info_reuses_finished_build(self, mock_request):
+        mock_request.return_value = MagicMock(
+            status_code=200, content=b'{"building": false, "result": "FAILURE"}', encoding="utf-8", headers={},
+        )
+        mock_request.return_value.json.return_value = {"building": False, "result": "FAILURE"}
+        self.jenkins_api.session = CachingSession(cache=HTTPCache())
+
+        first = self.jenkins_api.get_cached_build_info("verify/core", 42)
+        second = self.jenkins_api.get_cached_build_info("verify/core", 42)
+
+        self.assertEqual(mock_request.call_args[0][1], "http://fake-jenkins-url.com/job/verify/job/core/42/api/json")
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(first["result"], "FAILURE")
+        self.assertEqual(second["result"], "FAILURE")
+
+    # Test a Blue Ocean run is looked up as its branch job, keeping the encoded slash in the branch name
+    def test_is_build_finished_for_blue_ocean_run(self):
+        self.jenkins_api.get_cached_build_info = MagicMock(return_value={"building": False, "result": "FAILURE"})
+        url = "https://jenkins.example.com/blue/organizations/jenkins/core/detail/feature%2Fx/9/pipeline"
+        self.assertTrue(self.jenkins_api.is_build_finished(url))
+        self.jenkins_api.get_cached_build_info.assert_called_once_with("core/feature%2Fx", 9)
+        self.assertFalse(self.jenkins_api.is_build_finished("https://example.com/not-a-build"))
+
+    # Test tail-first error scan only widens backwards when the tail has no failure
+    def test_error_blocks_read_tail_first(self):
+        self.jenkins_api.session = MagicMock()
+        mock_head, mock_get = self.jenkins_api.session.head, self.jenkins_api.session.get
+        log = b"".join(b"step %05d ok\n" % i for i in range(2000))
+        log = log[:1000] + b"java.lang.OutOfMemoryError: Java heap space\n" + log[1000:]
+        mock_head.return_value = MagicMock(headers={"X-Text-Size": str(len(log))})
+        starts = []
+
+        def fake_get(url, params, **kwargs):
+            starts.append(params["start"])
+            response = MagicMock()
+            response.__enter__.return_value = response
+            response.iter_content.return_value = [log[params["start"]:]]
+            return response
+
+        mock_get.side_effect = fake_get
+        url = "https://jenkins.example.com/job/precommit/42/"
+        blocks = list(self.jenkins_api.iter_jenkins_error_blocks(url, tail_bytes=4096))
+
+        self.assertEqual(mock_head.call_args[0][0], "https://jenkins.example.com/job/precommit/42/logText/progressiveText")
+        self.assertEqual([block.signature.name for block in blocks], ["java_oom"])
+        self.assertEqual(starts[0], len(log) - 4096 - 1)
+        self.assertGreater(len(starts), 1)
+        self.assertEqual(starts[-1], 0)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+from src.api_integration.jira_index import JiraIssueIndex, error_query
+
+class ResultList(list):
+    """Page of issues with the listing's total, like jira.client.ResultList."""
+
+    def __init__(self, issues, total):
+        super().__init__(issues)
+        self.total = total
+
+class FakeJira:
+    """Serves issues the way jira.JIRA.search_issues pages them, recording each JQL query."""
+
+    def __init__(self, issues, max_page_size=None):
+        self.issues = issues
+        self.max_page_size = max_page_size  # Server-side cap on maxResults
+        self.queries = []
+
+    def search_issues(self, jql, startAt=0, maxResults=50, fields=None):
+        self.queries.append(jql)
+        if self.max_page_size is not None:
+            maxResults = min(maxResults, self.max_page_size)
+        return ResultList(self.issues[startAt:startAt + maxResults], len(self.issues))
+
+def fake_issue(key, summary, description, status="Open"):
+    return SimpleNamespace(key=key, fields=SimpleNamespace(
+        summary=summary, description=description, status=SimpleNamespace(name=status), updated="2024-05-01T12:00:00.000+0000",
+    ))
+
+class TestJiraIssueIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.index = JiraIssueIndex(os.path.join(self.tmpdir.name, "issues.sqlite3"))
+        self.jira = FakeJira([
+            fake_issue("BUILD-1", "Precommit OOM in surefire", "java.lang.OutOfMemoryError: Java heap space in maven-surefire-plugin"),
+            fake_issue("BUILD-2", "Flaky network in git checkout", "Could not resolve host git.example.com"),
+            fake_issue("BUILD-3", "size_t not declared in buffer.cc", "compile error in buffer.cc after header cleanup"),
+        ])
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_search_ranks_matching_issue_first(self):
+        self.assertEqual(self.index.sync(self.jira, page_size=2), 3)
+        results = self.index.search("/ws/precommit-41/src/buffer.cc:120:17: error: 'size_t' was not declared in this scope")
+        self.assertEqual(results[0]["key"], "BUILD-3")
+        results = self.index.search("fatal: unable to access 'https://git.example.com/r.git/': Could not resolve host")
+        self.assertEqual(results[0]["key"], "BUILD-2")
+
+    def test_sync_pages_past_a_server_page_cap(self):
+        self.jira.max_page_size = 2
+        self.assertEqual(self.index.sync(self.jira, page_size=100), 3)
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(len(self.jira.queries), 2)
+
+    def test_incremental_sync_updates_existing_issues(self):
+        with patch("src.api_integration.jira_index.time.time", return_value=1000):
+            self.index.sync(self.jira, jql_filter="project = BUILD")
+        self.jira.issues = [fake_issue("BUILD-2", "Flaky DNS on agents", "Could not resolve host", status="Resolved")]
+        with patch("src.api_integration.jira_index.time.time", return_value=1000 + 600):
+            self.index.sync(self.jira, jql_filter="project = BUILD")
+
+        self.assertEqual(self.jira.queries[0], "(project = BUILD) AND updated >= -365d ORDER BY updated ASC")
+        self.assertEqual(self.jira.queries[-1], "(project = BUILD) AND updated >= -11m ORDER BY updated ASC")
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(self.index.search("Flaky DNS")[0]["status"], "Resolved")
+        self.assertEqual(self.index.search("network checkout"), [])
+
+    def test_weak_matches_are_dropped(self):
+        self.jira.issues.append(fake_issue("BUILD-4", "Bump to new version", "not in scope of this error"))
+        self.index.sync(self.jira)
+        results = self.index.search("/ws/precommit-41/src/buffer.cc:120:17: error: 'size_t' was not declared in this scope")
+        self.assertEqual([result["key"] for result in results], ["BUILD-3"])
+        self.assertEqual(self.index.search("out of scope"), [])
+
+    def test_error_query_drops_noise(self):
+        self.assertEqual(error_query("2024-05-01T12:00:00Z ERROR java.lang.OutOfMemoryError: heap"), '"outofmemoryerror" OR "heap"')
+
+if __name__ == '__main__':
+    unittest.main()
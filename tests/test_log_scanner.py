@@ -0,0 +1,46 @@
+import unittest
+from src.log_analysis.log_scanner import scan_log_lines, iter_byte_lines
+
+class TestLogScanner(unittest.TestCase):
+
+    def test_error_block_includes_preceding_context(self):
+        lines = [f"line {i}" for i in range(20)] + ["ERROR: compilation failed"]
+        blocks = list(scan_log_lines(lines, context_lines=3))
+        self.assertEqual(len(blocks), 1)
+        self.assertEqual(blocks[0].error_line, "ERROR: compilation failed")
+        self.assertEqual(blocks[0].context, ["line 17", "line 18", "line 19"])
+        self.assertEqual(blocks[0].line_number, 21)
+
+    def test_context_does_not_overlap(self):
+        lines = ["a", "ERROR one", "b", "java.lang.NullPointerException"]
+        blocks = list(scan_log_lines(lines, context_lines=5))
+        self.assertEqual([block.lines for block in blocks], [["a", "ERROR one"], ["b", "java.lang.NullPointerException"]])
+
+    def test_stops_early_after_max_errors(self):
+        consumed = []
+
+        def lines():
+            for i in range(1000):
+                consumed.append(i)
+                yield "ERROR" if i % 10 == 0 else "ok"
+
+        blocks = list(scan_log_lines(lines(), max_errors=2))
+        self.assertEqual(len(blocks), 2)
+        self.assertLess(len(consumed), 20)
+
+    def test_decodes_bytes(self):
+        blocks = list(scan_log_lines([b"ok", b"ERROR \xe2\x9c\x97"]))
+        self.assertEqual(blocks[0].error_line, "ERROR ✗")
+
+    def test_iter_byte_lines_covers_adjacent_ranges_once(self):
+        log = b"first\nsecond line\nthird\r\nfourth"
+        chunks = lambda start: [log[start:start + 4], log[start + 4:]]
+        # Range [0, 8) ends mid "second line", which is read to its end
+        self.assertEqual(list(iter_byte_lines(chunks(0), limit=8)), [b"first", b"second line"])
+        # Range from byte 8 is fetched from byte 7 and skips the partial line
+        self.assertEqual(list(iter_byte_lines(chunks(7), skip_first=True)), [b"third", b"fourth"])
+        # A range starting exactly on a line boundary keeps that line
+        self.assertEqual(list(iter_byte_lines(chunks(5), skip_first=True)), [b"second line", b"third", b"fourth"])
+
+if __name__ == '__main__':
+    unittest.main()
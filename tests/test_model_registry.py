@@ -0,0 +1,91 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+import torch
+from src.error_handling.exceptions import NLPProcessingError
+from src.nlp_processing.model_registry import ModelRegistry, select_device, select_dtype
+
+class TestModelRegistry(unittest.TestCase):
+
+    def test_model_is_loaded_lazily_once(self):
+        calls = []
+        registry = ModelRegistry(lambda: calls.append(1) or "model")
+        self.assertFalse(registry.is_ready())
+        self.assertEqual(calls, [])
+
+        self.assertEqual(registry.get(), "model")
+        self.assertEqual(registry.get(), "model")
+        self.assertEqual(calls, [1])
+        self.assertTrue(registry.is_ready())
+
+    def test_concurrent_first_access_loads_once(self):
+        calls = []
+        def slow_loader():
+            calls.append(1)
+            time.sleep(0.1)
+            return "model"
+
+        registry = ModelRegistry(slow_loader)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(registry.get())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(calls, [1])
+        self.assertEqual(results, ["model"] * 8)
+
+    def test_warm_up_is_awaited_by_get(self):
+        release = threading.Event()
+        registry = ModelRegistry(lambda: release.wait() and "model")
+        registry.warm_up(background=True)
+        self.assertFalse(registry.is_ready())
+        release.set()
+        self.assertEqual(registry.get(timeout=1), "model")
+
+    def test_failed_load_is_retried_after_backoff(self):
+        outcomes = [OSError("download interrupted"), "model"]
+        def flaky_loader():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        registry = ModelRegistry(flaky_loader, retry_backoff=30)
+        with patch('src.nlp_processing.model_registry.time.monotonic', return_value=100.0):
+            with self.assertRaises(NLPProcessingError):
+                registry.get()
+            # Within the backoff the stored error is raised without calling the loader again
+            with self.assertRaises(NLPProcessingError):
+                registry.get()
+            self.assertEqual(len(outcomes), 1)
+            self.assertFalse(registry.is_ready())
+
+        with patch('src.nlp_processing.model_registry.time.monotonic', return_value=131.0):
+            self.assertEqual(registry.get(), "model")
+        self.assertTrue(registry.is_ready())
+
+class TestDeviceSelection(unittest.TestCase):
+
+    def test_explicit_preferences_win(self):
+        self.assertEqual(select_device("cpu").type, "cpu")
+        self.assertEqual(select_dtype(torch.device("cuda"), "bfloat16"), torch.bfloat16)
+
+    @patch('src.nlp_processing.model_registry.torch.cuda.is_available', return_value=False)
+    def test_falls_back_to_cpu_with_float32(self, mock_cuda):
+        with patch.object(torch.backends, "mps", create=True) as mock_mps:
+            mock_mps.is_available.return_value = False
+            device = select_device("auto")
+        self.assertEqual(device.type, "cpu")
+        self.assertEqual(select_dtype(device), torch.float32)
+
+    @patch('src.nlp_processing.model_registry.torch.cuda.is_available', return_value=True)
+    def test_prefers_cuda_with_half_precision(self, mock_cuda):
+        device = select_device()
+        self.assertEqual(device.type, "cuda")
+        self.assertEqual(select_dtype(device), torch.float16)
+
+if __name__ == '__main__':
+    unittest.main()
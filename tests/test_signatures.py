@@ -0,0 +1,35 @@
+import unittest
+from src.log_analysis.signatures import Signature, SignatureEngine, required_atoms
+
+class TestSignatureEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = SignatureEngine([
+            Signature("c_compiler_error", "compiler", 90, pattern=r'^\S+:\d+:(?:\d+:)? (?:fatal )?error: '),
+            Signature("java_oom", "oom", 95, literal="java.lang.OutOfMemoryError"),
+            Signature("network_error", "infra", 55, pattern=r'Connection (?:refused|reset)|Could not resolve host'),
+            Signature("build_timeout", "infra", 60, pattern=r'build timed out', ignore_case=True),
+            Signature("generic_error", "generic", 10, literal="ERROR"),
+        ])
+
+    def test_required_atoms(self):
+        self.assertEqual(required_atoms(r'\bAssertionError\b'), ["AssertionError"])
+        self.assertEqual(required_atoms(r'Killed process \d+|Out of memory'), ["Killed process ", "Out of memory"])
+        self.assertIsNone(required_atoms(r'\d+\s+\w+'))
+
+    def test_match_line_prefers_highest_severity(self):
+        self.assertEqual(self.engine.match_line("src/a.cc:12:3: error: ERROR").name, "c_compiler_error")
+        self.assertEqual(self.engine.match_line("ERROR java.lang.OutOfMemoryError").name, "java_oom")
+        self.assertEqual(self.engine.match_line("curl: Could not resolve host: x").name, "network_error")
+        self.assertEqual(self.engine.match_line("BUILD TIMED OUT").name, "build_timeout")
+        self.assertIsNone(self.engine.match_line("Connection established"))
+
+    def test_scan_ranks_and_counts(self):
+        lines = ["ok", "ERROR one", "Connection refused", "ERROR two", "java.lang.OutOfMemoryError"]
+        failures = self.engine.scan(lines)
+        self.assertEqual([f.signature.name for f in failures], ["java_oom", "network_error", "generic_error"])
+        self.assertEqual(failures[2].count, 2)
+        self.assertEqual(failures[2].first_line_number, 2)
+
+if __name__ == '__main__':
+    unittest.main()
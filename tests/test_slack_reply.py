@@ -0,0 +1,182 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web import SlackResponse
+from src.api_integration.slack_reply import ReplyBuilder, MAX_BLOCKS_PER_MESSAGE, MAX_SECTION_TEXT
+from src.api_integration.slack_rate_limit import TokenBucket, SlackRateLimiter
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+def rate_limited_error(retry_after):
+    response = SlackResponse(
+        client=None, http_verb="POST", api_url="https://slack.com/api/chat.postMessage", req_args={},
+        data={"ok": False, "error": "ratelimited"}, headers={"Retry-After": retry_after}, status_code=429,
+    )
+    return SlackApiError("ratelimited", response)
+
+class TestReplyBuilder(unittest.TestCase):
+
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.chat_postMessage.return_value = {"ok": True, "ts": "111.222"}
+        self.reply = ReplyBuilder(self.client, "C1", thread_ts="100.000")
+
+    def test_replies_are_coalesced_into_one_message(self):
+        self.reply("The current merge status of the CR is: NEW")
+        self.reply("Verification score: -1")
+        self.reply("Found relevant Jira tickets:\nBUILD-1: Flaky checkout")
+        self.reply.flush()
+
+        self.client.chat_postMessage.assert_called_once()
+        kwargs = self.client.chat_postMessage.call_args.kwargs
+        self.assertEqual(kwargs["thread_ts"], "100.000")
+        self.assertEqual(len(kwargs["blocks"]), 3)
+        self.assertEqual(kwargs["text"], "The current merge status of the CR is: NEW")
+        self.client.files_upload_v2.assert_not_called()
+
+    def test_long_log_is_uploaded_as_a_file(self):
+        log = "\n".join(f"line {i}" for i in range(100))
+        self.reply(f"Here is the relevant Jenkins log:\n{log}")
+        self.reply.flush()
+
+        blocks = self.client.chat_postMessage.call_args.kwargs["blocks"]
+        self.assertEqual(len(blocks), 1)
+        self.assertIn("attached as a file", blocks[0]["text"]["text"])
+        upload = self.client.files_upload_v2.call_args.kwargs
+        self.assertEqual(upload["content"], log)
+        self.assertEqual(upload["filename"], "here-is-the-relevant-jenkins-log.log")
+        self.assertEqual(upload["thread_ts"], "100.000")
+        self.assertEqual(self.reply.api_calls, 2)
+
+    def test_publish_updates_the_posted_message(self):
+        self.reply.status("Checking build status from Gerrit...")
+        self.reply.publish()
+        self.reply("Verification score: +1")
+        self.reply.flush()
+
+        self.client.chat_postMessage.assert_called_once()
+        update = self.client.chat_update.call_args.kwargs
+        self.assertEqual(update["ts"], "111.222")
+        # The status line is dropped from the final message
+        self.assertEqual([block["type"] for block in update["blocks"]], ["section"])
+
+    def test_large_output_is_split_within_block_kit_limits(self):
+        self.reply("x" * (MAX_SECTION_TEXT * 2 + 10))
+        for i in range(MAX_BLOCKS_PER_MESSAGE):
+            self.reply(f"reply {i}")
+        self.reply.flush()
+
+        calls = self.client.chat_postMessage.call_args_list
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(len(calls[0].kwargs["blocks"]), MAX_BLOCKS_PER_MESSAGE)
+        self.assertEqual(len(calls[1].kwargs["blocks"]), 3)
+        for call in calls:
+            for block in call.kwargs["blocks"]:
+                self.assertLessEqual(len(block["text"]["text"]), MAX_SECTION_TEXT)
+
+    def test_streamed_reply_publishes_each_stage_without_blocking(self):
+        posted = threading.Event()
+        release = threading.Event()
+        def slow_post(**kwargs):
+            posted.set()
+            release.wait()
+            return {"ok": True, "ts": "111.222"}
+        self.client.chat_postMessage.side_effect = slow_post
+        reply = ReplyBuilder(self.client, "C1", stream=True)
+
+        reply.status("Looking into it...")
+        self.assertTrue(posted.wait(1))
+        # Stages finishing while Slack is slow do not wait on it, and collapse into one update
+        reply("The current merge status of the CR is: NEW")
+        reply("Error identified in Jenkins build: Connection refused")
+        release.set()
+        deadline = time.monotonic() + 1
+        while not self.client.chat_update.called and time.monotonic() < deadline:
+            time.sleep(0.01)
+        reply.flush()
+
+        self.client.chat_postMessage.assert_called_once()
+        placeholder = self.client.chat_postMessage.call_args.kwargs
+        self.assertEqual(placeholder["blocks"][0]["type"], "context")
+        self.assertLessEqual(self.client.chat_update.call_count, 2)
+        final = self.client.chat_update.call_args.kwargs["blocks"]
+        self.assertEqual(len(final), 2)
+
+    def test_concurrent_targets_are_grouped_under_their_headings(self):
+        gerrit = self.reply.group("gerrit", "*https://gerrit.example.com/c/tools/+/1*")
+        jenkins = self.reply.group("jenkins", "*https://jenkins.example.com/job/verify/7/*")
+        self.assertIs(self.reply.group_for("gerrit"), gerrit)
+        self.assertIs(self.reply.group_for("unknown"), self.reply)
+
+        # Handlers of the two URLs finish their stages interleaved
+        def run(group, lines, ready, go):
+            ready.set()
+            go.wait()
+            for line in lines:
+                group(line)
+                time.sleep(0.001)
+        go = threading.Event()
+        threads = []
+        for group, lines in ((jenkins, ["Error identified in Jenkins build: OOM", "No relevant Jira tickets found."]),
+                             (gerrit, ["The current merge status of the CR is: NEW", "Jenkins build: verify #7"])):
+            ready = threading.Event()
+            threads.append(threading.Thread(target=run, args=(group, lines, ready, go)))
+            threads[-1].start()
+            ready.wait()
+        go.set()
+        for thread in threads:
+            thread.join()
+        self.reply.flush()
+
+        texts = [block["text"]["text"] for block in self.client.chat_postMessage.call_args.kwargs["blocks"]]
+        self.assertEqual(texts, [
+            "*https://gerrit.example.com/c/tools/+/1*",
+            "The current merge status of the CR is: NEW",
+            "Jenkins build: verify #7",
+            "*https://jenkins.example.com/job/verify/7/*",
+            "Error identified in Jenkins build: OOM",
+            "No relevant Jira tickets found.",
+        ])
+
+class TestSlackRateLimiter(unittest.TestCase):
+
+    def test_token_bucket_allows_burst_then_paces(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1, capacity=3, clock=clock, sleep=clock.sleep)
+        waits = [bucket.acquire() for _ in range(5)]
+        self.assertEqual(waits[:3], [0, 0, 0])
+        self.assertAlmostEqual(waits[3], 1.0)
+        self.assertAlmostEqual(clock.now, 2.0)
+
+    def test_retry_after_pauses_then_retries(self):
+        clock = FakeClock()
+        limiter = SlackRateLimiter(rate=10, burst=10)
+        limiter.bucket = TokenBucket(rate=10, capacity=10, clock=clock, sleep=clock.sleep)
+        method = MagicMock(side_effect=[rate_limited_error("7"), {"ok": True}])
+
+        self.assertEqual(limiter.call(method, channel="C1"), {"ok": True})
+        self.assertEqual(method.call_count, 2)
+        self.assertEqual(limiter.throttled, 1)
+        self.assertGreaterEqual(clock.now, 7.0)
+
+    def test_other_errors_are_not_retried(self):
+        limiter = SlackRateLimiter()
+        error = rate_limited_error("1")
+        error.response.status_code = 403
+        method = MagicMock(side_effect=error)
+        with self.assertRaises(SlackApiError):
+            limiter.call(method)
+        method.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+from unittest.mock import patch
+from src.nlp_processing.thread_memory import ThreadMemory
+
+class TestThreadMemory(unittest.TestCase):
+
+    def test_append_returns_thread_history(self):
+        memory = ThreadMemory()
+        memory.append("t1", "first ")
+        history = memory.append("t1", "second")
+        self.assertEqual(history, "first second")
+        self.assertEqual(memory.get("t2"), "")
+
+    def test_token_budget_keeps_most_recent_turns(self):
+        memory = ThreadMemory(token_budget=4)
+        memory.append("t1", "one two ")
+        memory.append("t1", "three four ")
+        history = memory.append("t1", "five six")
+        self.assertEqual(history, "three four five six")
+        self.assertEqual(memory.stats()["trimmed_turns"], 1)
+
+    def test_oversized_turn_is_kept(self):
+        memory = ThreadMemory(token_budget=1)
+        history = memory.append("t1", "a turn longer than the budget")
+        self.assertEqual(history, "a turn longer than the budget")
+
+    def test_lru_eviction(self):
+        memory = ThreadMemory(max_threads=2)
+        memory.append("t1", "a")
+        memory.append("t2", "b")
+        memory.append("t1", "c")  # t1 is now most recently used
+        memory.append("t3", "d")
+        self.assertNotIn("t2", memory)
+        self.assertIn("t1", memory)
+        self.assertEqual(memory.stats()["lru_evictions"], 1)
+
+    @patch('src.nlp_processing.thread_memory.time.monotonic')
+    def test_ttl_expiry(self, mock_monotonic):
+        memory = ThreadMemory(ttl_seconds=10)
+        mock_monotonic.return_value = 100
+        memory.append("t1", "a")
+        mock_monotonic.return_value = 111
+        self.assertEqual(memory.append("t1", "b"), "b")
+        stats = memory.stats()
+        self.assertEqual(stats["ttl_evictions"], 1)
+        self.assertEqual(stats["misses"], 2)
+        self.assertEqual(stats["hits"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import time
+import unittest
+from src.log_analysis.log_scanner import ErrorBlock
+from src.log_analysis.signatures import Signature
+from src.log_analysis.triage import triage_builds
+
+OOM = Signature("java_oom", "oom", 95, literal="java.lang.OutOfMemoryError")
+NETWORK = Signature("network_error", "infra", 55, pattern="Connection refused")
+
+class TestTriage(unittest.TestCase):
+
+    def test_builds_are_scanned_concurrently(self):
+        def slow_scan(url):
+            time.sleep(0.2)
+            return []
+
+        start = time.monotonic()
+        report = triage_builds([f"https://jenkins.example.com/job/j{i}/1/" for i in range(4)], scan=slow_scan)
+        self.assertLess(time.monotonic() - start, 0.6)
+        self.assertEqual(len(report.builds), 4)
+
+    def test_signatures_are_merged_across_builds(self):
+        logs = {
+            "a": [ErrorBlock(10, "Connection refused", [], NETWORK), ErrorBlock(20, "java.lang.OutOfMemoryError: heap", [], OOM)],
+            "b": [ErrorBlock(5, "java.lang.OutOfMemoryError: metaspace", [], OOM)],
+            "c": [],
+        }
+        report = triage_builds(["a", "b", "c", "a"], scan=logs.get)
+
+        self.assertEqual([build.build_url for build in report.builds], ["a", "b", "c"])
+        self.assertEqual([summary.key for summary in report.signatures], ["java_oom", "network_error"])
+        self.assertEqual(report.signatures[0].builds, ["a", "b"])
+        self.assertEqual(report.top_error_line, "java.lang.OutOfMemoryError: heap")
+        self.assertIn("c: no errors identified", report.format_summary())
+
+    def test_failed_build_does_not_fail_triage(self):
+        def scan(url):
+            if url == "bad":
+                raise IOError("connection reset")
+            return [ErrorBlock(1, "Connection refused", [], NETWORK)]
+
+        report = triage_builds(["good", "bad"], scan=scan)
+        self.assertIsNotNone(report.builds[1].error)
+        self.assertEqual(report.top_error_line, "Connection refused")
+
+    def test_results_are_reported_as_builds_finish(self):
+        def scan(url):
+            time.sleep(0.2 if url == "slow" else 0)
+            return []
+
+        finished = []
+        triage_builds(["slow", "fast"], scan=scan, on_result=lambda build: finished.append(build.build_url))
+        self.assertEqual(finished, ["fast", "slow"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import time
+import unittest
+from src.utils.url_router import (
+    parse_url, UrlRouter, GerritChange, JenkinsBuild, BlueOceanRun, JenkinsArtifact,
+)
+
+class TestParseUrl(unittest.TestCase):
+
+    def test_gerrit_change_forms(self):
+        for url in (
+            "https://gerrit.example.com/c/infra/tools/+/12345",
+            "https://gerrit.example.com/c/infra/tools/+/12345/3/src/main.py",
+            "https://gerrit.example.com/#/c/12345/",
+            "https://gerrit.example.com/12345",
+        ):
+            target = parse_url(url)
+            self.assertIsInstance(target, GerritChange, url)
+            self.assertEqual(target.change, "12345")
+        self.assertEqual(parse_url("https://gerrit.example.com/c/infra/tools/+/12345").project, "infra/tools")
+
+    def test_jenkins_targets(self):
+        build = parse_url("https://jenkins.example.com/job/folder/job/precommit/42/console")
+        self.assertIsInstance(build, JenkinsBuild)
+        self.assertEqual((build.job_name, build.build_number), ("folder/precommit", 42))
+        self.assertEqual(build.console_url, "https://jenkins.example.com/job/folder/job/precommit/42/consoleText")
+
+        run = parse_url("https://jenkins.example.com/blue/organizations/jenkins/core/detail/main/7/pipeline")
+        self.assertIsInstance(run, BlueOceanRun)
+        self.assertEqual(
+            run.console_url,
+            "https://jenkins.example.com/blue/rest/organizations/jenkins/pipelines/core/branches/main/runs/7/log/?start=0",
+        )
+
+        artifact = parse_url("https://jenkins.example.com/job/precommit/42/artifact/logs/test.log")
+        self.assertIsInstance(artifact, JenkinsArtifact)
+        self.assertEqual(artifact.relative_path, "logs/test.log")
+
+    def test_slack_wrapping_and_unsupported(self):
+        target = parse_url("<https://jenkins.example.com/job/precommit/42/|build 42>")
+        self.assertEqual(target.url, "https://jenkins.example.com/job/precommit/42/")
+        self.assertIsNone(parse_url("https://example.com/docs/page"))
+
+class TestUrlRouter(unittest.TestCase):
+
+    def test_all_urls_dispatched_concurrently(self):
+        handled = []
+
+        def slow_handler(target, say):
+            time.sleep(0.2)
+            handled.append(target.kind)
+
+        router = UrlRouter()
+        router.register(GerritChange, slow_handler)
+        router.register(JenkinsBuild, slow_handler)
+        targets = router.parse_all([
+            "https://gerrit.example.com/c/tools/+/1",
+            "https://jenkins.example.com/job/a/1/",
+            "https://jenkins.example.com/job/a/1/",
+            "https://jenkins.example.com/job/a/1/artifact/x.log",
+            "https://example.com/unsupported",
+        ])
+        self.assertEqual(len(targets), 3)  # The artifact routes to the JenkinsBuild handler; duplicates are dropped
+
+        start = time.monotonic()
+        router.dispatch(targets, print)
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(sorted(handled), ["gerrit_change", "jenkins_artifact", "jenkins_build"])
+
+if __name__ == '__main__':
+    unittest.main()
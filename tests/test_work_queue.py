@@ -0,0 +1,52 @@
+import threading
+import time
+import unittest
+from src.utils.work_queue import FairWorkQueue, ACCEPTED, DUPLICATE, REJECTED
+
+class TestFairWorkQueue(unittest.TestCase):
+
+    def test_duplicate_event_ids_run_once(self):
+        work_queue = FairWorkQueue(workers=2)
+        runs = []
+        self.assertEqual(work_queue.submit(lambda: runs.append(1), key="C1", task_id="Ev1"), ACCEPTED)
+        self.assertEqual(work_queue.submit(lambda: runs.append(2), key="C1", task_id="Ev1"), DUPLICATE)
+        work_queue.stop()
+        self.assertEqual(runs, [1])
+
+    def test_backpressure_rejects_when_full(self):
+        release = threading.Event()
+        work_queue = FairWorkQueue(workers=1, max_pending=2, max_pending_per_key=5)
+        work_queue.submit(release.wait, key="C1")  # Occupies the only worker
+        while work_queue.stats()["pending"]:
+            time.sleep(0.01)
+        self.assertEqual(work_queue.submit(lambda: None, key="C1"), ACCEPTED)
+        self.assertEqual(work_queue.submit(lambda: None, key="C2"), ACCEPTED)
+        self.assertEqual(work_queue.submit(lambda: None, key="C3", task_id="Ev9"), REJECTED)
+        release.set()
+        work_queue.stop()
+        self.assertEqual(work_queue.stats()["rejected"], 1)
+
+    def test_channels_are_served_round_robin(self):
+        release = threading.Event()
+        order = []
+        work_queue = FairWorkQueue(workers=1)
+        work_queue.submit(release.wait, key="busy")
+        while work_queue.stats()["pending"]:
+            time.sleep(0.01)
+        for i in range(3):
+            work_queue.submit(lambda i=i: order.append(f"busy{i}"), key="busy")
+        work_queue.submit(lambda: order.append("quiet"), key="quiet")
+        release.set()
+        work_queue.stop()
+        self.assertEqual(order, ["busy0", "quiet", "busy1", "busy2"])
+
+    def test_failing_task_does_not_stop_worker(self):
+        work_queue = FairWorkQueue(workers=1)
+        work_queue.submit(lambda: 1 / 0)
+        work_queue.submit(lambda: None)
+        work_queue.stop()
+        self.assertEqual(work_queue.stats()["failed"], 1)
+        self.assertEqual(work_queue.stats()["completed"], 1)
+
+if __name__ == '__main__':
+    unittest.main()